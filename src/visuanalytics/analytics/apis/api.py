@@ -3,12 +3,14 @@ Modul, welches die Funktionen bereitstellt, welche für API-Requests benötigt w
 """
 import json
 import logging
-import time
+import re
 
 import requests
 import xmltodict
 
+from visuanalytics.analytics.apis import fan_out, http_session, projection, response_cache, stream_parser
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.storing import memory_store
 from visuanalytics.analytics.util.step_errors import APIError, raise_step_error, APiRequestError, TestDataError
 from visuanalytics.analytics.util.type_utils import get_type_func, register_type_func
 from visuanalytics.util import resources
@@ -18,6 +20,9 @@ logger = logging.getLogger(__name__)
 API_TYPES = {}
 """Ein Dictionary bestehend aus allen API-Typ-Methoden.  """
 
+STREAM_CHUNK_SIZE = 64 * 1024
+"""Größe der Abschnitte (in Bytes), in denen Antworten mit `stream` gelesen werden."""
+
 
 @raise_step_error(APIError)
 def api(values: dict, data: StepData):
@@ -74,7 +79,7 @@ def input(values: dict, data: StepData, name: str, save_key, ignore_testing=Fals
 
 @register_api
 def request_memory(values: dict, data: StepData, name: str, save_key, ignore_testing=False):
-    """Ließt Daten aus einer memory-Datei (JSON-Format) zu einem bestimmtem Datum.
+    """Ließt Daten aus dem Memory-Speicher (siehe :mod:`memory_store`) zu einem bestimmtem Datum.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
@@ -86,19 +91,30 @@ def request_memory(values: dict, data: StepData, name: str, save_key, ignore_tes
         if values.get("timedelta", None) is None:
             skip = values.get("skip_today", False)
             use_last = values.get("use_last", 1)
-            hist_data = []
-            for offset in range(1, use_last + 1):
-                with resources.open_specific_memory_resource(data.get_config("job_name"), values["name"], skip, offset) as fp:
-                    hist_data.append(json.loads(fp.read()))
+            if values.get("series", False) and not skip:
+                hist_data = _load_series(values, data, use_last)
+            else:
+                hist_data = memory_store.last(data.get_config("job_name"), values["name"], use_last, skip)
             data.insert_data(save_key, hist_data, values)
         else:
-            with resources.open_memory_resource(data.get_config("job_name"),
-                                                values["name"], values["timedelta"]) as fp:
-                data.insert_data(save_key, json.loads(fp.read()), values)
+            data.insert_data(save_key, memory_store.at(data.get_config("job_name"), values["name"],
+                                                       values["timedelta"]), values)
     except (FileNotFoundError, IndexError):
         api_request(values["alternative"], data, name, save_key, ignore_testing)
 
 
+def _load_series(values: dict, data: StepData, use_last: int):
+    try:
+        series = memory_store.series(data.get_config("job_name"), values["name"], use_last)
+    except ValueError:
+        # Entries which are not numeric are loaded one by one
+        if values.get("aggregates", False):
+            raise
+        return memory_store.last(data.get_config("job_name"), values["name"], use_last)
+
+    return series if values.get("aggregates", False) else series["values"]
+
+
 @register_api
 def request_multiple(values: dict, data: StepData, name: str, save_key, ignore_testing=False):
     """Fragt für einen variablen Key, mehrere Male gewünschte Daten einer API ab.
@@ -115,15 +131,19 @@ def request_multiple(values: dict, data: StepData, name: str, save_key, ignore_t
 
     if data.get_data(values.get("use_loop_as_key", False), values, bool):
         data.insert_data(save_key, {}, values)
-        for _, key in data.loop_array(values["steps_value"], values):
-            fetch(values, data, f"{save_key}|{key}")
-            waiting_time = data.get_data(values.get("timer_between_requests", 0.0), values, float)
-            if waiting_time > 0.0:
-                time.sleep(waiting_time)
+        requests_data = [(f"{save_key}|{key}", _create_query(values, data, f"{save_key}|{key}"), values["_loop_states"])
+                         for _, key in data.loop_array(values["steps_value"], values)]
     else:
         data.insert_data(save_key, [None] * len(values["steps_value"]), values)
-        for idx, _ in data.loop_array(values["steps_value"], values):
-            fetch(values, data, f"{save_key}|{idx}", )
+        requests_data = [(f"{save_key}|{idx}", _create_query(values, data, f"{save_key}|{idx}"), values["_loop_states"])
+                         for idx, _ in data.loop_array(values["steps_value"], values)]
+
+    # Send the requests concurrently, the results are inserted afterwards in the original order
+    results = fan_out.run_all([lambda req_data=req_data: _fetch(req_data) for _, req_data, _ in requests_data],
+                              _get_max_parallel(values, data), _get_rate_limit(values, data))
+
+    for (key, _, loop_states), res in zip(requests_data, results):
+        data.insert_data(key, res, {**values, "_loop_states": loop_states})
 
 
 @register_api
@@ -142,14 +162,52 @@ def request_multiple_custom(values: dict, data: StepData, name: str, save_key, i
 
     if values.get("use_loop_as_key", False):
         data.insert_data(save_key, {}, values)
+        keys = [f"{save_key}|{key}" for key in values["steps_value"][:len(values["requests"])]]
 
-        for idx, key in enumerate(values["steps_value"]):
-            api_request(values["requests"][idx], data, name, f"{save_key}|{key}", ignore_testing)
+        # Insert the keys first to keep their order, the requests may finish in any order
+        for key in keys:
+            data.insert_data(key, None, values)
     else:
         data.insert_data(save_key, [None] * len(values["requests"]), values)
+        keys = [f"{save_key}|{idx}" for idx in range(len(values["requests"]))]
+
+    # The requests may use the results of earlier requests, so they are only sent concurrently if enabled
+    max_parallel = _get_max_parallel(values, data, 1)
+    if max_parallel > 1 and _refers_to(values["requests"], keys):
+        logger.warning("Requests of 'request_multiple_custom' use the results of other requests, "
+                       "they are sent one after another")
+        max_parallel = 1
+
+    fan_out.run_all([lambda value=value, key=key: api_request(value, data, name, key, ignore_testing)
+                     for value, key in zip(values["requests"], keys)],
+                    max_parallel, _get_rate_limit(values, data))
+
+
+def _get_max_parallel(values: dict, data: StepData, default: int = None):
+    return data.get_data(values.get("max_parallel", fan_out.MAX_PARALLEL if default is None else default), values, int)
 
-        for idx, value in enumerate(values["requests"]):
-            api_request(value, data, name, f"{save_key}|{idx}", ignore_testing)
+
+def _refers_to(config, keys: list):
+    # Whole key segments only, e.g. "_req|1" does not refer to "_req|10"
+    if isinstance(config, str):
+        return any(re.search(f"{re.escape(key)}(?=[|}}]|$)", config) for key in keys)
+    if isinstance(config, dict):
+        return any(_refers_to(value, keys) for value in config.values())
+    if isinstance(config, list):
+        return any(_refers_to(value, keys) for value in config)
+
+    return False
+
+
+def _get_rate_limit(values: dict, data: StepData):
+    requests_per_second = data.get_data(values.get("requests_per_second", 0.0), values, (int, float))
+
+    # timer_between_requests is the time between two requests in seconds
+    waiting_time = data.get_data(values.get("timer_between_requests", 0.0), values, (int, float))
+    if waiting_time > 0.0:
+        requests_per_second = min(requests_per_second or float("inf"), 1 / waiting_time)
+
+    return fan_out.TokenBucket(requests_per_second) if requests_per_second > 0.0 else None
 
 
 def _load_test_data(values: dict, data: StepData, name, save_key):
@@ -167,36 +225,86 @@ def fetch(values: dict, data: StepData, save_key):
     :param req_data: Dictionary, das alle Informationen für den request enthält.
     :return: Antwort der API im angegebenen Format
     """
-    # Build http request
-    req_data = _create_query(values, data)
+    res = _fetch(_create_query(values, data, save_key))
+
+    data.insert_data(save_key, res, values)
+
 
+def _get_projection(values: dict, data: StepData, save_key: str):
+    # Only keep the data used by the steps if api_projection is enabled
+    if save_key is None or "_projection" not in values or not data.get_config("api_projection", False):
+        return None
+
+    return projection.relative_paths(values["_projection"], data.format(save_key, values))
+
+
+def _fetch(req_data: dict):
+    # Build http request
     req = requests.Request(req_data["method"], req_data["url"], headers=req_data["headers"],
                            json=req_data.get("json", None),
                            data=req_data.get("other", None), params=req_data["params"])
-    # Make the http request
-    s = requests.session()
-    response = s.send(req.prepare())
+
+    if req_data["stream"]:
+        return _fetch_stream(req.prepare(), req_data)
+
+    # Make the http request (reusing the connections to the host, cached if cache_ttl is set)
+    response = response_cache.send(req.prepare(), req_data["cache_ttl"])
 
     if not response.ok:
         raise APiRequestError(response)
 
+    return projection.project(_parse_response(response, req_data), req_data["projection"])
+
+
+def _fetch_stream(request: requests.PreparedRequest, req_data: dict):
+    # The body is parsed while it is received, so the response is neither cached nor shared
+    with http_session.send(request, stream=True) as response:
+        if not response.ok:
+            raise APiRequestError(response)
+
+        paths = req_data["projection"]
+        if req_data["res_format"].__eq__("json") and not req_data["include_headers"] and paths is not None:
+            # Only keep the used data of each element of a top-level array
+            res = stream_parser.parse_json(response.iter_content(STREAM_CHUNK_SIZE), response.encoding or "utf-8",
+                                           lambda idx, item: projection.project_item(item, idx, paths))
+
+            return res if isinstance(res, list) else projection.project(res, paths)
+
+        return projection.project(_parse_response(response, req_data), paths)
+
+
+def _parse_response(response: requests.Response, req_data: dict):
     # Get the right return format
     if req_data["res_format"].__eq__("json"):
-        res = response.json()
+        res = _parse_json(response, req_data)
     elif req_data["res_format"].__eq__("text"):
         res = response.text
     elif req_data["res_format"].__eq__("xml"):
-        res = xmltodict.parse(response.text, **req_data["xml_config"])
+        res = _parse_xml(response, req_data)
     else:
         res = response.content
 
     if req_data["include_headers"]:
         res = {"headers": response.headers, "content": res}
 
-    data.insert_data(save_key, res, values)
+    return res
+
+
+def _parse_json(response: requests.Response, req_data: dict):
+    if not req_data["stream"]:
+        return response.json()
+
+    return stream_parser.parse_json(response.iter_content(STREAM_CHUNK_SIZE), response.encoding or "utf-8")
+
+
+def _parse_xml(response: requests.Response, req_data: dict):
+    if not req_data["stream"]:
+        return xmltodict.parse(response.text, **req_data["xml_config"])
+
+    return stream_parser.parse_xml(response.iter_content(STREAM_CHUNK_SIZE), req_data["xml_config"])
 
 
-def _create_query(values: dict, data: StepData):
+def _create_query(values: dict, data: StepData, save_key: str = None):
     req = {}
     api_key_name = values.get("api_key_name", None)
 
@@ -228,6 +336,9 @@ def _create_query(values: dict, data: StepData):
     # TODO use Format
     req["xml_config"] = data.deep_format(values.get("xml_config", {}), values=values)
     req["include_headers"] = data.get_data(values.get("include_headers", False), values, bool)
+    req["cache_ttl"] = data.get_data(values.get("cache_ttl", 0), values, (int, float))
+    req["stream"] = data.get_data(values.get("stream", False), values, bool)
+    req["projection"] = _get_projection(values, data, save_key)
 
     return req
 
@@ -0,0 +1,240 @@
+"""
+Modul zum Aufzeichnen und Wiedergeben von HTTP-Requests (Kassetten).
+
+Im Modus `record` werden alle Antworten, die über :mod:`http_session` empfangen werden (API-Requests,
+`request_multiple`, Preconditions, `on_completion` und Audio-APIs), in einer Kassette im Ordner
+`resources/cassettes` gespeichert. Im Modus `replay` werden keine Requests gesendet, sondern die
+gespeicherten Antworten (mit einer einstellbaren Verzögerung) zurückgegeben. Dadurch können komplette
+Step-Konfigurationen offline und reproduzierbar ausgeführt, gemessen und profiliert werden.
+
+Die Requests werden anhand eines Hashes aus Methode, URL und Body zugeordnet, dadurch sind API-Keys
+nicht im Klartext in der Kassette enthalten. Jede Antwort wird beim Aufzeichnen einzeln an die Datei angehängt.
+"""
+import hashlib
+import io
+import os
+import pickle
+import threading
+import time
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from visuanalytics.util import resources
+
+CASSETTE_CONFIG = {"mode": "off", "name": "default", "latency": 0}
+"""
+Konfiguration der Kassetten (`mode`: `off`, `record` oder `replay`).
+Wird beim Starten mit den Werten aus der Konfigurationsdatei (`api`) überschrieben.
+"""
+
+_cassettes = {}
+_lock = threading.Lock()
+
+
+def request_key(request: requests.PreparedRequest):
+    """Erstellt den Key, über den eine Antwort in der Kassette gefunden wird.
+
+    Header werden nicht berücksichtigt, da sie sich zwischen zwei Durchläufen ändern können (z.B. Tokens).
+
+    :param request: Request, für den der Key erstellt werden soll.
+    :return: SHA-256-Hash aus Methode, URL und Body.
+    :rtype: str
+    """
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    key = hashlib.sha256()
+    key.update(f"{request.method}\n{request.url}\n".encode("utf-8"))
+    key.update(hashlib.sha256(body).digest())
+    return key.hexdigest()
+
+
+class Cassette(object):
+    """Enthält die aufgezeichneten Antworten zu einem Namen.
+
+    Wurde derselbe Request mehrmals aufgezeichnet, werden die Antworten beim Wiedergeben in derselben
+    Reihenfolge zurückgegeben (danach immer wieder die letzte Antwort).
+
+    :param name: Name der Kassette (Dateiname ohne Endung im Ordner `resources/cassettes`).
+    """
+
+    def __init__(self, name: str):
+        self.__path = resources.get_resource_path(os.path.join(resources.CASSETTE_LOCATION, f"{name}.pkl"))
+        self.__lock = threading.Lock()
+        self.__played = {}
+
+        self.__entries = {}
+        self.__load()
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(entries) for entries in self.__entries.values())
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response):
+        """Speichert die Antwort zu einem Request und hängt sie an die Datei der Kassette an.
+
+        :param request: Gesendeter Request.
+        :param response: Empfangene Antwort (der Body wird dabei gelesen).
+        """
+        entry = {
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "content": response.content,
+            "elapsed": response.elapsed.total_seconds()
+        }
+
+        key = request_key(request)
+
+        with self.__lock:
+            self.__entries.setdefault(key, []).append(entry)
+            self.__append(key, entry)
+
+    def play(self, request: requests.PreparedRequest):
+        """Gibt die nächste aufgezeichnete Antwort zu einem Request zurück.
+
+        :param request: Request, zu dem die Antwort gesucht wird.
+        :return: Aufgezeichnete Antwort oder `None`, falls der Request nicht aufgezeichnet wurde.
+        :rtype: dict
+        """
+        key = request_key(request)
+
+        with self.__lock:
+            entries = self.__entries.get(key, None)
+            if not entries:
+                return None
+
+            idx = self.__played.get(key, 0)
+            self.__played[key] = idx + 1
+            return entries[min(idx, len(entries) - 1)]
+
+    def rewind(self):
+        """Setzt die Wiedergabe auf die jeweils erste Antwort zurück."""
+        with self.__lock:
+            self.__played.clear()
+
+    def __load(self):
+        try:
+            fp = open(self.__path, "rb")
+        except FileNotFoundError:
+            return
+
+        # The file is a sequence of (key, entry) records, older cassettes contain one dictionary with all entries
+        with fp:
+            while True:
+                try:
+                    record = pickle.load(fp)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    # The last record is incomplete if recording was interrupted
+                    break
+
+                if isinstance(record, dict):
+                    for key, entries in record.items():
+                        self.__entries.setdefault(key, []).extend(entries)
+                else:
+                    key, entry = record
+                    self.__entries.setdefault(key, []).append(entry)
+
+    def __append(self, key: str, entry: dict):
+        os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+
+        # Only the new record is written, rewriting the whole cassette would take longer with every response
+        with open(self.__path, "ab") as fp:
+            pickle.dump((key, entry), fp, pickle.HIGHEST_PROTOCOL)
+
+
+def get_cassette(name: str):
+    """Gibt die Kassette mit dem übergebenen Namen zurück (wird beim ersten Aufruf geladen).
+
+    :param name: Name der Kassette.
+    :rtype: Cassette
+    """
+    with _lock:
+        cassette = _cassettes.get(name, None)
+        if cassette is None:
+            cassette = Cassette(name)
+            _cassettes[name] = cassette
+
+        return cassette
+
+
+def clear():
+    """Entfernt alle geladenen Kassetten aus dem Speicher (die Dateien bleiben erhalten)."""
+    with _lock:
+        _cassettes.clear()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport-Adapter, der Requests sendet und die Antworten in einer Kassette speichert.
+
+    :param cassette: Kassette, in der die Antworten gespeichert werden.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.__cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.__cassette.record(request, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport-Adapter, der keine Requests sendet, sondern die Antworten aus einer Kassette zurückgibt.
+
+    :param cassette: Kassette, aus der die Antworten gelesen werden.
+    :param latency: Verzögerung je Antwort in Sekunden oder `"recorded"` für die aufgezeichnete Dauer.
+    """
+
+    def __init__(self, cassette: Cassette, latency=0):
+        super().__init__()
+        self.__cassette = cassette
+        self.__latency = latency
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = self.__cassette.play(request)
+        if entry is None:
+            raise requests.ConnectionError(f"No recorded response for {request.method} request", request=request)
+
+        latency = entry["elapsed"] if self.__latency == "recorded" else self.__latency
+        if latency:
+            time.sleep(latency)
+
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response._content = entry["content"]
+        # The content is already read, streamed responses (iter_content) return it in chunks
+        response._content_consumed = True
+        response.raw = io.BytesIO(entry["content"])
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def create_adapter(**kwargs):
+    """Erstellt den Transport-Adapter für eine neue Session entsprechend :data:`CASSETTE_CONFIG`.
+
+    :param kwargs: Parameter für :class:`requests.adapters.HTTPAdapter`.
+    :rtype: requests.adapters.BaseAdapter
+    """
+    mode = CASSETTE_CONFIG.get("mode", "off")
+
+    if mode == "record":
+        return RecordingAdapter(get_cassette(CASSETTE_CONFIG["name"]), **kwargs)
+    if mode == "replay":
+        return ReplayAdapter(get_cassette(CASSETTE_CONFIG["name"]), CASSETTE_CONFIG.get("latency", 0))
+
+    return HTTPAdapter(**kwargs)
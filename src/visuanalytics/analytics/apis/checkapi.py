@@ -5,7 +5,7 @@ import json
 import xmltodict
 import requests
 
-from visuanalytics.analytics.apis import api
+from visuanalytics.analytics.apis import api, http_session
 
 list_limit = 10
 datatype_converter = {
@@ -31,9 +31,8 @@ def check_api(req_data):
     """
     req = requests.Request(req_data["method"], req_data["url"], headers=req_data["headers"],
                            json=req_data.get("json", None), data=req_data.get("other", None), params=req_data["params"])
-    # Make the http request
-    s = requests.session()
-    response = s.send(req.prepare())
+    # Make the http request (reusing the connections to the host)
+    response = http_session.send(req.prepare())
 
     try:
         list_keys = [
@@ -0,0 +1,85 @@
+"""
+Modul zum gleichzeitigen Ausführen mehrerer API-Requests (z.B. für `request_multiple`).
+
+Die Anzahl gleichzeitiger Requests wird durch `max_parallel` begrenzt, die Anzahl der Requests pro Sekunde
+optional durch einen Token-Bucket.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+MAX_PARALLEL = 4
+"""
+Standardwert für die maximale Anzahl gleichzeitiger Requests eines API-Typs.
+Wird beim Starten mit dem Wert aus der Konfigurationsdatei (`api.max_parallel`) überschrieben.
+"""
+
+
+class TokenBucket(object):
+    """Begrenzt die Anzahl der Aufrufe pro Sekunde.
+
+    Der Bucket enthält maximal `capacity` Tokens und wird mit `rate` Tokens pro Sekunde aufgefüllt.
+    Jeder Aufruf von :func:`acquire` verbraucht ein Token und wartet, falls keines vorhanden ist.
+
+    :param rate: Anzahl der Tokens pro Sekunde.
+    :param capacity: Maximale Anzahl der Tokens (Anzahl der Aufrufe, die direkt hintereinander möglich sind).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.__rate = rate
+        self.__capacity = max(1.0, capacity)
+        self.__tokens = self.__capacity
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """Verbraucht ein Token und wartet, bis eines verfügbar ist."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__last) * self.__rate)
+            self.__last = now
+
+            # Reserve the token now and wait outside of the lock until it is available
+            self.__tokens -= 1
+            wait_time = -self.__tokens / self.__rate if self.__tokens < 0 else 0
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def run_all(funcs: list, max_parallel: int = None, rate_limit: TokenBucket = None):
+    """Führt alle übergebenen Funktionen aus, bei `max_parallel` > 1 gleichzeitig in einem Thread-Pool.
+
+    Tritt ein Fehler auf, werden keine weiteren Funktionen gestartet und der erste Fehler wird weitergegeben,
+    nachdem die laufenden Funktionen beendet sind.
+
+    :param funcs: Funktionen ohne Parameter.
+    :param max_parallel: Maximale Anzahl gleichzeitig ausgeführter Funktionen (Standard: :data:`MAX_PARALLEL`).
+    :param rate_limit: Token-Bucket, der vor jedem Aufruf verwendet wird.
+    :return: Rückgabewerte der Funktionen in der Reihenfolge von `funcs`.
+    :rtype: list
+    """
+    if max_parallel is None:
+        max_parallel = MAX_PARALLEL
+
+    def call(func):
+        if rate_limit is not None:
+            rate_limit.acquire()
+
+        return func()
+
+    if max_parallel <= 1 or len(funcs) <= 1:
+        return [call(func) for func in funcs]
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(funcs)), thread_name_prefix="api") as executor:
+        futures = [executor.submit(call, func) for func in funcs]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+
+        for future in not_done:
+            future.cancel()
+
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            raise future.exception()
+
+    return [future.result() for future in futures]
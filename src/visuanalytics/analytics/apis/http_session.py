@@ -0,0 +1,229 @@
+"""
+Modul, welches wiederverwendbare HTTP-Sessions für API-Requests bereitstellt.
+
+Für jeden Host (Schema und Domain) wird eine Session mit eigenem Connection-Pool verwendet, dadurch
+können bestehende Verbindungen (Keep-Alive) für weitere Requests an denselben Host wiederverwendet werden.
+"""
+import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+
+from visuanalytics.analytics.apis import cassette
+
+logger = logging.getLogger(__name__)
+
+SESSION_CONFIG = {"pool_size": 10, "connect_timeout": 10, "read_timeout": 120, "max_lifetime": 600}
+"""
+Konfiguration der HTTP-Sessions.
+Wird beim Starten mit den Werten aus der Konfigurationsdatei (`api`) überschrieben.
+"""
+
+
+class SessionManager(object):
+    """Verwaltet eine Session je Host und zählt, wie oft bestehende Verbindungen wiederverwendet wurden.
+
+    Sessions, die älter als `max_lifetime` Sekunden sind, werden durch eine neue Session ersetzt. Die alte Session wird
+    geschlossen, sobald alle Requests, die noch über sie laufen, beendet sind.
+    Cookies werden nicht gespeichert, damit Requests verschiedener Jobs unabhängig voneinander bleiben.
+
+    :param config: Dictionary mit `pool_size`, `connect_timeout`, `read_timeout` und `max_lifetime`.
+    :type config: dict
+    """
+
+    def __init__(self, config: dict = None):
+        self.__config = {**SESSION_CONFIG, **(config or {})}
+        self.__sessions = {}
+        self.__retired = set()
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__closed_connections = 0
+
+    @property
+    def timeout(self):
+        """tuple: Timeout für den Verbindungsaufbau und das Lesen der Antwort (in Sekunden)."""
+        return self.__config["connect_timeout"], self.__config["read_timeout"]
+
+    def __create_session(self):
+        session = requests.session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        pool_size = self.__config["pool_size"]
+        # Records or replays the requests if a cassette is configured
+        adapter = cassette.create_adapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def __entry(self, url: str):
+        # Has to be called with the lock held
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        entry = self.__sessions.get(host, None)
+
+        if entry is not None and time.time() - entry.created > self.__config["max_lifetime"]:
+            logger.info(f"Replacing session for '{parts.netloc}' after {self.__config['max_lifetime']}s")
+            del self.__sessions[host]
+            self.__retire(entry)
+            entry = None
+
+        if entry is None:
+            entry = _SessionEntry(self.__create_session())
+            self.__sessions[host] = entry
+
+        return entry
+
+    def __retire(self, entry):
+        # Requests that are still running keep the session open, the last one closes it (see __release)
+        entry.retired = True
+        if entry.in_flight == 0:
+            self.__close_session(entry.session)
+        else:
+            self.__retired.add(entry)
+
+    def __release(self, entry):
+        with self.__lock:
+            entry.in_flight -= 1
+
+            if entry.retired and entry.in_flight == 0 and entry in self.__retired:
+                self.__retired.discard(entry)
+                self.__close_session(entry.session)
+
+    def __close_session(self, session: requests.Session):
+        self.__closed_connections += _count_connections(session)
+        session.close()
+
+    def get_session(self, url: str):
+        """Gibt die Session für den Host der übergebenen URL zurück.
+
+        Requests sollten mit :func:`send` gesendet werden, nur dann bleibt eine ersetzte Session bis zum Ende
+        des Requests geöffnet.
+
+        :param url: URL des Requests.
+        :return: Session für den Host.
+        :rtype: requests.Session
+        """
+        with self.__lock:
+            return self.__entry(url).session
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False):
+        """Sendet einen Request über die Session des jeweiligen Hosts.
+
+        :param request: Request, der gesendet werden soll.
+        :param stream: Ob der Body der Antwort erst beim Lesen empfangen werden soll.
+        :return: Antwort des Servers.
+        :rtype: requests.Response
+        """
+        with self.__lock:
+            entry = self.__entry(request.url)
+            entry.in_flight += 1
+            self.__requests += 1
+
+        try:
+            response = entry.session.send(request, timeout=self.timeout, stream=stream)
+        except BaseException:
+            self.__release(entry)
+            raise
+
+        if not stream:
+            self.__release(entry)
+            return response
+
+        # The connection of a streamed response is in use until the response is closed
+        close = response.close
+        released = threading.Event()
+
+        def close_response():
+            try:
+                close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self.__release(entry)
+
+        response.close = close_response
+        return response
+
+    def stats(self):
+        """Gibt die Anzahl der Requests, der aufgebauten Verbindungen und der wiederverwendeten Verbindungen zurück.
+
+        :rtype: dict
+        """
+        with self.__lock:
+            connections = self.__closed_connections + sum(
+                _count_connections(entry.session) for entry in [*self.__sessions.values(), *self.__retired])
+
+            return {
+                "sessions": len(self.__sessions),
+                "requests": self.__requests,
+                "connections": connections,
+                "reused": max(0, self.__requests - connections)
+            }
+
+    def close(self):
+        """Schließt alle Sessions, auch ersetzte Sessions mit laufenden Requests."""
+        with self.__lock:
+            for entry in [*self.__sessions.values(), *self.__retired]:
+                self.__close_session(entry.session)
+
+            self.__sessions.clear()
+            self.__retired.clear()
+
+
+class _SessionEntry(object):
+    # Session of a host with its creation time and the number of running requests
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.created = time.time()
+        self.in_flight = 0
+        self.retired = False
+
+
+def _count_connections(session: requests.Session):
+    count = 0
+    for adapter in set(session.adapters.values()):
+        if not hasattr(adapter, "poolmanager"):
+            continue
+
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key, None)
+            count += pool.num_connections if pool is not None else 0
+
+    return count
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """Gibt den prozessweiten :class:`SessionManager` zurück.
+
+    Dieser wird beim ersten Aufruf mit :data:`SESSION_CONFIG` erstellt.
+
+    :rtype: SessionManager
+    """
+    global _manager
+
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionManager()
+
+        return _manager
+
+
+def send(request: requests.PreparedRequest, stream: bool = False):
+    """Sendet einen Request über den prozessweiten :class:`SessionManager`.
+
+    :param request: Request, der gesendet werden soll.
+    :param stream: Ob der Body der Antwort erst beim Lesen empfangen werden soll.
+    :return: Antwort des Servers.
+    :rtype: requests.Response
+    """
+    return get_session_manager().send(request, stream)
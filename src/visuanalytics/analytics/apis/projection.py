@@ -0,0 +1,170 @@
+"""
+Modul, welches API-Antworten auf die Daten reduziert, die in der Step-Konfiguration verwendet werden.
+
+Dazu werden beim Laden der Konfiguration alle Pfade gesammelt, die mit `_req` beginnen (z.B. `"_req|data|0|temp"`,
+`"$_req|data"` oder `"{_req|data|0|temp}"`). Teile eines Pfades, die erst zur Laufzeit feststehen (z.B. `{_loop}`),
+passen auf jeden Key. Wird ein Pfad verwendet, bleiben alle Daten unterhalb dieses Pfades erhalten.
+"""
+from string import Formatter
+
+from visuanalytics.analytics.util.step_pattern import compile_key_path
+
+WILDCARD = "*"
+"""Platzhalter für Teile eines Pfades, die erst zur Laufzeit feststehen."""
+
+
+def _split_path(key: str):
+    segments = []
+    depth = 0
+    current = ""
+
+    # Split at | but not inside of {}
+    for char in key:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            segments.append(current)
+            current = ""
+            continue
+
+        current += char
+
+    segments.append(current)
+    return tuple(WILDCARD if "{" in segment or "}" in segment else segment for segment in segments)
+
+
+def _field_names(value: str):
+    try:
+        return [field_name for _, field_name, _, _ in Formatter().parse(value) if field_name]
+    except ValueError:
+        return []
+
+
+def _collect(config, root: str, paths: set):
+    if isinstance(config, dict):
+        for value in config.values():
+            _collect(value, root, paths)
+    elif isinstance(config, list):
+        for value in config:
+            _collect(value, root, paths)
+    elif isinstance(config, str):
+        candidates = [config[1:] if config.startswith("$") else config] + _field_names(config)
+
+        for candidate in candidates:
+            if candidate == root or candidate.startswith(f"{root}|"):
+                paths.add(_split_path(candidate))
+
+
+def used_paths(config, root: str = "_req"):
+    """Sammelt alle Pfade unterhalb von `root`, die in der Konfiguration verwendet werden.
+
+    :param config: Step-Konfiguration (oder ein Teil davon).
+    :param root: Key, unter dem die API-Daten gespeichert werden.
+    :return: Sortierte Liste der Pfade als Tupel (ohne Pfade, die in einem anderen Pfad enthalten sind).
+    :rtype: list
+    """
+    paths = set()
+    _collect(config, root, paths)
+
+    # Paths below another used path are already included in that path
+    return sorted(path for path in paths if not any(other != path and _covers(other, path) for other in paths))
+
+
+def _covers(path: tuple, other: tuple):
+    # All data below other is also below path
+    return len(path) <= len(other) and all(a == WILDCARD or a == b for a, b in zip(path, other))
+
+
+def _matches(path: tuple, keys: tuple):
+    return all(a == WILDCARD or b == WILDCARD or str(a) == str(b) for a, b in zip(path, keys))
+
+
+def relative_paths(paths: list, save_key: str):
+    """Gibt die Pfade relativ zu dem Key zurück, unter dem eine API-Antwort gespeichert wird.
+
+    :param paths: Pfade aus :func:`used_paths`.
+    :param save_key: Key, unter dem die Antwort gespeichert wird (z.B. `_req` oder `_req|Giessen`).
+    :return: Relative Pfade oder `None`, wenn die ganze Antwort benötigt wird.
+    :rtype: list
+    """
+    keys = compile_key_path(save_key)
+    result = []
+
+    for path in paths:
+        if not _matches(path, keys):
+            continue
+
+        if len(path) <= len(keys):
+            return None
+
+        result.append(path[len(keys):])
+
+    # Keep everything if the data is not referenced directly (e.g. only with dynamic keys)
+    return result or None
+
+
+def project(data, paths: list):
+    """Entfernt alle Daten, die nicht unter einem der übergebenen Pfade liegen.
+
+    Bei Listen bleibt die Länge erhalten, nicht benötigte Elemente werden durch `None` ersetzt.
+
+    :param data: API-Antwort.
+    :param paths: Relative Pfade aus :func:`relative_paths` (`None` für die ganze Antwort).
+    :return: Reduzierte API-Antwort.
+    """
+    if paths is None or any(len(path) == 0 for path in paths):
+        return data
+
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return data
+
+    result = {} if isinstance(data, dict) else [None] * len(data)
+    for key, value in items:
+        sub_paths = _sub_paths(paths, key)
+
+        if sub_paths:
+            result[key] = project(value, sub_paths)
+
+    return result
+
+
+def project_item(item, idx: int, paths: list):
+    """Reduziert ein einzelnes Element einer Liste wie :func:`project` (z.B. während die Liste empfangen wird).
+
+    :param item: Element der Liste.
+    :param idx: Index des Elements.
+    :param paths: Relative Pfade der Liste aus :func:`relative_paths` (`None` für die ganze Liste).
+    :return: Reduziertes Element oder `None`, wenn das Element nicht benötigt wird.
+    """
+    if paths is None or any(len(path) == 0 for path in paths):
+        return item
+
+    sub_paths = _sub_paths(paths, idx)
+    return project(item, sub_paths) if sub_paths else None
+
+
+def _sub_paths(paths: list, key):
+    return [path[1:] for path in paths if path[0] == WILDCARD or str(path[0]) == str(key)]
+
+
+def attach_paths(api_config, paths: list):
+    """Speichert die Pfade unter `_projection` in allen Requests (Dictionaries mit `url_pattern`) der API-Konfiguration.
+
+    :param api_config: API-Konfiguration aus der Step-Konfiguration.
+    :param paths: Pfade aus :func:`used_paths`.
+    """
+    if isinstance(api_config, list):
+        for value in api_config:
+            attach_paths(value, paths)
+    elif isinstance(api_config, dict):
+        for value in api_config.values():
+            attach_paths(value, paths)
+
+        if "url_pattern" in api_config:
+            api_config["_projection"] = paths
@@ -0,0 +1,280 @@
+"""
+Modul, welches Antworten von API-Requests zwischenspeichert (im Speicher und im Ordner `resources/http_cache`).
+
+Ein Eintrag ist für `cache_ttl` Sekunden gültig. Danach wird, falls die API ein `ETag` oder `Last-Modified`
+mitgesendet hat, ein bedingter Request gesendet. Antwortet die API mit `304 Not Modified`, wird der
+gespeicherte Eintrag weiterverwendet.
+
+Gleichzeitige, identische GET-Requests (z.B. von mehreren Pipelines) werden unabhängig von `cache_ttl`
+nur einmal gesendet (siehe :class:`SingleFlight`).
+
+Die Keys der Einträge sind Hashes aus Methode, URL (inkl. Parameter), Headern und Body, dadurch sind
+API-Keys weder in den Keys noch in den Dateien im Klartext enthalten.
+"""
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from visuanalytics.analytics.apis import http_session
+from visuanalytics.analytics.apis.single_flight import SingleFlight
+from visuanalytics.util import resources
+
+logger = logging.getLogger(__name__)
+
+MEMORY_ENTRIES = 128
+"""Maximale Anzahl an Einträgen, die zusätzlich im Speicher gehalten werden."""
+
+DISK_ENTRIES = 1024
+"""Maximale Anzahl an Dateien im Ordner `resources/http_cache`, die ältesten Dateien werden gelöscht."""
+
+DISK_MAX_AGE = 7 * 24 * 3600
+"""Zeit in Sekunden, nach der eine Datei im Ordner `resources/http_cache` gelöscht wird."""
+
+EVICTION_INTERVAL = 60
+"""Minimale Zeit in Sekunden zwischen zwei Prüfungen des Ordners `resources/http_cache`."""
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+_last_eviction = 0.0
+_stats = {"hits": 0, "misses": 0, "revalidated": 0}
+_in_flight = SingleFlight()
+
+COALESCE_METHODS = ["GET", "HEAD"]
+"""HTTP-Methoden, bei denen gleichzeitige, identische Requests zusammengefasst werden."""
+
+
+def cache_key(request: requests.PreparedRequest):
+    """Erstellt den Key eines Requests.
+
+    :param request: Request, für den der Key erstellt werden soll.
+    :return: SHA-256-Hash aus Methode, URL, Headern und Body.
+    :rtype: str
+    """
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    headers = sorted((k.lower(), v) for k, v in request.headers.items())
+
+    key = hashlib.sha256()
+    key.update(f"{request.method}\n{request.url}\n{headers}\n".encode("utf-8"))
+    key.update(hashlib.sha256(body).digest())
+    return key.hexdigest()
+
+
+def _get_path(key: str):
+    return resources.get_resource_path(os.path.join(resources.HTTP_CACHE_LOCATION, f"{key}.pkl"))
+
+
+def _load(key: str):
+    with _lock:
+        entry = _memory.get(key, None)
+        if entry is not None:
+            _memory.move_to_end(key)
+            return entry
+
+    try:
+        with open(_get_path(key), "rb") as fp:
+            entry = pickle.load(fp)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.exception("Cache entry could not be loaded: ")
+        _delete(key)
+        return None
+
+    _remember(key, entry)
+    return entry
+
+
+def _remember(key: str, entry: dict):
+    with _lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _store(key: str, entry: dict):
+    _remember(key, entry)
+
+    path = _get_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write into a temporary file first, other threads may read the entry at the same time
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        pickle.dump(entry, fp, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    global _last_eviction
+    with _lock:
+        due = time.time() - _last_eviction >= EVICTION_INTERVAL
+        if due:
+            _last_eviction = time.time()
+
+    if due:
+        evict()
+
+
+def evict():
+    """Löscht Dateien im Ordner `resources/http_cache`, die älter als `DISK_MAX_AGE` sind, und danach die ältesten
+    Dateien, bis höchstens `DISK_ENTRIES` Dateien vorhanden sind.
+
+    :return: Anzahl der gelöschten Dateien.
+    :rtype: int
+    """
+    folder = resources.get_resource_path(resources.HTTP_CACHE_LOCATION)
+
+    try:
+        with os.scandir(folder) as it:
+            files = sorted(((e.stat().st_mtime, e.path) for e in it if e.is_file()), reverse=True)
+    except FileNotFoundError:
+        return 0
+
+    # Keep the newest files, temporary files of running writes are younger than DISK_MAX_AGE
+    min_time = time.time() - DISK_MAX_AGE
+    expired = [path for idx, (mtime, path) in enumerate(files) if mtime < min_time or idx >= DISK_ENTRIES]
+
+    for path in expired:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+    if expired:
+        logger.info(f"{len(expired)} http cache entries have been deleted.")
+
+    return len(expired)
+
+
+def _delete(key: str):
+    with _lock:
+        _memory.pop(key, None)
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(_get_path(key))
+
+
+def _count(name: str):
+    with _lock:
+        _stats[name] += 1
+
+
+def _to_entry(response: requests.Response):
+    return {
+        "time": time.time(),
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "encoding": response.encoding,
+        "content": response.content
+    }
+
+
+def _to_response(entry: dict, request: requests.PreparedRequest):
+    response = requests.Response()
+    response.status_code = entry["status_code"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"]
+    response._content = entry["content"]
+    # The content is already read, streamed responses (iter_content) return it in chunks
+    response._content_consumed = True
+    response.raw = io.BytesIO(entry["content"])
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def _send(request: requests.PreparedRequest, key: str):
+    if request.method not in COALESCE_METHODS:
+        return http_session.send(request)
+
+    response, shared = _in_flight.do(key, lambda: http_session.send(request))
+
+    # Every caller gets its own response object, only the (immutable) content is shared
+    return _to_response(_to_entry(response), request) if shared else response
+
+
+def send(request: requests.PreparedRequest, ttl: float = 0):
+    """Sendet einen Request oder gibt die zwischengespeicherte Antwort zurück.
+
+    Ist `ttl` kleiner oder gleich 0, wird der Request immer gesendet und die Antwort nicht gespeichert.
+
+    :param request: Request, der gesendet werden soll.
+    :param ttl: Zeit in Sekunden, für die eine gespeicherte Antwort ohne erneute Anfrage verwendet wird.
+    :return: Antwort der API.
+    :rtype: requests.Response
+    """
+    key = cache_key(request)
+
+    if not ttl or ttl <= 0:
+        return _send(request, key)
+
+    entry = _load(key)
+
+    if entry is not None and time.time() - entry["time"] <= ttl:
+        _count("hits")
+        return _to_response(entry, request)
+
+    flight_key = key
+
+    # Revalidate outdated entries if the API supports conditional requests
+    if entry is not None:
+        etag = entry["headers"].get("ETag", None)
+        last_modified = entry["headers"].get("Last-Modified", None)
+
+        if etag is None and last_modified is None:
+            entry = None
+        else:
+            request = request.copy()
+            flight_key = f"{key}:revalidate"
+            if etag is not None:
+                request.headers["If-None-Match"] = etag
+            if last_modified is not None:
+                request.headers["If-Modified-Since"] = last_modified
+
+    response = _send(request, flight_key)
+
+    if entry is not None and response.status_code == 304:
+        _count("revalidated")
+        entry = {**entry, "time": time.time()}
+        _store(key, entry)
+        return _to_response(entry, request)
+
+    _count("misses")
+    if response.ok:
+        _store(key, _to_entry(response))
+
+    return response
+
+
+def stats():
+    """Gibt die Anzahl der Treffer, der Fehlschläge, der erneut validierten Einträge sowie
+    der gesendeten (`calls`) und der mit anderen Aufrufern geteilten Requests (`shared`) zurück.
+
+    :rtype: dict
+    """
+    with _lock:
+        return {**_stats, **_in_flight.stats()}
+
+
+def clear():
+    """Löscht alle Einträge aus dem Speicher und setzt die Statistik zurück.
+
+    Die Dateien im Ordner `resources/http_cache` bleiben erhalten.
+    """
+    global _in_flight
+
+    with _lock:
+        _memory.clear()
+        _in_flight = SingleFlight()
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,69 @@
+"""
+Modul zum Zusammenfassen gleichzeitiger, identischer Aufrufe (Single-Flight).
+
+Wird eine Funktion mit einem Key aufgerufen, während ein Aufruf mit demselben Key noch läuft,
+wird sie nicht erneut ausgeführt. Stattdessen wird auf das Ergebnis des laufenden Aufrufs gewartet.
+"""
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Führt für gleichzeitige Aufrufe mit demselben Key die Funktion nur einmal aus."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+        self.__stats = {"calls": 0, "shared": 0}
+
+    def do(self, key, func):
+        """Führt `func` aus oder wartet auf das Ergebnis eines laufenden Aufrufs mit demselben Key.
+
+        Tritt beim Ausführen ein Fehler auf, wird dieser an alle wartenden Aufrufer weitergegeben.
+
+        :param key: Key des Aufrufs (z.B. Hash eines Requests).
+        :param func: Funktion ohne Parameter.
+        :return: Ergebnis von `func` und ob das Ergebnis von einem anderen Aufruf stammt.
+        :rtype: any, bool
+        """
+        with self.__lock:
+            call = self.__calls.get(key, None)
+            shared = call is not None
+
+            if shared:
+                self.__stats["shared"] += 1
+            else:
+                call = _Call()
+                self.__calls[key] = call
+                self.__stats["calls"] += 1
+
+        if shared:
+            call.event.wait()
+        else:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self.__lock:
+                    del self.__calls[key]
+                call.event.set()
+
+        if call.error is not None:
+            raise call.error
+
+        return call.result, shared
+
+    def stats(self):
+        """Gibt die Anzahl der ausgeführten und der geteilten Aufrufe zurück.
+
+        :rtype: dict
+        """
+        with self.__lock:
+            return dict(self.__stats)
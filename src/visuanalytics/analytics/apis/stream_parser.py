@@ -0,0 +1,143 @@
+"""
+Modul zum schrittweisen Parsen von API-Antworten, während diese empfangen werden.
+
+JSON-Antworten, die aus einem Array bestehen, werden Element für Element gelesen. Dadurch müssen
+der empfangene Text und die geparsten Daten nicht gleichzeitig vollständig im Speicher liegen.
+XML-Antworten werden direkt aus den empfangenen Bytes geparst.
+"""
+import codecs
+import json
+
+import xmltodict
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader(object):
+    # File-like object for xmltodict (expat) which reads from an iterator of byte chunks
+
+    def __init__(self, chunks):
+        self.__chunks = iter(chunks)
+
+    def read(self, size=-1):
+        return next(self.__chunks, b"")
+
+
+def _skip_whitespace(buffer: str, pos: int):
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def parse_json(chunks, encoding: str = "utf-8", item_hook=None):
+    """Parst eine JSON-Antwort aus einzelnen Byte-Abschnitten.
+
+    Ist die Antwort ein Array, wird jedes Element geparst, sobald es vollständig empfangen wurde,
+    und der bereits verarbeitete Text verworfen. Andere Antworten werden am Ende komplett geparst.
+
+    :param chunks: Iterator über die empfangenen Bytes (z.B. :func:`requests.Response.iter_content`).
+    :param encoding: Kodierung der Antwort.
+    :param item_hook: Funktion, die mit Index und Element jedes Array-Elements aufgerufen wird und
+        das zu speichernde Element zurückgibt.
+    :return: Die geparste Antwort.
+    :raises: ValueError, wenn die Antwort kein gültiges JSON ist.
+    """
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    finished = False
+
+    # Read until the first character is known
+    while not finished and _skip_whitespace(buffer, 0) >= len(buffer):
+        chunk = next(chunks, None)
+        finished = chunk is None
+        buffer += decoder.decode(chunk or b"", final=finished)
+
+    pos = _skip_whitespace(buffer, 0)
+    if pos >= len(buffer) or buffer[pos] != "[":
+        # Not an array: parse everything at once
+        for chunk in chunks:
+            buffer += decoder.decode(chunk)
+        buffer += decoder.decode(b"", final=True)
+        return json.loads(buffer)
+
+    result = []
+    pos += 1
+    expect_item = True
+    retry_length = 0
+
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        item_end = None
+        if pos < len(buffer):
+            if buffer[pos] == "]" and (expect_item and not result or not expect_item):
+                return result
+
+            if not expect_item:
+                if buffer[pos] != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got '{buffer[pos]}'")
+                pos += 1
+                expect_item = True
+                continue
+
+            # Large items are only parsed again after the buffer has doubled (linear instead of quadratic time)
+            if finished or len(buffer) - pos >= retry_length:
+                try:
+                    item, item_end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if finished:
+                        raise
+
+            # Numbers may continue in the next chunk, the item is complete when it is followed by , or ]
+            if item_end is not None and not finished:
+                next_pos = _skip_whitespace(buffer, item_end)
+                if next_pos >= len(buffer) or buffer[next_pos] not in ",]":
+                    item_end = None
+
+            if item_end is None:
+                retry_length = max(retry_length, 2 * (len(buffer) - pos))
+            else:
+                retry_length = 0
+                idx = len(result)
+                result.append(item_hook(idx, item) if item_hook is not None else item)
+                pos = item_end
+                expect_item = False
+                continue
+
+        if finished:
+            raise ValueError("Unexpected end of JSON array")
+
+        # Drop the text which was already parsed
+        buffer = buffer[pos:]
+        pos = 0
+
+        chunk = next(chunks, None)
+        finished = chunk is None
+        buffer += decoder.decode(chunk or b"", final=finished)
+
+
+def parse_xml(chunks, xml_config: dict = None):
+    """Parst eine XML-Antwort mit `xmltodict` direkt aus den empfangenen Byte-Abschnitten.
+
+    Ist in `xml_config` ein `item_depth` angegeben, wird eine Liste mit allen Elementen dieser Tiefe zurückgegeben.
+    Jedes Element wird gespeichert, sobald es vollständig geparst wurde.
+
+    :param chunks: Iterator über die empfangenen Bytes (z.B. :func:`requests.Response.iter_content`).
+    :param xml_config: Einstellungen für `xmltodict.parse`.
+    :return: Die geparste Antwort.
+    """
+    xml_config = dict(xml_config or {})
+
+    if xml_config.get("item_depth", 0) > 0:
+        items = []
+
+        def item_callback(_, item):
+            items.append(item)
+            return True
+
+        xmltodict.parse(_ChunkReader(chunks), item_callback=item_callback, **xml_config)
+        return items
+
+    return xmltodict.parse(_ChunkReader(chunks), **xml_config)
@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 import os
 import shutil
@@ -7,9 +6,11 @@ import time
 import traceback
 from datetime import datetime
 
-from visuanalytics.analytics.control.procedures.pipeline import Pipeline
+from visuanalytics.analytics.control.procedures.pipeline import Pipeline, log_request_stats
 from visuanalytics.analytics.apis.api import api_request, api
+from visuanalytics.analytics.control.procedures.step_config import load_step_config
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.control.procedures.step_graph import run_step_graph
 from visuanalytics.analytics.precondition.precondition import precondition
 from visuanalytics.analytics.processing.audio.audio import generate_audios
 from visuanalytics.analytics.processing.image.visualization import generate_all_images
@@ -17,8 +18,11 @@ from visuanalytics.analytics.sequence.sequence import link
 from visuanalytics.analytics.storing.storing import storing
 from visuanalytics.analytics.thumbnail.thumbnail import thumbnail
 from visuanalytics.analytics.transform.transform import transform
+from visuanalytics.analytics.util.step_metrics import measure_step
+from visuanalytics.analytics.util.type_profiler import TypeProfiler, save_report
 from visuanalytics.analytics.util.video_delete import delete_video
-from visuanalytics.server.db.job import insert_log, update_log_finish, update_log_error
+from visuanalytics.server.db.job import insert_log, update_log_finish, update_log_error, insert_step_log, \
+    insert_profile_log
 from visuanalytics.util import resources
 from visuanalytics.util.resources import DATE_FORMAT
 
@@ -31,14 +35,18 @@ class DatasourcePipeline(Pipeline):
 
     Benötigt beim Erstellen eine id und eine Instanz der Klasse :class:`Steps` bzw. einer Unterklasse von :class:`Steps`.
     Bei dem Aufruf von Start werden alle Steps der Reihe nach ausgeführt.
+
+    Ist `profile` `true`, wird wie bei :class:`Pipeline` die Laufzeit aller Typen gemessen und als Bericht gespeichert.
     """
     __steps = {-2: {"name": "Error"},
                -1: {"name": "Not Started"},
                0: {"name": "Precondition", "call": precondition},
-               1: {"name": "Apis", "call": api},
-               2: {"name": "Transform", "call": transform},
-               3: {"name": "Storing", "call": storing}}
+               1: {"name": "Apis", "call": api, "requires": [0]},
+               2: {"name": "Transform", "call": transform, "requires": [1]},
+               3: {"name": "Storing", "call": storing, "requires": [2]}}
     __steps_max = 4
+    # Steps in which the types below the top-level keys of the config are executed (for the profile report)
+    __profile_steps = {"precondition": 0, "api": 1, "transform": 2, "storing": 3}
     __log_states = {"running": 0, "finished": 1, "error": -1}
 
     def __init__(self, job_id: int, pipeline_id: str, step_name: str, steps_config=None, log_to_db=False,
@@ -54,6 +62,8 @@ class DatasourcePipeline(Pipeline):
         self.__id = pipeline_id
         self.__config = {}
         self.__current_step = -1
+        self.__step_metrics = []
+        self.__profiler = None
         self.__log_to_db = log_to_db
         self.__log_id = None
         self.__attach_mode = attach_mode
@@ -80,6 +90,11 @@ class DatasourcePipeline(Pipeline):
         """int: Aktueller Step der pipeline. Wird erst nach Beendigung der Pipeline initialisiert."""
         return self.__current_step
 
+    @property
+    def step_metrics(self):
+        """list: Messwerte (Laufzeit, CPU-Zeit, Speicher, temporäre Dateien) aller bisher ausgeführten Schritte."""
+        return self.__step_metrics
+
     @property
     def id(self):
         """str: id der Pipeline."""
@@ -101,17 +116,6 @@ class DatasourcePipeline(Pipeline):
         """
         return self.__steps[self.__current_step]["name"]
 
-    def __get_default_config(self, run_config: dict):
-        default_config = {}
-        for c, v in run_config.items():
-            # If config has sub_params: include all sub_params
-            if v["type"] == "sub_params":
-                default_config.update(self.__get_default_config(v["sub_params"]))
-
-            default_config[c] = v.get("default_value", None)
-
-        return default_config
-
     def __setup(self):
         logger.info(f"Initializing {self.__log_name} {self.id}...")
 
@@ -121,23 +125,15 @@ class DatasourcePipeline(Pipeline):
         log_id = self.__update_db(insert_log, self.__job_id, self.__log_states["running"], round(self.__start_time), 'DATASOURCE')
         self.__log_id = log_id
 
-        # Load json config file
-        with resources.open_resource(f"datasources/{self.__step_name}.json") as fp:
-            self.__config = json.loads(fp.read())
-
-        # Load and merge global presets
-        with resources.open_resource(f"datasources/global_presets.json") as fp:
-            global_presets = json.loads(fp.read())
-
-        self.__config["presets"] = {**global_presets.get("presets", {}), **self.__config.get("presets", {})}
+        # Load json config file (merged with global presets)
+        self.__config, default_config = load_step_config("datasources", self.__step_name)
 
         if not self.__no_tmp_dir:
             os.mkdir(resources.get_temp_resource_path("", self.id))
 
         # Init Steps config with default config
-        # steps_config = self.__get_default_config(self.__config.get("run_config", {}))
-        # steps_config.update(self.steps_config)
-        # self.steps_config = steps_config
+        # default_config.update(self.steps_config)
+        # self.steps_config = default_config
 
         # Init out_time
         self.__config["out_time"] = datetime.fromtimestamp(self.__start_time).strftime(DATE_FORMAT)
@@ -148,6 +144,58 @@ class DatasourcePipeline(Pipeline):
         if self.__log_to_db:
             return func(*args, **kwargs)
 
+    def __run_step(self, step: int, data: StepData):
+        self.__current_step = max(self.__current_step, step)
+        step_name = self.__steps[step]["name"]
+        logger.info(f"Next step: {step_name}")
+
+        step_func = self.__steps[step].get("call", lambda: None)
+        try:
+            _, metrics = measure_step(lambda: step_func(self.__config, data),
+                                      resources.get_temp_resource_path("", self.id))
+        except BaseException as e:
+            self.__log_step(step, e.step_metrics)
+            raise
+
+        logger.info(f"Step finished: {step_name}!")
+        self.__log_step(step, metrics)
+
+    def __log_step(self, step: int, metrics: dict):
+        step_name = self.__steps[step]["name"]
+        self.__step_metrics.append({"step": step, "step_name": step_name, **metrics})
+
+        logger.info(f"Step {step_name} took {metrics['wall_time']}s (cpu: {metrics['cpu_time']}s, "
+                    f"rss: +{metrics['rss_delta']} bytes, temp: +{metrics['temp_bytes']} bytes)")
+
+        if self.__log_id is not None:
+            self.__update_db(insert_step_log, self.__log_id, step, step_name, metrics)
+
+    def __report_profile(self):
+        if self.__profiler is None:
+            return
+
+        # Report only once, also if the pipeline fails after the report was saved
+        report = self.__profiler.report()
+        self.__profiler = None
+
+        for entry in report:
+            entry["step"] = self.__profile_steps.get(entry["path"].split(".")[0].split("[")[0], -1)
+
+        try:
+            path = save_report(report, self.steps_config.get("job_name", None) or self.__step_name,
+                               self.__config["out_time"])
+            logger.info(f"Profile of {self.__log_name} {self.id} saved to {path}")
+
+            for entry in report[:5]:
+                logger.info(f"Profile: {entry['path']} ({entry['type']}) took {entry['self_time']}s "
+                            f"({round(entry['share'] * 100, 1)}%, calls: {entry['calls']}, "
+                            f"elements: {entry['elements']})")
+
+            if self.__log_id is not None:
+                self.__update_db(insert_profile_log, self.__log_id, report)
+        except Exception:
+            logger.exception("Profile could not be saved: ")
+
     def __on_completion(self, values: dict, data: StepData):
         # Set state to ready
         self.__current_step = self.__steps_max
@@ -213,6 +261,9 @@ class DatasourcePipeline(Pipeline):
 
         self.__current_step = -2
 
+        self.__report_profile()
+        log_request_stats()
+
         if not self.__log_id is None:
             self.__update_db(update_log_error,
                              self.__log_id,
@@ -243,14 +294,16 @@ class DatasourcePipeline(Pipeline):
 
             logger.info(f"{self.__log_name}  {self.id} started!")
 
-            for self.__current_step in range(0, self.__steps_max):
-                logger.info(f"Next step: {self.current_step_name()}")
-
-                # Execute Step
-                self.__steps[self.__current_step].get("call", lambda: None)(self.__config, data)
+            if data.get_config("profile", False):
+                self.__profiler = TypeProfiler(self.__config)
+                data.profiler = self.__profiler
 
-                logger.info(f"Step finished: {self.current_step_name()}!")
+            run_step_graph(self.__steps, list(range(0, self.__steps_max)),
+                           lambda step: self.__run_step(step, data),
+                           False)
 
+            self.__report_profile()
+            log_request_stats()
             self.__on_completion(self.__config, data)
             self.__cleanup()
 
@@ -0,0 +1,100 @@
+"""
+Modul zum Speichern und Laden von Zwischenständen (Checkpoints) einer Pipeline.
+
+Ein Checkpoint enthält die Daten aus :class:`StepData` und die aufgelöste Step-Konfiguration
+nach einem bestimmten Schritt. Schlägt ein späterer Schritt fehl, kann ein erneuter Durchlauf
+desselben Jobs an dieser Stelle fortgesetzt werden, ohne die APIs erneut abzufragen.
+"""
+import contextlib
+import logging
+import os
+import pickle
+import time
+
+from visuanalytics.util import resources
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_STEPS = ["Apis", "Transform", "Storing"]
+"""
+Namen der Schritte, nach denen ein Checkpoint erstellt werden kann.
+Spätere Schritte verweisen auf Dateien im temporären Ordner der Pipeline, der nach jedem Durchlauf gelöscht wird.
+"""
+
+_KEEP_DATA_KEYS = ["_conf", "_pipe_id", "_job_id"]
+
+
+def _get_checkpoint_path(job_name: str, step_name: str):
+    return resources.get_resource_path(os.path.join(resources.CHECKPOINT_LOCATION, job_name, f"{step_name}.pkl"))
+
+
+def save_checkpoint(job_name: str, step_name: str, step: int, config: dict, data: dict):
+    """Speichert einen Checkpoint nach dem Schritt `step`.
+
+    Die Datei wird zuerst unter einem temporären Namen geschrieben und dann umbenannt,
+    damit bei einem Abbruch kein unvollständiger Checkpoint zurückbleibt.
+
+    :param job_name: Name des Jobs.
+    :param step_name: Name der Step-Konfiguration (JSON-Datei).
+    :param step: ID des zuletzt erfolgreich ausgeführten Schritts.
+    :param config: Aufgelöste Step-Konfiguration.
+    :param data: Daten aus :class:`StepData`.
+    """
+    path = _get_checkpoint_path(job_name, step_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    checkpoint = {
+        "step": step,
+        "time": time.time(),
+        "config": config,
+        "data": {k: v for k, v in data.items() if k not in _KEEP_DATA_KEYS}
+    }
+
+    # pickle is used because API responses may contain bytes or header objects that JSON can't represent
+    with open(f"{path}.tmp", "wb") as fp:
+        pickle.dump(checkpoint, fp, pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{path}.tmp", path)
+
+    logger.info(f"Checkpoint saved after step {step}")
+
+
+def load_checkpoint(job_name: str, step_name: str, max_age: float = None, not_before: float = None):
+    """Lädt den Checkpoint eines Jobs.
+
+    :param job_name: Name des Jobs.
+    :param step_name: Name der Step-Konfiguration (JSON-Datei).
+    :param max_age: Maximales Alter des Checkpoints in Sekunden. Ältere Checkpoints werden gelöscht und ignoriert.
+    :param not_before: Zeitstempel (z.B. letzte Änderung der Step-Konfiguration), vor dem erstellte Checkpoints
+        gelöscht und ignoriert werden.
+    :return: Checkpoint mit `step`, `time`, `config` und `data` oder `None`, wenn kein (gültiger) Checkpoint existiert.
+    :rtype: dict
+    """
+    path = _get_checkpoint_path(job_name, step_name)
+
+    try:
+        with open(path, "rb") as fp:
+            checkpoint = pickle.load(fp)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.exception("Checkpoint could not be loaded: ")
+        delete_checkpoint(job_name, step_name)
+        return None
+
+    outdated = max_age is not None and time.time() - checkpoint["time"] > max_age
+    if outdated or (not_before is not None and checkpoint["time"] < not_before):
+        logger.info("Checkpoint is outdated and will be ignored")
+        delete_checkpoint(job_name, step_name)
+        return None
+
+    return checkpoint
+
+
+def delete_checkpoint(job_name: str, step_name: str):
+    """Löscht den Checkpoint eines Jobs. Existiert dieser nicht, wird das ignoriert.
+
+    :param job_name: Name des Jobs.
+    :param step_name: Name der Step-Konfiguration (JSON-Datei).
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(_get_checkpoint_path(job_name, step_name))
@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 import os
 import shutil
@@ -7,8 +6,13 @@ import time
 import traceback
 from datetime import datetime
 
+from visuanalytics.analytics.apis import http_session, response_cache
 from visuanalytics.analytics.apis.api import api_request, api
+from visuanalytics.analytics.control.procedures.checkpoint import CHECKPOINT_STEPS, save_checkpoint, load_checkpoint, \
+    delete_checkpoint
+from visuanalytics.analytics.control.procedures.step_config import load_step_config
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.control.procedures.step_graph import run_step_graph
 from visuanalytics.analytics.precondition.precondition import precondition
 from visuanalytics.analytics.processing.audio.audio import generate_audios
 from visuanalytics.analytics.processing.image.visualization import generate_all_images, generate_all_diagrams
@@ -16,37 +20,68 @@ from visuanalytics.analytics.sequence.sequence import link
 from visuanalytics.analytics.storing.storing import storing
 from visuanalytics.analytics.thumbnail.thumbnail import thumbnail
 from visuanalytics.analytics.transform.transform import transform
+from visuanalytics.analytics.util.step_metrics import measure_step, OverlapTracker
+from visuanalytics.analytics.util.type_profiler import TypeProfiler, save_report
 from visuanalytics.analytics.util.video_delete import delete_video
-from visuanalytics.server.db.job import insert_log, update_log_finish, update_log_error
+from visuanalytics.server.db.job import insert_log, update_log_finish, update_log_error, insert_step_log, \
+    insert_profile_log
 from visuanalytics.util import resources
 from visuanalytics.util.resources import DATE_FORMAT
 
 logger = logging.getLogger(__name__)
 
 
+def log_request_stats():
+    """Loggt die Statistik des HTTP-Caches (siehe :mod:`response_cache`) und der HTTP-Verbindungen
+    (siehe :mod:`http_session`).
+
+    Die Zähler gelten für den ganzen Prozess und enthalten auch die Requests anderer Pipelines.
+    """
+    cache = response_cache.stats()
+    logger.info(f"HTTP cache (process): hits: {cache['hits']}, misses: {cache['misses']}, "
+                f"revalidated: {cache['revalidated']}, sent: {cache['calls']}, shared: {cache['shared']}")
+
+    sessions = http_session.get_session_manager().stats()
+    logger.info(f"HTTP sessions (process): sessions: {sessions['sessions']}, requests: {sessions['requests']}, "
+                f"connections: {sessions['connections']}, reused: {sessions['reused']}")
+
+
 class Pipeline(object):
     """Enthält alle Informationen zu einer Pipeline und führt alle Steps aus.
 
     Benötigt beim Erstellen eine id und eine Instanz der Klasse :class:`Steps` bzw. einer Unterklasse von :class:`Steps`.
-    Bei dem Aufruf von Start werden alle Steps der Reihe nach ausgeführt.
+    Bei dem Aufruf von Start werden alle Steps unter Beachtung ihrer Abhängigkeiten (`requires`) ausgeführt.
+    Unabhängige Steps (z.B. `Images` und `Audios`) laufen dabei parallel, außer `parallel_steps` ist `false`.
+
+    Sind in der Konfiguration unter `checkpoint` Step-Namen angegeben, wird nach diesen Steps ein Checkpoint
+    gespeichert (siehe :mod:`checkpoint`). Schlägt die Pipeline später fehl, setzt eine Wiederholung (`resume`)
+    desselben Jobs nach dem letzten Checkpoint fort (der Scheduler wiederholt fehlgeschlagene Jobs bis zu
+    `checkpoint_retries` Mal). Reguläre Durchläufe setzen nur fort, wenn `checkpoint_resume` `true` ist, sonst würden
+    sie die Daten eines früheren Durchlaufs verwenden.
+
+    Ist `profile` `true`, wird die Laufzeit aller Typen (z.B. `transform`-Typen) gemessen und am Ende als Bericht
+    gespeichert (siehe :mod:`type_profiler`).
     """
     __steps = {-2: {"name": "Error"},
                -1: {"name": "Not Started"},
                0: {"name": "Precondition", "call": precondition},
-               1: {"name": "Apis", "call": api},
-               2: {"name": "Transform", "call": transform},
-               3: {"name": "Storing", "call": storing},
-               4: {"name": "Diagrams", "call": generate_all_diagrams},
-               5: {"name": "Images", "call": generate_all_images},
-               6: {"name": "Thumbnail", "call": thumbnail},
-               7: {"name": "Audios", "call": generate_audios},
-               8: {"name": "Sequence", "call": link},
+               1: {"name": "Apis", "call": api, "requires": [0]},
+               2: {"name": "Transform", "call": transform, "requires": [1]},
+               3: {"name": "Storing", "call": storing, "requires": [2]},
+               4: {"name": "Diagrams", "call": generate_all_diagrams, "requires": [3]},
+               5: {"name": "Images", "call": generate_all_images, "requires": [4]},
+               6: {"name": "Thumbnail", "call": thumbnail, "requires": [5]},
+               7: {"name": "Audios", "call": generate_audios, "requires": [3]},
+               8: {"name": "Sequence", "call": link, "requires": [6, 7]},
                9: {"name": "Ready"}}
     __steps_max = 9
+    # Steps in which the types below the top-level keys of the config are executed (for the profile report)
+    __profile_steps = {"precondition": 0, "api": 1, "transform": 2, "storing": 3, "diagrams": 4, "images": 5,
+                       "thumbnail": 6, "audio": 7, "sequence": 8}
     __log_states = {"running": 0, "finished": 1, "error": -1}
 
     def __init__(self, job_id: int, pipeline_id: str, step_name: str, steps_config=None, log_to_db=False,
-                 attach_mode=False, no_tmp_dir=False):
+                 attach_mode=False, no_tmp_dir=False, resume=False):
         if steps_config is None:
             steps_config = {}
 
@@ -58,6 +93,13 @@ class Pipeline(object):
         self.__id = pipeline_id
         self.__config = {}
         self.__current_step = -1
+        self.__step_metrics = []
+        self.__step_overlaps = OverlapTracker()
+        self.__profiler = None
+        self.__checkpoint_steps = []
+        self.__checkpoint_name = step_name
+        self.__resume_run = resume
+        self.__resumable = False
         self.__log_to_db = log_to_db
         self.__log_id = None
         self.__attach_mode = attach_mode
@@ -84,6 +126,16 @@ class Pipeline(object):
         """int: Aktueller Step der pipeline. Wird erst nach Beendigung der Pipeline initialisiert."""
         return self.__current_step
 
+    @property
+    def step_metrics(self):
+        """list: Messwerte (Laufzeit, CPU-Zeit, Speicher, temporäre Dateien) aller bisher ausgeführten Schritte."""
+        return self.__step_metrics
+
+    @property
+    def resumable(self):
+        """bool: Ob ein Checkpoint dieses Durchlaufs existiert, ab dem eine Wiederholung fortsetzen kann."""
+        return self.__resumable
+
     @property
     def id(self):
         """str: id der Pipeline."""
@@ -105,17 +157,6 @@ class Pipeline(object):
         """
         return self.__steps[self.__current_step]["name"]
 
-    def __get_default_config(self, run_config: dict):
-        default_config = {}
-        for c, v in run_config.items():
-            # If config has sub_params: include all sub_params
-            if v["type"] == "sub_params":
-                default_config.update(self.__get_default_config(v["sub_params"]))
-
-            default_config[c] = v.get("default_value", None)
-
-        return default_config
-
     def __setup(self):
         logger.info(f"Initializing {self.__log_name} {self.id}...")
 
@@ -125,33 +166,116 @@ class Pipeline(object):
         log_id = self.__update_db(insert_log, self.__job_id, self.__log_states["running"], round(self.__start_time))
         self.__log_id = log_id
 
-        # Load json config file
-        with resources.open_resource(f"steps/{self.__step_name}.json") as fp:
-            self.__config = json.loads(fp.read())
-
-        # Load and merge global presets
-        with resources.open_resource(f"steps/global_presets.json") as fp:
-            global_presets = json.loads(fp.read())
-
-        self.__config["presets"] = {**global_presets.get("presets", {}), **self.__config.get("presets", {})}
+        # Load json config file (merged with global presets)
+        self.__config, default_config = load_step_config("steps", self.__step_name)
 
         if not self.__no_tmp_dir:
             os.mkdir(resources.get_temp_resource_path("", self.id))
 
         # Init Steps config with default config
-        steps_config = self.__get_default_config(self.__config.get("run_config", {}))
-        steps_config.update(self.steps_config)
-        self.steps_config = steps_config
+        default_config.update(self.steps_config)
+        self.steps_config = default_config
 
         # Init out_time
         self.__config["out_time"] = datetime.fromtimestamp(self.__start_time).strftime(DATE_FORMAT)
 
+        # Init checkpoints
+        self.__checkpoint_steps = [s for s in self.steps_config.get("checkpoint", None) or [] if s in CHECKPOINT_STEPS]
+        self.__checkpoint_name = self.steps_config.get("job_name", None) or self.__step_name
+
         logger.info(f"Initialization finished!")
 
+    def __resume(self, data: StepData):
+        # Only retries continue a failed run, scheduled runs have to fetch new data unless configured otherwise
+        if not self.__checkpoint_steps or not (self.__resume_run or self.steps_config.get("checkpoint_resume", False)):
+            return []
+
+        # Ignore checkpoints created before the last change of the step config
+        checkpoint = load_checkpoint(self.__checkpoint_name, self.__step_name,
+                                     self.steps_config.get("checkpoint_max_age", 3600),
+                                     os.path.getmtime(resources.get_resource_path(f"steps/{self.__step_name}.json")))
+        if checkpoint is None:
+            return []
+
+        logger.info(f"Resuming {self.__log_name} {self.id} after step {self.__steps[checkpoint['step']]['name']}")
+
+        # Restore config and data, but keep out_time of the current run
+        out_time = self.__config["out_time"]
+        self.__config = checkpoint["config"]
+        self.__config["out_time"] = out_time
+        data.data.update(checkpoint["data"])
+
+        self.__current_step = checkpoint["step"]
+        self.__resumable = True
+        return list(range(0, checkpoint["step"] + 1))
+
     def __update_db(self, func: callable, *args, **kwargs):
         if self.__log_to_db:
             return func(*args, **kwargs)
 
+    def __run_step(self, step: int, data: StepData):
+        # Steps can run in parallel, so current_step is the furthest started step
+        self.__current_step = max(self.__current_step, step)
+        step_name = self.__steps[step]["name"]
+        logger.info(f"Next step: {step_name}")
+
+        step_func = self.__steps[step].get("call", lambda: None)
+        self.__step_overlaps.start(step)
+        try:
+            _, metrics = measure_step(lambda: step_func(self.__config, data),
+                                      resources.get_temp_resource_path("", self.id))
+        except BaseException as e:
+            self.__log_step(step, e.step_metrics, self.__step_overlaps.finish(step))
+            raise
+
+        logger.info(f"Step finished: {step_name}!")
+        self.__log_step(step, metrics, self.__step_overlaps.finish(step))
+
+        if step_name in self.__checkpoint_steps:
+            save_checkpoint(self.__checkpoint_name, self.__step_name, step, self.__config, data.data)
+            self.__resumable = True
+
+    def __log_step(self, step: int, metrics: dict, overlapped: bool):
+        step_name = self.__steps[step]["name"]
+
+        # Memory and temp files are measured for the whole process, other steps running at the same time are included
+        if overlapped:
+            metrics = {**metrics, "rss_delta": None, "temp_bytes": None}
+
+        self.__step_metrics.append({"step": step, "step_name": step_name, **metrics})
+
+        logger.info(f"Step {step_name} took {metrics['wall_time']}s (cpu: {metrics['cpu_time']}s, "
+                    f"rss: +{metrics['rss_delta']} bytes, temp: +{metrics['temp_bytes']} bytes"
+                    f"{', ran in parallel' if overlapped else ''})")
+
+        if self.__log_id is not None:
+            self.__update_db(insert_step_log, self.__log_id, step, step_name, metrics)
+
+    def __report_profile(self):
+        if self.__profiler is None:
+            return
+
+        # Report only once, also if the pipeline fails after the report was saved
+        report = self.__profiler.report()
+        self.__profiler = None
+
+        for entry in report:
+            entry["step"] = self.__profile_steps.get(entry["path"].split(".")[0].split("[")[0], -1)
+
+        try:
+            path = save_report(report, self.__checkpoint_name, self.__config["out_time"])
+            logger.info(f"Profile of {self.__log_name} {self.id} saved to {path}")
+
+            for entry in report[:5]:
+                logger.info(f"Profile: {entry['path']} ({entry['type']}) took {entry['self_time']}s "
+                            f"({round(entry['share'] * 100, 1)}%, calls: {entry['calls']}, "
+                            f"elements: {entry['elements']})")
+
+            if self.__log_id is not None:
+                self.__update_db(insert_profile_log, self.__log_id, report)
+        except Exception:
+            logger.exception("Profile could not be saved: ")
+
     def __on_completion(self, values: dict, data: StepData):
         # Set state to ready
         self.__current_step = self.__steps_max
@@ -165,6 +289,10 @@ class Pipeline(object):
         # Update DB logs
         self.__update_db(update_log_finish, self.__log_id, self.__log_states["finished"], completion_time)
 
+        if self.__checkpoint_steps:
+            delete_checkpoint(self.__checkpoint_name, self.__step_name)
+            self.__resumable = False
+
         if self.__attach_mode:
             return
 
@@ -217,6 +345,9 @@ class Pipeline(object):
 
         self.__current_step = -2
 
+        self.__report_profile()
+        log_request_stats()
+
         if not self.__log_id is None:
             self.__update_db(update_log_error,
                              self.__log_id,
@@ -236,7 +367,7 @@ class Pipeline(object):
         Zwichenspeicherung von Dateien verwendet werden. Dieser wird nach Beendigung oder bei einem Fehlerfall wieder gelöscht.
 
         Führt alle Schritte aus der übergebenen Steps Instanz, die in der Funktion :func:`sequence` definiert sind,
-        der Reihenfolge nach aus. Mit der Ausnahme von allen Steps mit der id < 0 und >= `step_max`.
+        mit :func:`run_step_graph` aus. Mit der Ausnahme von allen Steps mit der id < 0 und >= `step_max`.
 
         :return: Wenn ohne Fehler ausgeführt `True`, sonst `False`
         :rtype: bool
@@ -247,14 +378,18 @@ class Pipeline(object):
 
             logger.info(f"{self.__log_name}  {self.id} started!")
 
-            for self.__current_step in range(0, self.__steps_max):
-                logger.info(f"Next step: {self.current_step_name()}")
+            finished = self.__resume(data)
 
-                # Execute Step
-                self.__steps[self.__current_step].get("call", lambda: None)(self.__config, data)
+            if data.get_config("profile", False):
+                self.__profiler = TypeProfiler(self.__config)
+                data.profiler = self.__profiler
 
-                logger.info(f"Step finished: {self.current_step_name()}!")
+            run_step_graph(self.__steps, [s for s in range(0, self.__steps_max) if s not in finished],
+                           lambda step: self.__run_step(step, data),
+                           data.get_config("parallel_steps", True), finished)
 
+            self.__report_profile()
+            log_request_stats()
             self.__on_completion(self.__config, data)
             self.__cleanup()
 
@@ -0,0 +1,119 @@
+"""
+Modul zum Laden der Step-Konfigurationen (JSON-Dateien) einer Pipeline.
+
+Die Konfigurationen werden prozessweit zwischengespeichert. Eine Datei wird nur dann erneut gelesen,
+wenn sich ihre Änderungszeit oder Größe (oder die der `global_presets.json`) geändert hat.
+"""
+import json
+import os
+import pickle
+import threading
+
+from visuanalytics.analytics.apis import projection
+from visuanalytics.analytics.util.type_utils import inline_presets
+from visuanalytics.util import resources
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def get_default_config(run_config: dict):
+    """Erstellt die Standard-Konfiguration (`default_value`) aus einer `run_config`.
+
+    :param run_config: `run_config` aus der Step-Konfiguration.
+    :return: Dictionary mit `name: default_value`.
+    :rtype: dict
+    """
+    default_config = {}
+    for c, v in run_config.items():
+        # If config has sub_params: include all sub_params
+        if v["type"] == "sub_params":
+            default_config.update(get_default_config(v["sub_params"]))
+
+        default_config[c] = v.get("default_value", None)
+
+    return default_config
+
+
+def _validate_run_config(run_config, path: str):
+    if not isinstance(run_config, dict):
+        raise ValueError(f"'run_config' in '{path}' has to be an object")
+
+    for name, value in run_config.items():
+        if not isinstance(value, dict) or "type" not in value:
+            raise ValueError(f"'run_config.{name}' in '{path}' has to be an object with a 'type'")
+
+        if value["type"] == "sub_params":
+            _validate_run_config(value.get("sub_params", None), path)
+
+
+def _file_state(path: str):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load(path: str, presets_path: str):
+    with open(path, encoding="utf-8") as fp:
+        config = json.loads(fp.read())
+
+    with open(presets_path, encoding="utf-8") as fp:
+        global_presets = json.loads(fp.read())
+
+    if not isinstance(config, dict):
+        raise ValueError(f"Step config '{path}' has to be an object")
+
+    config["presets"] = {**global_presets.get("presets", {}), **config.get("presets", {})}
+
+    # Merge presets once here instead of on every call of a type function
+    for key, value in config.items():
+        if key not in ["presets", "run_config"]:
+            inline_presets(value, config["presets"])
+
+    # Collect the paths of the API data used by the steps (see api_projection)
+    if isinstance(config.get("api", None), dict):
+        projection.attach_paths(config["api"], projection.used_paths(
+            {k: v for k, v in config.items() if k not in ["presets", "run_config"]}))
+
+    _validate_run_config(config.get("run_config", {}), path)
+    default_config = get_default_config(config.get("run_config", {}))
+
+    # Store the result serialized, loading it again is cheaper than parsing the JSON files
+    # and every run gets its own copy which it can modify
+    return pickle.dumps((config, default_config), pickle.HIGHEST_PROTOCOL)
+
+
+def load_step_config(folder: str, name: str):
+    """Lädt eine Step-Konfiguration und fügt die Presets aus `global_presets.json` hinzu.
+
+    Presets, die in der Konfiguration verwendet werden, werden direkt eingefügt (siehe :func:`inline_presets`).
+
+    Das Ergebnis wird zwischengespeichert, solange sich die Dateien nicht ändern.
+    Jeder Aufruf gibt eine neue Kopie zurück, die vom Aufrufer verändert werden darf.
+
+    :param folder: Ordner der Konfiguration relativ zum `resources`-Ordner (z.B. `steps` oder `datasources`).
+    :param name: Name der Konfiguration (ohne `.json`).
+    :return: Die Step-Konfiguration und die Standard-Konfiguration aus deren `run_config`.
+    :rtype: dict, dict
+    :raises: OSError, wenn eine der Dateien nicht existiert.
+    :raises: ValueError, wenn die Konfiguration ungültig ist.
+    """
+    path = resources.get_resource_path(os.path.join(folder, f"{name}.json"))
+    presets_path = resources.get_resource_path(os.path.join(folder, "global_presets.json"))
+    state = (_file_state(path), _file_state(presets_path))
+
+    with _lock:
+        entry = _cache.get(path, None)
+
+    if entry is None or entry[0] != state:
+        entry = (state, _load(path, presets_path))
+
+        with _lock:
+            _cache[path] = entry
+
+    return pickle.loads(entry[1])
+
+
+def clear_cache():
+    """Leert den Zwischenspeicher aller Step-Konfigurationen."""
+    with _lock:
+        _cache.clear()
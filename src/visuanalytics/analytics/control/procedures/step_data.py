@@ -2,6 +2,8 @@
 Modul, das die Klasse :class:`StepData` beinhaltet.
 """
 import numbers
+import threading
+from collections import ChainMap
 from copy import copy
 
 from visuanalytics.analytics.util.step_errors import APIKeyError, PresetError
@@ -10,6 +12,24 @@ from visuanalytics.analytics.util.step_pattern import StepPatternFormatter, data
 from visuanalytics.util import config_manager
 
 
+class _LoopScope(ChainMap):
+    """
+    Sicht auf die Daten eines Jobs, in der zusätzlich die Schleifenvariablen (`_loop`, `_idx`, `_key`) sichtbar sind.
+
+    Die Schleifenvariablen haben beim Lesen Vorrang. Änderungen werden immer in die Daten des Jobs geschrieben,
+    so muss das Dictionary mit den Daten nicht bei jedem Zugriff kopiert werden.
+    """
+
+    def __setitem__(self, key, value):
+        self.maps[-1][key] = value
+
+    def __delitem__(self, key):
+        del self.maps[-1][key]
+
+    def pop(self, key, *args):
+        return self.maps[-1].pop(key, *args)
+
+
 class StepData(object):
     """
     Datenklasse zur Speicherung und Manipulation der Daten eines Jobs.
@@ -29,6 +49,21 @@ class StepData(object):
         self.__formatter = StepPatternFormatter()
         self.__presets = presets
         self.__data_prefix = data_prefix
+        # Steps may run in parallel threads (see step_graph), so writes have to be serialized
+        self.__lock = threading.RLock()
+        # TypeProfiler of the pipeline, only set if profiling is enabled (see type_profiler)
+        self.profiler = None
+
+    def __getstate__(self):
+        # Used to pass the data to worker processes (see transform parallel), locks can not be pickled
+        state = self.__dict__.copy()
+        del state["_StepData__lock"]
+        state["profiler"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.RLock()
 
     @staticmethod
     def get_api_key(api_key_name):
@@ -159,10 +194,7 @@ class StepData(object):
             if isinstance(key, return_on_type):
                 return key
 
-        if values is None:
-            values = {}
-
-        data = {**self.__data, **values.get("_loop_states", {})}
+        data = self.__scope(values)
         key = self.__formatter.format(key, data)
 
         return data_get_pattern(key, data)
@@ -181,9 +213,10 @@ class StepData(object):
         """
         if api_key_name is not None:
             api_key_name = self.format(api_key_name, values)
-            data = {**self.__data, **values.get("_loop_states", {}), "_api_key": self.get_api_key(api_key_name)}
+            data = _LoopScope({"_api_key": self.get_api_key(api_key_name)}, values.get("_loop_states", {}),
+                              self.__data)
         else:
-            data = {**self.__data, **values.get("_loop_states", {})}
+            data = self.__scope(values)
 
         return self.__formatter.format(value_string, data)
 
@@ -244,11 +277,7 @@ class StepData(object):
         if isinstance(value_string, numbers.Number):
             return value_string
 
-        if values is None:
-            values = {}
-
-        data = {**self.__data, **values.get("_loop_states", {})}
-        return self.__formatter.format(value_string, data)
+        return self.__formatter.format(value_string, self.__scope(values))
 
     def insert_data(self, key_string: str, value, values: dict):
         """
@@ -262,11 +291,12 @@ class StepData(object):
         :param values: Werte aus der JSON-Datei
         :raises: StepKeyError
         """
-        key_string = self.__prepare_data_manipulation(key_string, values)
+        with self.__lock:
+            key_string = self.__prepare_data_manipulation(key_string, values)
 
-        data_insert_pattern(key_string, self.__data, value)
+            data_insert_pattern(key_string, self.__scope(values), value)
 
-        self.__clean_up_data_manipulation()
+            self.__clean_up_data_manipulation()
 
     def remove_data(self, key_string: str, values: dict):
         """
@@ -279,15 +309,22 @@ class StepData(object):
         :param values: Werte aus der JSON-Datei
         :raises: StepKeyError
         """
-        key_string = self.__prepare_data_manipulation(key_string, values)
+        with self.__lock:
+            key_string = self.__prepare_data_manipulation(key_string, values)
+
+            data_remove_pattern(key_string, self.__scope(values))
+
+            self.__clean_up_data_manipulation()
+
+    def __scope(self, values: dict):
+        loop_states = values.get("_loop_states", None) if values is not None else None
 
-        data_remove_pattern(key_string, self.__data)
+        if not loop_states:
+            return self.__data
 
-        self.__clean_up_data_manipulation()
+        return _LoopScope(loop_states, self.__data)
 
     def __prepare_data_manipulation(self, key_string: str, values: dict):
-        # Save loop values current into data to access them
-        self.__data = {**self.__data, **values.get("_loop_states", {})}
         return self.format(key_string, values)
 
     def __clean_up_data_manipulation(self):
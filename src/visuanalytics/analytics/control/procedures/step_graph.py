@@ -0,0 +1,96 @@
+"""
+Modul zum Ausführen von Pipeline-Schritten anhand ihrer Abhängigkeiten.
+
+Jeder Schritt kann unter `requires` die IDs der Schritte angeben, deren Ergebnisse er benötigt.
+Schritte, die nicht voneinander abhängen (z.B. `Images` und `Audios`), können so parallel
+in mehreren Threads ausgeführt werden.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def _check_graph(steps: dict, step_ids: list, finished: set):
+    for step_id in step_ids:
+        for required in steps[step_id].get("requires", []):
+            if required not in step_ids and required not in finished:
+                raise ValueError(f"Step {step_id} requires unknown step {required}")
+
+
+def _is_ready(steps: dict, step_id, finished: set):
+    return all(required in finished for required in steps[step_id].get("requires", []))
+
+
+def topological_order(steps: dict, step_ids: list, finished: set = None):
+    """Sortiert die Schritte so, dass jeder Schritt nach allen Schritten steht, von denen er abhängt.
+
+    Bei Schritten ohne gegenseitige Abhängigkeit bleibt die Reihenfolge aus `step_ids` erhalten.
+
+    :param steps: Dictionary mit `id: step`, jeder Schritt kann unter `requires` eine Liste von IDs enthalten.
+    :param step_ids: IDs der Schritte, die ausgeführt werden sollen.
+    :param finished: IDs der Schritte, die bereits ausgeführt wurden.
+    :return: Sortierte Liste der IDs.
+    :raises: ValueError, wenn die Abhängigkeiten einen Zyklus bilden oder unbekannte Schritte enthalten.
+    """
+    finished = set(finished or [])
+    _check_graph(steps, step_ids, finished)
+
+    order = []
+    pending = list(step_ids)
+    while pending:
+        ready = [step_id for step_id in pending if _is_ready(steps, step_id, finished.union(order))]
+        if not ready:
+            raise ValueError(f"Steps {pending} have cyclic dependencies")
+
+        order.append(ready[0])
+        pending.remove(ready[0])
+
+    return order
+
+
+def run_step_graph(steps: dict, step_ids: list, execute, parallel=True, finished: list = None):
+    """Führt alle Schritte aus `step_ids` unter Beachtung ihrer Abhängigkeiten aus.
+
+    Ist `parallel` `True`, werden alle Schritte, deren Abhängigkeiten erfüllt sind, gleichzeitig in
+    einem Thread-Pool gestartet. Sonst werden die Schritte nacheinander in topologischer Reihenfolge ausgeführt.
+
+    Tritt in einem Schritt ein Fehler auf, werden keine weiteren Schritte gestartet. Nachdem alle laufenden
+    Schritte beendet sind, wird der erste aufgetretene Fehler weitergegeben.
+
+    :param steps: Dictionary mit `id: step`, jeder Schritt kann unter `requires` eine Liste von IDs enthalten.
+    :param step_ids: IDs der Schritte, die ausgeführt werden sollen.
+    :param execute: Funktion, die mit der ID eines Schrittes aufgerufen wird und diesen ausführt.
+    :param parallel: Ob unabhängige Schritte parallel ausgeführt werden sollen.
+    :param finished: IDs der Schritte, die bereits ausgeführt wurden (z.B. bei der Fortsetzung ab einem Checkpoint).
+    :raises: ValueError, wenn die Abhängigkeiten einen Zyklus bilden oder unbekannte Schritte enthalten.
+    """
+    order = topological_order(steps, step_ids, finished)
+
+    if not parallel:
+        for step_id in order:
+            execute(step_id)
+        return
+
+    finished = set(finished or [])
+    running = {}
+    error = None
+
+    with ThreadPoolExecutor(max_workers=len(order) or 1, thread_name_prefix="step") as executor:
+        while order or running:
+            # Start all steps whose dependencies are finished
+            if error is None:
+                for step_id in [s for s in order if _is_ready(steps, s, finished)]:
+                    order.remove(step_id)
+                    running[executor.submit(execute, step_id)] = step_id
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                else:
+                    finished.add(step_id)
+
+    if error is not None:
+        raise error
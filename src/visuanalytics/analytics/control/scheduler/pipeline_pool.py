@@ -0,0 +1,114 @@
+"""
+Modul, welches einen begrenzten Pool von Worker-Threads für die Ausführung von Pipelines bereitstellt.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = {"job": 2, "datasource": 4}
+"""
+Maximale Anzahl gleichzeitig laufender Pipelines je Pipeline-Typ.
+Wird beim Starten mit den Werten aus der Konfigurationsdatei (`scheduler`) überschrieben.
+"""
+
+
+class PipelinePool(object):
+    """Führt Pipelines mit einer begrenzten Anzahl an Worker-Threads je Pipeline-Typ aus.
+
+    Für jeden Pipeline-Typ gibt es eine eigene Warteschlange. Pipelines werden nach ihrer Priorität
+    (kleinere Werte zuerst) und bei gleicher Priorität in der Reihenfolge ihres Eintreffens gestartet.
+    Ist eine Pipeline mit derselben ID noch in der Warteschlange oder wird noch ausgeführt,
+    wird der neue Durchlauf übersprungen.
+
+    :param max_workers: Dictionary mit `pipeline_type: Anzahl der Worker`.
+    :type max_workers: dict
+    """
+
+    def __init__(self, max_workers: dict = None):
+        if max_workers is None:
+            max_workers = MAX_WORKERS
+
+        self.__max_workers = {t: max(1, int(count)) for t, count in max_workers.items()}
+        self.__queues = {}
+        self.__active = set()
+        self.__lock = threading.Lock()
+        self.__counter = itertools.count()
+
+    def __get_queue(self, pipeline_type: str):
+        with self.__lock:
+            if pipeline_type not in self.__queues:
+                self.__queues[pipeline_type] = queue.PriorityQueue()
+
+                # Start workers on first use
+                for idx in range(self.__max_workers.get(pipeline_type, 1)):
+                    threading.Thread(target=self.__worker, args=(pipeline_type, self.__queues[pipeline_type]),
+                                     name=f"{pipeline_type}-worker-{idx}", daemon=True).start()
+
+            return self.__queues[pipeline_type]
+
+    def is_active(self, pipeline_type: str, run_id):
+        """Gibt zurück, ob eine Pipeline noch in der Warteschlange ist oder ausgeführt wird.
+
+        :param pipeline_type: Typ der Pipeline (z.B. `job` oder `datasource`).
+        :param run_id: ID des Jobs bzw. der Datenquelle.
+        :rtype: bool
+        """
+        with self.__lock:
+            return (pipeline_type, run_id) in self.__active
+
+    def queue_depth(self, pipeline_type: str):
+        """Anzahl der Pipelines, die auf einen freien Worker warten.
+
+        :param pipeline_type: Typ der Pipeline (z.B. `job` oder `datasource`).
+        :rtype: int
+        """
+        with self.__lock:
+            q = self.__queues.get(pipeline_type, None)
+
+        return q.qsize() if q is not None else 0
+
+    def submit(self, pipeline_type: str, run_id, pipeline, priority: int = 0):
+        """Fügt eine Pipeline der Warteschlange ihres Typs hinzu.
+
+        :param pipeline_type: Typ der Pipeline (z.B. `job` oder `datasource`).
+        :param run_id: ID des Jobs bzw. der Datenquelle.
+        :param pipeline: Pipeline, deren Funktion `start` aufgerufen werden soll.
+        :param priority: Priorität der Pipeline (kleinere Werte werden zuerst gestartet).
+        :return: `False`, wenn der vorherige Durchlauf noch nicht beendet ist und die Pipeline übersprungen wurde.
+        :rtype: bool
+        """
+        key = (pipeline_type, run_id)
+
+        with self.__lock:
+            if key in self.__active:
+                logger.warning(f"Skipping {pipeline_type} {run_id}: previous run is still queued or running")
+                return False
+
+            self.__active.add(key)
+
+        q = self.__get_queue(pipeline_type)
+        q.put((priority, next(self.__counter), time.time(), key, pipeline))
+
+        logger.info(f"Queued {pipeline_type} {run_id}, queue depth: {q.qsize()}")
+        return True
+
+    def __worker(self, pipeline_type: str, q: queue.PriorityQueue):
+        while True:
+            _, _, queued_at, key, pipeline = q.get()
+
+            logger.info(f"Starting {pipeline_type} {key[1]} after waiting {round(time.time() - queued_at, 2)}s, "
+                        f"queue depth: {q.qsize()}")
+            try:
+                pipeline.start()
+            except BaseException:
+                logger.exception("An error occurred: ")
+            finally:
+                with self.__lock:
+                    self.__active.discard(key)
+
+                q.task_done()
@@ -12,6 +12,7 @@ from datetime import datetime, time as dt_time, timedelta
 
 from visuanalytics.analytics.control.procedures.pipeline import Pipeline
 from visuanalytics.analytics.control.procedures.DatasourcePipeline import DatasourcePipeline
+from visuanalytics.analytics.control.scheduler.pipeline_pool import PipelinePool
 from visuanalytics.server.db import job
 from visuanalytics.util import config_manager
 
@@ -31,12 +32,49 @@ def ignore_errors(func):
     return ignore_error_func
 
 
+class RetryPipeline(object):
+    """Führt eine Pipeline aus und wiederholt sie, falls sie fehlschlägt und ein Checkpoint existiert.
+
+    Die Wiederholungen setzen nach dem letzten Checkpoint fort (siehe :mod:`checkpoint`), höchstens
+    `checkpoint_retries` Mal (Standard: 1).
+
+    :param create_pipeline: Funktion, die eine neue Pipeline erstellt und als Parameter erhält, ob diese nach dem
+        letzten Checkpoint fortsetzen soll (`resume`).
+    """
+
+    def __init__(self, create_pipeline):
+        self.__create_pipeline = create_pipeline
+
+    def start(self):
+        """Führt die Pipeline inklusive der Wiederholungen aus.
+
+        :return: Ob ein Durchlauf ohne Fehler ausgeführt wurde.
+        :rtype: bool
+        """
+        pipeline = self.__create_pipeline(False)
+        retries = None
+
+        while not pipeline.start():
+            # The config of the job is merged with the defaults of the step config while starting the pipeline
+            if retries is None:
+                retries = pipeline.steps_config.get("checkpoint_retries", 1)
+
+            if not pipeline.resumable or retries <= 0:
+                return False
+
+            retries -= 1
+            pipeline = self.__create_pipeline(True)
+            logger.info(f"Retrying pipeline {pipeline.id} after the last checkpoint")
+
+        return True
+
+
 class Scheduler(object):
     """Klasse zum Ausführen der Jobs an vorgegebenen Zeitpunkten.
 
     Wenn :func:`start` aufgerufen wird, testet die Funktion jede Minute, ob ein Job ausgeführt werden muss.
      Ist dies der Fall, wird die dazugehörige Konfigurationsdatei aus der Datenbank geladen und
-     der Job wird in einem anderen Thread ausgeführt. Um zu bestimmen, ob ein Job ausgeführt werden muss,
+     der Job wird von einem :class:`PipelinePool` in einem anderen Thread ausgeführt. Um zu bestimmen, ob ein Job ausgeführt werden muss,
      werden die Daten aus der Datenbank mithilfe der Funktion :func:job.get_all_schedules` aus der Datenbak geholt
      und getestet, ob diese jetzt ausgeführt werden müssen.
 
@@ -46,6 +84,7 @@ class Scheduler(object):
 
     def __init__(self):
         self._interval = {}
+        self._pool = PipelinePool()
 
     @staticmethod
     def _check_time(now: datetime, run_time: dt_time):
@@ -102,28 +141,25 @@ class Scheduler(object):
         config = {**config_manager.STEPS_BASE_CONFIG, **config}
         config["job_name"] = re.sub(r'\s+', '-', job_name.strip())
 
-        t = threading.Thread(
-            target=Pipeline(job_id,
-                            uuid.uuid4().hex,
-                            steps_name,
-                            config,
-                            log_to_db
-                            ).start)
-        t.start()
+        self._pool.submit("job", job_id, RetryPipeline(lambda resume: Pipeline(job_id,
+                                                                               uuid.uuid4().hex,
+                                                                               steps_name,
+                                                                               config,
+                                                                               log_to_db,
+                                                                               resume=resume
+                                                                               )))
 
     def _start_datasource(self, datasource_id: int, datasource_name: str, steps_name: str, config: dict, log_to_db=False):
         # Add base_config if exists
         config = {**config_manager.STEPS_BASE_CONFIG, **config}
         config["job_name"] = re.sub(r'\s+', '-', datasource_name.strip())
 
-        t = threading.Thread(
-            target=DatasourcePipeline(datasource_id,
-                                        uuid.uuid4().hex,
-                                        datasource_name,
-                                        config,
-                                        log_to_db
-                                        ).start)
-        t.start()
+        self._pool.submit("datasource", datasource_id, DatasourcePipeline(datasource_id,
+                                                                          uuid.uuid4().hex,
+                                                                          datasource_name,
+                                                                          config,
+                                                                          log_to_db
+                                                                          ))
 
     @ignore_errors
     def _check_all(self, now):
@@ -132,8 +168,8 @@ class Scheduler(object):
     def start(self):
         """Startet den Scheduler (Blocking).
 
-        Testet jede Minute, ob Jobs ausgeführt werden müssen. Ist dies der Fall, werden diese in
-        einem anderen Thread ausgeführt.
+        Testet jede Minute, ob Jobs ausgeführt werden müssen. Ist dies der Fall, werden diese
+        dem :class:`PipelinePool` übergeben und in einem anderen Thread ausgeführt.
         """
         logger.info("Scheduler started")
         while True:
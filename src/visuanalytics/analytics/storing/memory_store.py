@@ -0,0 +1,400 @@
+"""
+Modul, welches historisierte Daten (Memory) in einer SQLite-Datenbank je Job und Name speichert.
+
+Die Datenbank liegt unter `resources/memory/<job_name>/<name>/memory.db`. Die Einträge werden nur angehängt und
+sind nach ihrem Erstellungszeitpunkt indiziert, dadurch können die letzten `n` Einträge oder der Eintrag eines
+bestimmten Tages mit einer Abfrage gelesen werden.
+
+Zu jedem Eintrag wird ein Hash über eine kanonische JSON-Darstellung gespeichert (siehe :func:`content_hash`), dadurch
+kann ohne Lesen des letzten Eintrags erkannt werden, ob sich die Daten geändert haben.
+
+Einträge können komprimiert gespeichert werden (siehe :data:`COMPRESSIONS`), beim Lesen werden sie automatisch entpackt.
+
+Sind die Einträge Zahlen (z.B. historisierte Werte für Diagramme), wird zusätzlich eine Zeitreihe der letzten Werte mit
+Minimum, Maximum und Mittelwert fortgeschrieben (siehe :func:`series`), die mit einem Zugriff gelesen werden kann.
+
+Ordner, die noch einzelne JSON-Dateien (ein Eintrag je Datei) enthalten, werden beim ersten Zugriff (bzw. beim
+Starten durch :func:`migrate`) in die Datenbank übernommen.
+"""
+import hashlib
+import json
+import logging
+import lzma
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from visuanalytics.util import resources
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DB = "memory.db"
+"""Name der Datenbank-Datei im Ordner eines Memory-Eintrags."""
+
+COMPRESSIONS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress)
+}
+"""Verfügbare Komprimierungen der Einträge (Funktionen zum Komprimieren und Entpacken)."""
+
+_MIGRATIONS = [
+    [
+        "CREATE TABLE snapshot (id INTEGER PRIMARY KEY AUTOINCREMENT, created TEXT NOT NULL, data TEXT NOT NULL)",
+        "CREATE INDEX snapshot_created ON snapshot (created)"
+    ],
+    [
+        # Entries without a hash (from older versions) get it when it is needed for the first time
+        "ALTER TABLE snapshot ADD COLUMN hash TEXT"
+    ],
+    [
+        # NULL for uncompressed entries
+        "ALTER TABLE snapshot ADD COLUMN compression TEXT"
+    ],
+    [
+        # Single row with the newest numeric values (newest first) and their aggregates
+        "CREATE TABLE series (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL, data TEXT NOT NULL, "
+        "min REAL, max REAL, mean REAL)"
+    ]
+]
+
+_FILE_DATE_FORMATS = ["%Y-%m-%d-%H-%M-%S", "%Y-%m-%d"]
+
+_lock = threading.Lock()
+
+
+def _get_folder(job_name: str, name: str):
+    return resources.get_memory_path("", name, job_name)
+
+
+def _format_time(time: datetime):
+    return time.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _init_schema(con: sqlite3.Connection):
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+
+    for idx in range(version, len(_MIGRATIONS)):
+        with con:
+            for statement in _MIGRATIONS[idx]:
+                con.execute(statement)
+            con.execute(f"PRAGMA user_version = {idx + 1}")
+
+
+def _encode(data, compression: str):
+    text = json.dumps(data)
+    if compression is None:
+        return text
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown memory compression '{compression}', use one of {list(COMPRESSIONS)}")
+
+    return COMPRESSIONS[compression][0](text.encode("utf-8"))
+
+
+def _decode(data, compression: str):
+    if compression is None:
+        return json.loads(data)
+
+    return json.loads(COMPRESSIONS[compression][1](data).decode("utf-8"))
+
+
+def _file_time(folder: str, file: str):
+    for date_format in _FILE_DATE_FORMATS:
+        try:
+            return datetime.strptime(file[:-len(".json")], date_format)
+        except ValueError:
+            pass
+
+    return datetime.fromtimestamp(os.path.getmtime(os.path.join(folder, file)))
+
+
+def _import_files(con: sqlite3.Connection, folder: str, remove_files: bool = False):
+    files = sorted(file for file in os.listdir(folder) if file.endswith(".json"))
+
+    rows = []
+    for file in files:
+        with open(os.path.join(folder, file), encoding="utf-8") as fp:
+            rows.append((_format_time(_file_time(folder, file)), fp.read()))
+
+    with con:
+        con.executemany("INSERT INTO snapshot (created, data) VALUES (?, ?)", rows)
+
+    if remove_files:
+        for file in files:
+            os.remove(os.path.join(folder, file))
+
+    if files:
+        logger.info(f"Migrated {len(files)} memory files in '{folder}'")
+
+    return len(files)
+
+
+def _connect(job_name: str, name: str, create: bool = False):
+    folder = _get_folder(job_name, name)
+
+    if not os.path.isdir(folder):
+        if not create:
+            raise FileNotFoundError(f"No memory for '{job_name}/{name}'")
+        os.makedirs(folder, exist_ok=True)
+
+    path = os.path.join(folder, MEMORY_DB)
+
+    with _lock:
+        exists = os.path.exists(path)
+        con = sqlite3.connect(path, timeout=30)
+        _init_schema(con)
+
+        # Take over the entries of the previous file based memory
+        if not exists:
+            _import_files(con, folder)
+
+    return con
+
+
+def content_hash(data):
+    """Berechnet den Hash von Daten über eine kanonische JSON-Darstellung (sortierte Keys, ohne Leerzeichen).
+
+    Daten, die nach dem Speichern und Laden gleich sind, haben denselben Hash.
+
+    :param data: Daten, die als JSON darstellbar sind.
+    :return: SHA-256-Hash der Daten.
+    :rtype: str
+    """
+    try:
+        text = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except TypeError:
+        # Keys of different types can not be sorted, they are strings after loading anyway
+        text = json.dumps(json.loads(json.dumps(data)), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _aggregate(values: list):
+    return {"values": values, "min": min(values), "max": max(values), "mean": sum(values) / len(values)}
+
+
+def _update_series(con: sqlite3.Connection, value, size: int):
+    row = con.execute("SELECT data FROM series").fetchone()
+
+    if row is not None:
+        values = json.loads(row[0])
+    else:
+        # Start with the numeric values of the existing entries
+        values = []
+        for data, compression in con.execute("SELECT data, compression FROM snapshot ORDER BY created DESC, id DESC "
+                                             "LIMIT ?", (size,)):
+            old_value = _decode(data, compression)
+            if not _is_number(old_value):
+                break
+            values.append(old_value)
+
+    _store_series(con, ([value] + values)[:size], size)
+
+
+def _store_series(con: sqlite3.Connection, values: list, size: int):
+    aggregates = _aggregate(values)
+    con.execute("INSERT OR REPLACE INTO series (id, size, data, min, max, mean) VALUES (0, ?, ?, ?, ?, ?)",
+                (size, json.dumps(aggregates["values"]), aggregates["min"], aggregates["max"], aggregates["mean"]))
+
+
+def append(job_name: str, name: str, data, created: datetime = None, data_hash: str = None, compression: str = None,
+           series_size: int = 10):
+    """Fügt einen neuen Eintrag hinzu.
+
+    Ist der Eintrag eine Zahl, wird diese außerdem an den Anfang der Zeitreihe (siehe :func:`series`) gesetzt.
+    Andernfalls (oder wenn der Eintrag älter als der neueste Eintrag ist) wird die Zeitreihe gelöscht, sodass
+    :func:`series` die Werte aus den Einträgen liest.
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wird.
+    :param data: Daten, die gespeichert werden sollen (müssen als JSON darstellbar sein).
+    :param created: Erstellungszeitpunkt (Standard: jetzt).
+    :param data_hash: Bereits berechneter Hash der Daten (siehe :func:`content_hash`).
+    :param compression: Komprimierung des Eintrags (siehe :data:`COMPRESSIONS`, Standard: keine).
+    :param series_size: Maximale Anzahl an Werten in der Zeitreihe.
+    :raises: ValueError, wenn die Komprimierung nicht bekannt ist.
+    """
+    encoded = _encode(data, compression)
+    created = _format_time(created or datetime.now())
+
+    with closing(_connect(job_name, name, True)) as con, con:
+        newest = con.execute("SELECT MAX(created) FROM snapshot").fetchone()[0]
+
+        # The series is updated before the insert, so it is initialized with the previous entries only.
+        # It only contains the newest entries, so it is invalidated by other or older entries
+        if _is_number(data) and (newest is None or created >= newest):
+            _update_series(con, data, series_size)
+        else:
+            con.execute("DELETE FROM series")
+
+        con.execute("INSERT INTO snapshot (created, data, hash, compression) VALUES (?, ?, ?, ?)",
+                    (created, encoded, data_hash or content_hash(data), compression))
+
+
+def series(job_name: str, name: str, count: int = None):
+    """Gibt die zuletzt gespeicherten Zahlen (die neueste zuerst) mit Minimum, Maximum und Mittelwert zurück.
+
+    Die Werte werden beim Speichern fortgeschrieben und mit einem Zugriff gelesen. Ist die Zeitreihe nicht
+    vorhanden oder zu kurz, werden die Werte aus den einzelnen Einträgen gelesen.
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wurde.
+    :param count: Anzahl der Werte (Standard: alle Werte der Zeitreihe).
+    :return: Dictionary mit `values`, `min`, `max` und `mean`.
+    :rtype: dict
+    :raises: FileNotFoundError, IndexError, wenn weniger als `count` Einträge vorhanden sind,
+        ValueError, wenn die Einträge keine Zahlen sind.
+    """
+    with closing(_connect(job_name, name)) as con:
+        row = con.execute("SELECT data, min, max, mean FROM series").fetchone()
+
+    if row is not None:
+        values = json.loads(row[0])
+
+        if count is None or count == len(values):
+            return {"values": values, "min": row[1], "max": row[2], "mean": row[3]}
+        if count < len(values):
+            return _aggregate(values[:count])
+
+    values = last(job_name, name, count or 1)
+    if not all(_is_number(value) for value in values):
+        raise ValueError(f"Memory entries of '{job_name}/{name}' are not numeric")
+
+    return _aggregate(values)
+
+
+def last_hash(job_name: str, name: str):
+    """Gibt den Hash des zuletzt erstellten Eintrags zurück.
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wurde.
+    :return: Hash des Eintrags (siehe :func:`content_hash`) oder `None`, wenn keine Einträge vorhanden sind.
+    :rtype: str
+    """
+    try:
+        con = _connect(job_name, name)
+    except FileNotFoundError:
+        return None
+
+    with closing(con):
+        row = con.execute("SELECT id, hash FROM snapshot ORDER BY created DESC, id DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+
+        entry_id, data_hash = row
+        if data_hash is None:
+            data, compression = con.execute("SELECT data, compression FROM snapshot WHERE id = ?",
+                                            (entry_id,)).fetchone()
+            data_hash = content_hash(_decode(data, compression))
+            with con:
+                con.execute("UPDATE snapshot SET hash = ? WHERE id = ?", (data_hash, entry_id))
+
+        return data_hash
+
+
+def last(job_name: str, name: str, count: int = 1, skip_today: bool = False):
+    """Gibt die zuletzt erstellten Einträge zurück (der neueste zuerst).
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wurde.
+    :param count: Anzahl der Einträge.
+    :param skip_today: Ob der neueste Eintrag übersprungen werden soll, wenn er heute erstellt wurde.
+    :return: Liste mit den Daten der Einträge.
+    :rtype: list
+    :raises: FileNotFoundError, wenn keine Einträge vorhanden sind, IndexError, wenn weniger als `count` Einträge vorhanden sind.
+    """
+    with closing(_connect(job_name, name)) as con:
+        rows = con.execute("SELECT created, data, compression FROM snapshot ORDER BY created DESC, id DESC LIMIT ?",
+                           (count + 1 if skip_today else count,)).fetchall()
+
+    if skip_today and rows and rows[0][0].startswith(datetime.now().strftime("%Y-%m-%d")):
+        rows = rows[1:]
+
+    rows = rows[:count]
+    if len(rows) < count:
+        raise IndexError(f"Only {len(rows)} of {count} memory entries available for '{job_name}/{name}'")
+
+    return [_decode(data, compression) for _, data, compression in rows]
+
+
+def at(job_name: str, name: str, time_delta: int):
+    """Gibt den zuletzt erstellten Eintrag eines Tages zurück.
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wurde.
+    :param time_delta: Tage, die vom heutigen Tag abgezogen werden.
+    :return: Daten des Eintrags.
+    :raises: FileNotFoundError, IndexError, wenn an diesem Tag kein Eintrag erstellt wurde.
+    """
+    day = (datetime.now() - timedelta(time_delta)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    with closing(_connect(job_name, name)) as con:
+        row = con.execute("SELECT data, compression FROM snapshot WHERE created >= ? AND created < ? "
+                          "ORDER BY created DESC, id DESC LIMIT 1",
+                          (_format_time(day), _format_time(day + timedelta(1)))).fetchone()
+
+    if row is None:
+        raise IndexError(f"No memory entry from {day.strftime('%Y-%m-%d')} available for '{job_name}/{name}'")
+
+    return _decode(*row)
+
+
+def prune(job_name: str, name: str, count: int):
+    """Löscht alte Einträge, sobald mehr als `count` Einträge vorhanden sind.
+
+    :param job_name: Name des Jobs, von dem die Funktion aufgerufen wurde.
+    :param name: Name des Dictionaries, das exportiert wurde.
+    :param count: Anzahl an Einträgen, die behalten werden.
+    """
+    with closing(_connect(job_name, name)) as con, con:
+        deleted = con.execute("DELETE FROM snapshot WHERE id NOT IN "
+                              "(SELECT id FROM snapshot ORDER BY created DESC, id DESC LIMIT ?)", (count,)).rowcount
+
+        # The series must not contain values of deleted entries
+        row = con.execute("SELECT data, size FROM series").fetchone()
+        if deleted > 0 and row is not None and len(json.loads(row[0])) > count:
+            if count > 0:
+                _store_series(con, json.loads(row[0])[:count], row[1])
+            else:
+                con.execute("DELETE FROM series")
+
+    if deleted > 0:
+        logger.info(f"{deleted} old memory entries of '{job_name}/{name}' have been deleted.")
+
+
+def migrate(remove_files: bool = False):
+    """Übernimmt alle Memory-Ordner, die noch einzelne JSON-Dateien enthalten, in die Datenbank.
+
+    Ordner, die bereits eine Datenbank enthalten, werden nicht verändert.
+
+    :param remove_files: Ob die JSON-Dateien nach dem Übernehmen gelöscht werden sollen.
+    :return: Anzahl der übernommenen Dateien.
+    :rtype: int
+    """
+    root = resources.get_resource_path(resources.MEMORY_LOCATION)
+    if not os.path.isdir(root):
+        return 0
+
+    count = 0
+    for job_name in sorted(os.listdir(root)):
+        if not os.path.isdir(os.path.join(root, job_name)):
+            continue
+
+        for name in sorted(os.listdir(os.path.join(root, job_name))):
+            folder = _get_folder(job_name, name)
+            path = os.path.join(folder, MEMORY_DB)
+
+            if not os.path.isdir(folder) or os.path.exists(path):
+                continue
+
+            with _lock, closing(sqlite3.connect(path, timeout=30)) as con:
+                _init_schema(con)
+                count += _import_files(con, folder, remove_files)
+
+    return count
@@ -1,22 +1,20 @@
 """
-Modul, welches Dictionaries in JSON-Dateien schreibt.
+Modul, welches Dictionaries in den Memory-Speicher (siehe :mod:`memory_store`) schreibt.
 """
 
 import copy
-import json
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.storing import memory_store
 from visuanalytics.analytics.util.step_errors import raise_step_error, StoringError, StepKeyError
 from visuanalytics.analytics.util.step_pattern import data_remove_pattern
-from visuanalytics.analytics.util.video_delete import delete_memory_files
-from visuanalytics.util import resources
 
 
 @raise_step_error(StoringError)
 def storing(values: dict, data: StepData):
-    """Schreibt die API-Daten nach Ausführung der `transform`-Typen in eine JSON-Datei.
+    """Schreibt die API-Daten nach Ausführung der `transform`-Typen in den Memory-Speicher.
 
-    Als Dateiname wird der Jobname sowie das heutige Datum verwendet.
+    Die Einträge werden unter dem Jobnamen und dem Namen aus der Konfiguration mit dem aktuellen Zeitpunkt gespeichert.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
@@ -25,20 +23,15 @@ def storing(values: dict, data: StepData):
         for value in values["storing"]:
             new_data = _remove_keys(value, data, data.get_data(value["key"], values))
             name = data.format(value["name"])
+            data_hash = memory_store.content_hash(new_data)
             if value.get("safe_only_on_change", True):
-                try:
-                    with resources.open_specific_memory_resource(data.get_config("job_name"),
-                                                                 name, False) as fp:
-                        old_data = json.loads(fp.read())
-                    if old_data == new_data:
-                        continue
-                except (FileNotFoundError, IndexError):
-                    pass
-            file_name = resources.new_memory_resource_path(data.get_config("job_name"), name)
-            with open(file_name, 'w') as fp:
-                json.dump(new_data, fp)
-            delete_memory_files(data.get_config("job_name"),
-                                value["name"], data.get_data(value.get("count", 10), values, int))
+                # Only the hash of the newest entry is read, the entry itself is not parsed
+                if memory_store.last_hash(data.get_config("job_name"), name) == data_hash:
+                    continue
+            count = data.get_data(value.get("count", 10), values, int)
+            memory_store.append(data.get_config("job_name"), name, new_data, data_hash=data_hash,
+                                compression=value.get("compression", None), series_size=count)
+            memory_store.prune(data.get_config("job_name"), name, count)
 
 
 def _remove_keys(value, data: StepData, export_data):
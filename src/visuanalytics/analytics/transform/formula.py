@@ -0,0 +1,105 @@
+"""
+Modul, welches Formeln für den `transform`-Typ `formula` in Python-Funktionen übersetzt.
+
+Eine Formel wird als Baum angegeben (siehe :func:`visuanalytics.util.infoprovider_utils.parse_formula`):
+
+- Rechnung: `{"operator": "ADD", "decimal": 2, "lop": ..., "rop": ...}`
+  (`operator`: `ADD`, `SUB`, `MUL`, `DIV` oder `MOD`). Ist `decimal` angegeben, wird das Ergebnis der Rechnung auf
+  diese Nachkommastelle gerundet (bei `0` als ganze Zahl).
+- Key: String, der Wert wird beim Ausführen aus den Daten gelesen.
+- Zahl: wird unverändert verwendet.
+
+Die übersetzte Formel wird je Baum zwischengespeichert, damit sie z.B. in einem `transform_array`
+nur einmal übersetzt wird. Dabei wird nur ausgeführt, was im Baum steht (kein `eval`).
+"""
+import functools
+import json
+import numbers
+import operator
+import threading
+from collections import OrderedDict
+
+OPERATORS = {
+    "ADD": operator.add,
+    "SUB": operator.sub,
+    "MUL": operator.mul,
+    "DIV": operator.truediv,
+    "MOD": operator.mod
+}
+"""Operatoren, die in einer Formel verwendet werden können."""
+
+CACHE_SIZE = 256
+"""Maximale Anzahl zwischengespeicherter Formeln."""
+
+# Compiled formulas by the id of their tree, the tree is kept so that its id is not reused
+_by_tree = OrderedDict()
+_lock = threading.Lock()
+
+
+def round_result(value, decimal):
+    """Rundet ein (Zwischen-)Ergebnis wie der `transform`-Typ `calculate`.
+
+    :param value: Ergebnis einer Rechnung.
+    :param decimal: Nachkommastelle, auf die gerundet wird (`None`: nicht runden).
+    :return: Gerundeter Wert, bei `decimal` `0` als `int`.
+    """
+    if decimal is None:
+        return value
+
+    value = round(value, decimal)
+    return int(value) if decimal == 0 else value
+
+
+def compile_formula(tree):
+    """Übersetzt eine Formel in eine Python-Funktion.
+
+    Wird dieselbe Formel (derselbe Baum) erneut übersetzt, wird die zwischengespeicherte Funktion zurückgegeben.
+    Der Baum darf deshalb nach dem Übersetzen nicht mehr verändert werden.
+
+    :param tree: Formel als Baum.
+    :return: Funktion, die mit einer Funktion zum Lesen der Keys (`key -> Wert`) aufgerufen wird und das Ergebnis
+        der Formel zurückgibt.
+    :raises: SyntaxError, falls die Formel nicht unterstützte Operatoren oder Werte enthält.
+    """
+    with _lock:
+        entry = _by_tree.get(id(tree), None)
+        if entry is not None and entry[0] is tree:
+            _by_tree.move_to_end(id(tree))
+            return entry[1]
+
+    # Equal trees of other configs (e.g. of the next run) share the compiled function
+    func = _compile_cached(json.dumps(tree, sort_keys=True))
+
+    with _lock:
+        _by_tree[id(tree)] = (tree, func)
+        _by_tree.move_to_end(id(tree))
+        if len(_by_tree) > CACHE_SIZE:
+            _by_tree.popitem(last=False)
+
+    return func
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(tree: str):
+    return _compile(json.loads(tree))
+
+
+def _compile(node):
+    if isinstance(node, dict):
+        op = OPERATORS.get(node.get("operator", None), None)
+        if op is None or "lop" not in node or "rop" not in node:
+            raise SyntaxError(f"Unsupported operation in formula: {node.get('operator', None)}")
+
+        left = _compile(node["lop"])
+        right = _compile(node["rop"])
+        decimal = node.get("decimal", None)
+
+        return lambda get: round_result(op(left(get), right(get)), decimal)
+
+    if isinstance(node, str):
+        return lambda get: get(node)
+
+    if isinstance(node, numbers.Number) and not isinstance(node, bool):
+        return lambda get: node
+
+    raise SyntaxError(f"Unsupported value in formula: {node!r}")
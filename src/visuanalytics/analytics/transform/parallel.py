@@ -0,0 +1,189 @@
+"""
+Modul, welches `transform_array` und `transform_dict` mit `"parallel": true` in mehreren Prozessen ausführt.
+
+Das Array bzw. Dictionary wird in Teile (Chunks) aufgeteilt, die in einem Pool von Worker-Prozessen verarbeitet werden.
+Jeder Worker erhält einmalig eine Kopie der Daten des Jobs (:class:`StepData`) und führt die `transform`-Typen für die
+Elemente seines Chunks aus. Die veränderten Elemente werden danach in der ursprünglichen Reihenfolge zurückgeschrieben.
+
+Das ist nur möglich, wenn die `transform`-Typen ausschließlich in das aktuelle Element (`_loop|...`) schreiben und
+nicht auf das durchlaufene Array bzw. Dictionary zugreifen, da die Elemente sonst voneinander abhängen. Andernfalls
+wird ein :class:`ParallelTransformError` geworfen.
+"""
+import math
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_errors import ParallelTransformError
+
+PARALLEL_TYPES = ["add_symbol", "replace", "seperator", "translate", "regex", "date_format", "timestamp",
+                  "date_weekday", "wind_direction", "calculate", "formula", "convert", "sort", "most_common", "to_dict",
+                  "join", "length", "lower_case", "upper_case", "capitalize", "normalize_words", "split_string",
+                  "copy", "option", "compare"]
+"""`transform`-Typen, die parallel ausgeführt werden können."""
+
+MIN_LENGTH = 100
+"""Minimale Anzahl an Elementen, ab der die Elemente in mehreren Prozessen verarbeitet werden."""
+
+CHUNKS_PER_WORKER = 4
+"""Anzahl der Chunks je Worker, falls `chunk_size` nicht angegeben ist."""
+
+_BRANCH_KEYS = ["transform", "on_true", "on_false", "on_equal", "on_not_equal", "on_higher", "on_lower"]
+
+# StepData of the worker process, set once by _init_worker
+_worker_data = None
+
+
+def transform_array(values: dict, data: StepData):
+    """Führt `transform_array` parallel aus.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return: Ob die Elemente verarbeitet wurden. Bei `False` muss `transform_array` sequentiell ausgeführt werden.
+    :raises: ParallelTransformError
+    """
+    array = data.get_data(values["array_key"], values, list)
+    results = _run(values, data, values["array_key"], list(enumerate(array)))
+    if results is None:
+        return False
+
+    for idx, result in enumerate(results):
+        array[idx] = _merge(array[idx], result)
+
+    # Same loop states as after the loop over all elements
+    data.save_loop(len(array) - 1, array[-1], values)
+    return True
+
+
+def transform_dict(values: dict, data: StepData):
+    """Führt `transform_dict` parallel aus.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return: Ob die Elemente verarbeitet wurden. Bei `False` muss `transform_dict` sequentiell ausgeführt werden.
+    :raises: ParallelTransformError
+    """
+    dictionary = data.get_data(values["dict_key"], values, dict)
+    items = list(dictionary.items())
+    results = _run(values, data, values["dict_key"], items)
+    if results is None:
+        return False
+
+    for (key, _), result in zip(items, results):
+        dictionary[key] = _merge(dictionary[key], result)
+
+    # Same loop states as after the loop over all elements
+    data.save_loop(items[-1][0], dictionary[items[-1][0]], values)
+    return True
+
+
+def check_dependencies(values: dict, loop_key: str):
+    """Prüft, ob die `transform`-Typen unabhängig voneinander für alle Elemente ausgeführt werden können.
+
+    :param values: Werte aus der JSON-Datei
+    :param loop_key: Key des durchlaufenen Arrays bzw. Dictionaries.
+    :raises: ParallelTransformError
+    """
+    for transformation in values["transform"]:
+        _check_type(transformation, loop_key)
+
+
+def _check_type(values: dict, loop_key: str):
+    type_name = values.get("type", None)
+    if type_name not in PARALLEL_TYPES:
+        raise ParallelTransformError(f"Type '{type_name}' can not be executed in parallel")
+
+    for key in _write_keys(values):
+        if not isinstance(key, str) or not key.startswith("_loop|"):
+            raise ParallelTransformError(f"Type '{type_name}' writes to '{key}', only '_loop|...' is allowed")
+
+    for branch in _BRANCH_KEYS:
+        for transformation in values.get(branch, []):
+            _check_type(transformation, loop_key)
+
+    # Other elements may already be changed, so the looped data must not be read
+    if isinstance(loop_key, str) and _contains(values, _key_regex(loop_key)):
+        raise ParallelTransformError(f"Type '{type_name}' reads '{loop_key}'")
+
+
+def _write_keys(values: dict):
+    keys = values.get("new_keys", None) or values.get("keys", [])
+    key = values.get("new_key", None) or values.get("key", None)
+
+    return [*keys, *([key] if key is not None else []), *([values["save_idx_to"]] if "save_idx_to" in values else [])]
+
+
+def _key_regex(key: str):
+    # The key itself or a part of it (e.g. "_req|data|0"), but not other keys with the same prefix ("_req|data_extra")
+    return re.compile(f"(?<![\\w|]){re.escape(key)}(?![^|}}\\s])")
+
+
+def _contains(config, key_regex):
+    if isinstance(config, str):
+        return key_regex.search(config) is not None
+    if isinstance(config, dict):
+        return any(_contains(value, key_regex) for key, value in config.items()
+                   if key not in _BRANCH_KEYS and key != "_loop_states")
+    if isinstance(config, list):
+        return any(_contains(value, key_regex) for value in config)
+
+    return False
+
+
+def _run(values: dict, data: StepData, loop_key: str, items: list):
+    check_dependencies(values, loop_key)
+
+    workers = data.get_data(values.get("workers", os.cpu_count() or 1), values, int)
+    # Starting the processes takes longer than processing a few elements
+    if workers < 2 or len(items) < MIN_LENGTH:
+        return None
+
+    chunk_size = data.get_data(values.get("chunk_size", math.ceil(len(items) / (workers * CHUNKS_PER_WORKER))),
+                               values, int)
+    chunks = [items[idx:idx + chunk_size] for idx in range(0, len(items), chunk_size)]
+
+    # Nested types run in the worker with a copy of the loop states, the settings of this type are not needed
+    config = {key: value for key, value in values.items() if key in ["transform", "_loop_states"]}
+
+    # Spawned processes do not inherit the threads (e.g. of the scheduler) of this process
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(data,)) as executor:
+        results = executor.map(_transform_chunk, [config] * len(chunks), chunks)
+
+        return [result for chunk in results for result in chunk]
+
+
+def _merge(current, result):
+    # Update the element in place, so that other references to it stay valid (like sequential execution)
+    if isinstance(current, dict) and isinstance(result, dict):
+        current.clear()
+        current.update(result)
+        return current
+
+    if isinstance(current, list) and isinstance(result, list):
+        current[:] = result
+        return current
+
+    return result
+
+
+def _init_worker(data: StepData):
+    global _worker_data
+    _worker_data = data
+
+
+def _transform_chunk(values: dict, items: list):
+    # Imported here, the module transform imports this module
+    from visuanalytics.analytics.transform.transform import transform
+
+    try:
+        for idx, current in items:
+            _worker_data.save_loop(idx, current, values)
+            transform(values, _worker_data)
+    except Exception as e:
+        # Step errors lose their cause when they are pickled, so only the message is passed to the pipeline
+        raise ParallelTransformError(str(e)) from None
+
+    return [current for _, current in items]
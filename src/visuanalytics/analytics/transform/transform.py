@@ -2,7 +2,6 @@
 Modul mit Funktionen zur Berechnung und Umwandlung von Daten.
 """
 import numbers
-import re
 from collections import Counter
 from datetime import datetime
 from pydoc import locate
@@ -10,8 +9,11 @@ from random import randint
 from copy import deepcopy
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform import vectorize, parallel
 from visuanalytics.analytics.transform.calculate import CALCULATE_ACTIONS
+from visuanalytics.analytics.transform.formula import compile_formula
 from visuanalytics.analytics.transform.util.key_utils import get_new_keys, get_new_key
+from visuanalytics.analytics.transform.util.pattern_utils import compile_regex, parse_datetime
 from visuanalytics.analytics.util.step_errors import TransformError, \
     raise_step_error, StepKeyError
 from visuanalytics.analytics.util.step_pattern import data_insert_pattern, data_get_pattern
@@ -54,9 +56,19 @@ def register_transform(func):
 def transform_array(values: dict, data: StepData):
     """Führt alle angegebenen `"transform"`-Funktionen für alle Werte eines Arrays aus.
 
+    Rechnen, runden oder konvertieren alle `"transform"`-Funktionen nur Felder der Elemente, werden sie
+    spaltenweise für alle Elemente gleichzeitig ausgeführt (siehe :mod:`vectorize`). Mit `"parallel": true` werden
+    die Elemente in mehreren Prozessen verarbeitet (siehe :mod:`parallel`).
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
+    if values.get("vectorize", True) and vectorize.transform_array(values, data):
+        return
+
+    if data.get_data(values.get("parallel", False), values, bool) and parallel.transform_array(values, data):
+        return
+
     for _ in data.loop_array(data.get_data(values["array_key"], values), values):
         transform(values, data)
 
@@ -65,9 +77,14 @@ def transform_array(values: dict, data: StepData):
 def transform_dict(values: dict, data: StepData):
     """Führt alle angegebenen `"transform"`-Funktionen für alle Werte eines Dictionaries aus.
 
+    Mit `"parallel": true` werden die Werte in mehreren Prozessen verarbeitet (siehe :mod:`parallel`).
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
+    if data.get_data(values.get("parallel", False), values, bool) and parallel.transform_dict(values, data):
+        return
+
     for _ in data.loop_dict(data.get_data(values["dict_key"], values), values):
         transform(values, data)
 
@@ -84,6 +101,18 @@ def calculate(values: dict, data: StepData):
     action_func(values, data)
 
 
+@register_transform
+def formula(values: dict, data: StepData):
+    """Berechnet das Ergebnis einer Formel in einem Durchlauf, ohne Zwischenergebnisse zu speichern.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    """
+    formula_func = compile_formula(values["formula"])
+
+    data.insert_data(values["new_key"], formula_func(lambda key: data.get_data(key, values)), values)
+
+
 @register_transform
 def select(values: dict, data: StepData):
     """Entfernt alle Keys, die nicht in `"relevant_keys"` stehen aus dem Dictionary.
@@ -268,10 +297,9 @@ def regex(values: dict, data: StepData):
         value = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
 
-        regex = data.format(values["regex"], values)
-        find = fr"{regex}"
+        regex = compile_regex(data.format(values["regex"], values))
         replace_by = data.format(values["replace_by"], values)
-        new_value = re.sub(find, replace_by, value)
+        new_value = regex.sub(replace_by, value)
         data.insert_data(new_key, new_value, values)
 
 
@@ -288,7 +316,7 @@ def date_format(values: dict, data: StepData):
     for idx, key in data.loop_key(values["keys"], values):
         value = data.get_data(key, values)
         given_format = data.format(values["given_format"], values)
-        date = datetime.strptime(value, given_format).date()
+        date = parse_datetime(value, given_format).date()
         new_key = get_new_keys(values, idx)
         zeropaded_off = data.get_data(values.get("zeropaded_off", False), values, bool)
         if zeropaded_off:
@@ -341,7 +369,7 @@ def date_weekday(values: dict, data: StepData):
     for idx, key in data.loop_key(values["keys"], values):
         value = data.get_data(values["keys"][idx], values)
         given_format = data.format(values["given_format"], values)
-        date = datetime.strptime(value, given_format).date()
+        date = parse_datetime(value, given_format).date()
         new_key = get_new_keys(values, idx)
 
         new_value = day_weekday[date.weekday()]
@@ -759,10 +787,8 @@ def split_string(values: dict, data: StepData):
         delimiter = data.format(values.get("delimiter", " "), values)
         new_key = get_new_keys(values, idx)
 
-        if data.get_data(values.get("ignore_case", False), values, bool):
-            new_value = re.split(delimiter, value, flags=re.IGNORECASE)
-        else:
-            new_value = re.split(delimiter, value)
+        ignore_case = data.get_data(values.get("ignore_case", False), values, bool)
+        new_value = compile_regex(delimiter, ignore_case).split(value)
         data.insert_data(new_key, new_value, values)
 
 
@@ -0,0 +1,81 @@
+"""
+Modul mit zwischengespeicherten (kompilierten) regulären Ausdrücken und Datumsformaten für die `transform`-Typen.
+
+Die Typen `regex`, `split_string`, `date_format` und `date_weekday` werden meist in `transform_array` für jedes
+Element mit demselben Ausdruck bzw. Format aufgerufen. Die kompilierten Ausdrücke werden deshalb je Ausdruck
+einmalig erstellt und wiederverwendet.
+"""
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
+EPOCH_FORMAT = "%s"
+"""Format für UNIX-Zeitstempel (Sekunden seit 1970), wird von `datetime.strptime` nicht unterstützt."""
+
+_ISO_DATE_TIMES = ["%Y-%m-%d", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S",
+                   "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d %H:%M:%S.%f"]
+
+_ISO_DIRECTIVES = {
+    "%Y": r"\d{4}",
+    "%m": r"\d{2}",
+    "%d": r"\d{2}",
+    "%H": r"\d{2}",
+    "%M": r"\d{2}",
+    "%S": r"\d{2}",
+    "%f": r"(?:\d{3}|\d{6})",
+    "%z": r"(?:Z|[+-]\d{2}:\d{2})"
+}
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str, ignore_case=False):
+    """Gibt den kompilierten regulären Ausdruck zurück.
+
+    :param pattern: Regulärer Ausdruck.
+    :param ignore_case: Ob die Groß- und Kleinschreibung ignoriert werden soll.
+    :return: Kompilierter Ausdruck.
+    :rtype: re.Pattern
+    """
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+def parse_datetime(value, given_format: str):
+    """Wandelt einen String im Format `given_format` in ein Datum mit Uhrzeit um.
+
+    Entspricht `datetime.strptime`. Für ISO-8601-Formate (z.B. `%Y-%m-%dT%H:%M:%S%z`) wird der String mit
+    `datetime.fromisoformat` umgewandelt, wenn er exakt dem Format entspricht (z.B. mit führenden Nullen).
+    Ist `given_format` `%s`, wird `value` als UNIX-Zeitstempel interpretiert.
+
+    :param value: Zu konvertierender Wert.
+    :param given_format: Format des Werts.
+    :return: Datum mit Uhrzeit.
+    :rtype: datetime
+    :raises: ValueError
+    """
+    if given_format == EPOCH_FORMAT:
+        return datetime.fromtimestamp(float(value))
+
+    iso_regex = _iso_regex(given_format)
+    if iso_regex is not None and isinstance(value, str) and iso_regex.fullmatch(value):
+        return _from_iso(value, given_format)
+
+    return datetime.strptime(value, given_format)
+
+
+@lru_cache(maxsize=64)
+def _iso_regex(given_format: str):
+    base = given_format[:-2] if given_format.endswith("%z") else given_format.rstrip("Z")
+    if base not in _ISO_DATE_TIMES or given_format not in [base, f"{base}%z", f"{base}Z"]:
+        return None
+
+    parts = re.split(r"(%[a-zA-Z])", given_format)
+    return re.compile("".join(_ISO_DIRECTIVES.get(part, re.escape(part)) for part in parts))
+
+
+def _from_iso(value: str, given_format: str):
+    # fromisoformat does not accept "Z", as with strptime it is UTC for %z and ignored if it is part of the format
+    if value.endswith("Z"):
+        date = datetime.fromisoformat(value[:-1])
+        return date.replace(tzinfo=timezone.utc) if given_format.endswith("%z") else date
+
+    return datetime.fromisoformat(value)
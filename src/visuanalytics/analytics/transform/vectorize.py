@@ -0,0 +1,373 @@
+"""
+Modul, welches `transform_array` spaltenweise ausführt, wenn die inneren `transform`-Typen nur rechnen, runden oder
+konvertieren.
+
+Dazu werden die verwendeten Felder aller Elemente (z.B. `_loop|temp`) einmal in Spalten gesammelt, die Berechnungen mit
+NumPy für alle Elemente gleichzeitig ausgeführt und die Ergebnisse danach in die Elemente geschrieben. Die Ergebnisse
+(inkl. der Datentypen) entsprechen denen der Ausführung für jedes einzelne Element. Kann ein `transform`-Typ oder ein
+Wert nicht spaltenweise verarbeitet werden, wird nichts verändert und `transform_array` für jedes Element ausgeführt.
+"""
+import numbers
+from pydoc import locate
+
+import numpy as np
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform.formula import OPERATORS, round_result
+from visuanalytics.analytics.util.step_errors import StepKeyError
+from visuanalytics.analytics.util.step_pattern import data_get_pattern, data_insert_pattern
+
+MIN_LENGTH = 16
+"""Minimale Länge eines Arrays, ab der die spaltenweise Ausführung verwendet wird."""
+
+# Products of two ints below this limit fit into int64, larger ints are calculated in the interpreter
+_INT_LIMIT = 2 ** 31
+
+_BI_OPS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.true_divide,
+    "modulo": np.mod
+}
+
+_FORMULA_OPS = {
+    "ADD": np.add,
+    "SUB": np.subtract,
+    "MUL": np.multiply,
+    "DIV": np.true_divide,
+    "MOD": np.mod
+}
+
+_CONVERT_TYPES = ["int", "float", "str"]
+
+
+class _NotVectorizable(Exception):
+    pass
+
+
+class _Columns(object):
+    # Values of the used fields of all elements, written columns are stored back by scatter.
+    # The path "" is the element itself (e.g. arrays of numbers), it can only be read
+
+    def __init__(self, array: list):
+        self.__array = array
+        self.__columns = {}
+        self.__written = set()
+
+    @property
+    def length(self):
+        return len(self.__array)
+
+    def get(self, path: str):
+        column = self.__columns.get(path, None)
+        if column is not None:
+            return column
+
+        # Parts of written values are not tracked
+        if any(_overlaps(path, written) for written in self.__written):
+            raise _NotVectorizable()
+
+        try:
+            column = [data_get_pattern(path, element) if path else element for element in self.__array]
+        except StepKeyError:
+            raise _NotVectorizable()
+
+        self.__columns[path] = column
+        return column
+
+    def set(self, path: str, column: list):
+        if not path or any(_overlaps(path, written) for written in self.__written):
+            raise _NotVectorizable()
+
+        self.__columns[path] = column
+        self.__written.add(path)
+
+    def scatter(self):
+        for path in self.__written:
+            for element, value in zip(self.__array, self.__columns[path]):
+                data_insert_pattern(path, element, value)
+
+
+def _overlaps(path: str, written: str):
+    if path == written:
+        return False
+
+    return not path or not written or path.startswith(f"{written}|") or written.startswith(f"{path}|")
+
+
+def _field(key):
+    # Only static keys of the current element can be read as column (e.g. "_loop|main|temp")
+    if key == "_loop":
+        return ""
+
+    if not isinstance(key, str) or not key.startswith("_loop|") or any(c in key for c in "{}$"):
+        raise _NotVectorizable()
+
+    return key[len("_loop|"):]
+
+
+def _number(value, values: dict, data: StepData):
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return value
+
+    # Keys which do not depend on the current element are the same for all elements
+    if not isinstance(value, str) or value.startswith(("_loop", "_idx", "_key")) or any(c in value for c in "{}$"):
+        raise _NotVectorizable()
+
+    try:
+        value = data.get_data(value, values)
+    except StepKeyError:
+        raise _NotVectorizable()
+
+    if not isinstance(value, numbers.Number) or isinstance(value, bool):
+        raise _NotVectorizable()
+
+    return value
+
+
+def _numeric_kind(column: list):
+    types = set(map(type, column))
+
+    if not types <= {int, float}:
+        raise _NotVectorizable()
+
+    if int in types and any(abs(value) >= _INT_LIMIT for value in column if type(value) is int):
+        raise _NotVectorizable()
+
+    return types
+
+
+def _scalar_kind(value):
+    if type(value) is int and abs(value) >= _INT_LIMIT:
+        raise _NotVectorizable()
+
+    return {type(value)}
+
+
+def _apply(op, left, right):
+    # Python semantics: int op int stays int (except for division), everything else is calculated as float
+    left_types = _numeric_kind(left) if isinstance(left, list) else _scalar_kind(left)
+    right_types = _numeric_kind(right) if isinstance(right, list) else _scalar_kind(right)
+
+    # Division by zero raises an error in the interpreter
+    if op in (np.true_divide, np.mod) and (0 in right if isinstance(right, list) else right == 0):
+        raise _NotVectorizable()
+
+    result = op(np.array(left, dtype=np.float64), np.array(right, dtype=np.float64)).tolist()
+    if op is np.true_divide or int not in left_types or int not in right_types:
+        return result
+
+    int_result = op(_int_array(left), _int_array(right)).tolist()
+    if left_types == {int} and right_types == {int}:
+        return int_result
+
+    length = len(result)
+    left = left if isinstance(left, list) else [left] * length
+    right = right if isinstance(right, list) else [right] * length
+    return [i if type(a) is int and type(b) is int else f for a, b, i, f in zip(left, right, int_result, result)]
+
+
+def _int_array(value):
+    # Floats are replaced by 1, their results are taken from the float calculation
+    if isinstance(value, list):
+        return np.array([v if type(v) is int else 1 for v in value], dtype=np.int64)
+
+    return np.int64(value if type(value) is int else 1)
+
+
+def _round(column: list, decimal):
+    if decimal is None:
+        return [round(value) for value in column]
+
+    return [round(value, decimal) for value in column]
+
+
+def _compile_bi_calculate(values: dict, data: StepData, outer_values: dict):
+    op = _BI_OPS[values["action"]]
+    keys = values["keys"]
+    keys_right = values.get("keys_right", None)
+    value_right = values.get("value_right", None)
+    value_left = values.get("value_left", None)
+    decimal = values.get("decimal", None)
+
+    fields = [_field(key) for key in keys]
+    new_fields = _new_fields(values, fields)
+
+    if keys_right is not None:
+        if len(keys_right) < len(fields):
+            raise _NotVectorizable()
+        right = [_field(key) for key in keys_right[:len(fields)]]
+    elif value_right is not None:
+        right = _value_or_field(value_right, data, outer_values)
+    else:
+        left = _value_or_field(value_left, data, outer_values)
+
+    if decimal is not None:
+        decimal = _number(decimal, outer_values, data)
+
+    def run(columns: _Columns):
+        for idx, field in enumerate(fields):
+            column = columns.get(field)
+
+            if keys_right is not None:
+                res = _apply(op, column, columns.get(right[idx]))
+            elif value_right is not None:
+                res = _apply(op, column, _resolve(right, columns))
+            else:
+                res = _apply(op, _resolve(left, columns), column)
+
+            if decimal is not None:
+                res = _round(res, decimal)
+                if decimal == 0:
+                    res = [int(value) for value in res]
+
+            columns.set(new_fields[idx], res)
+
+    return run
+
+
+def _new_fields(values: dict, fields: list):
+    new_keys = values.get("new_keys", None) or values["keys"]
+    if len(new_keys) < len(fields):
+        raise _NotVectorizable()
+
+    return [_field(key) for key in new_keys[:len(fields)]]
+
+
+def _value_or_field(value, data: StepData, values: dict):
+    if isinstance(value, str) and (value == "_loop" or value.startswith("_loop|")):
+        return "field", _field(value)
+
+    return "value", _number(value, values, data)
+
+
+def _resolve(value, columns: _Columns):
+    kind, value = value
+    return columns.get(value) if kind == "field" else value
+
+
+def _compile_round(values: dict, data: StepData, outer_values: dict):
+    fields = [_field(key) for key in values["keys"]]
+    new_fields = _new_fields(values, fields)
+    decimal = _number(values["decimal"], outer_values, data) if values.get("decimal", None) else None
+
+    def run(columns: _Columns):
+        for field, new_field in zip(fields, new_fields):
+            column = columns.get(field)
+            _numeric_kind(column)
+            columns.set(new_field, _round(column, decimal))
+
+    return run
+
+
+def _compile_convert(values: dict, data: StepData, outer_values: dict):
+    if values["to"] not in _CONVERT_TYPES:
+        raise _NotVectorizable()
+
+    new_type = locate(values["to"])
+    fields = [_field(key) for key in values["keys"]]
+    new_fields = _new_fields(values, fields)
+
+    def run(columns: _Columns):
+        for field, new_field in zip(fields, new_fields):
+            try:
+                columns.set(new_field, [new_type(value) for value in columns.get(field)])
+            except (TypeError, ValueError):
+                raise _NotVectorizable()
+
+    return run
+
+
+def _compile_formula(values: dict, data: StepData, outer_values: dict):
+    new_field = _field(values["new_key"])
+
+    def compile_node(node):
+        if isinstance(node, dict):
+            name = node["operator"]
+            op = _FORMULA_OPS[name]
+            left = compile_node(node["lop"])
+            right = compile_node(node["rop"])
+            decimal = node.get("decimal", None)
+            if decimal is not None and (not isinstance(decimal, int) or isinstance(decimal, bool)):
+                raise _NotVectorizable()
+
+            return lambda columns: _formula_calculation(name, op, left(columns), right(columns), decimal)
+
+        value = _value_or_field(node, data, outer_values)
+        return lambda columns: _resolve(value, columns)
+
+    run_formula = compile_node(values["formula"])
+
+    def run(columns: _Columns):
+        result = run_formula(columns)
+        if not isinstance(result, list):
+            result = [result] * columns.length
+
+        columns.set(new_field, result)
+
+    return run
+
+
+def _formula_calculation(name: str, op, left, right, decimal):
+    if not isinstance(left, list) and not isinstance(right, list):
+        # Constant parts of the formula are calculated like in the interpreter
+        if op in (np.true_divide, np.mod) and right == 0:
+            raise _NotVectorizable()
+        return round_result(OPERATORS[name](left, right), decimal)
+
+    res = _apply(op, left, right)
+    if decimal is None:
+        return res
+
+    return [round_result(value, decimal) for value in res]
+
+
+def _compile(values: dict, data: StepData, outer_values: dict):
+    try:
+        if values["type"] == "calculate" and values.get("action", None) in _BI_OPS:
+            return _compile_bi_calculate(values, data, outer_values)
+        if values["type"] == "calculate" and values.get("action", None) == "round":
+            return _compile_round(values, data, outer_values)
+        if values["type"] == "convert":
+            return _compile_convert(values, data, outer_values)
+        if values["type"] == "formula":
+            return _compile_formula(values, data, outer_values)
+    except (KeyError, TypeError):
+        pass
+
+    raise _NotVectorizable()
+
+
+def transform_array(values: dict, data: StepData):
+    """Führt `transform_array` spaltenweise aus, falls alle inneren `transform`-Typen unterstützt werden.
+
+    Unterstützt werden `calculate` mit den Actions `add`, `subtract`, `multiply`, `divide`, `modulo` und `round`,
+    `convert` (zu `int`, `float` oder `str`) und `formula`, deren Keys Felder des aktuellen Elements (`_loop|...`)
+    oder das Element selbst (`_loop`) sind.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return: Ob das Array spaltenweise verarbeitet wurde. Bei `False` wurden keine Daten verändert.
+    :rtype: bool
+    """
+    array = data.get_data(values["array_key"], values)
+
+    if not isinstance(array, list) or len(array) < MIN_LENGTH:
+        return False
+
+    try:
+        steps = [_compile(transformation, data, values) for transformation in values["transform"]]
+
+        columns = _Columns(array)
+        with np.errstate(all="ignore"):
+            for step in steps:
+                step(columns)
+    except _NotVectorizable:
+        return False
+
+    columns.scatter()
+
+    # Same loop states as after the loop over all elements
+    values["_loop_states"] = {**values.get("_loop_states", {}), "_idx": len(array) - 1, "_loop": array[-1]}
+    return True
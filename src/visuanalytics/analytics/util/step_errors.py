@@ -34,7 +34,7 @@ class StepError(Exception):
 
         if isinstance(self.__cause__,
                       (StepKeyError, StepTypeError, PresetError, APIKeyError, APiRequestError, TestDataError,
-                       FFmpegError)):
+                       FFmpegError, ParallelTransformError)):
             # invalid Key
             return f"{pos_msg}{self.__cause__}"
         elif isinstance(self.__cause__, KeyError):
@@ -153,6 +153,13 @@ class InvalidContentTypeError(Exception):
                 f"Error on response from '{url}': Invalid content type '{content_type}' only {expected_type} is supported.")
 
 
+class ParallelTransformError(Exception):
+    """
+    Fehlerklasse für einen Fehler beim parallelen Ausführen von `transform_array` oder `transform_dict`.
+    """
+    pass
+
+
 class PresetError(Exception):
     def __init__(self, key):
         super().__init__(f"Preset '{key}' not found")
@@ -0,0 +1,117 @@
+"""
+Modul zur Messung der Laufzeit und des Ressourcenverbrauchs einzelner Pipeline-Schritte.
+"""
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (not available on Windows)
+    resource = None
+
+
+def _peak_rss():
+    """Gibt den bisher höchsten Speicherverbrauch (RSS) des Prozesses in Bytes zurück.
+
+    Ist das Modul `resource` nicht verfügbar, wird `None` zurückgegeben.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def dir_size(path: str):
+    """Berechnet die Größe aller Dateien in einem Ordner (inklusive Unterordnern).
+
+    :param path: Pfad zum Ordner.
+    :return: Größe in Bytes, `0` wenn der Ordner nicht existiert.
+    :rtype: int
+    """
+    size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                # File was removed during the walk
+                pass
+
+    return size
+
+
+def measure_step(func, temp_dir: str = None):
+    """Führt `func` aus und misst dabei den Ressourcenverbrauch.
+
+    Gemessen werden die Laufzeit (`wall_time`), die CPU-Zeit des ausführenden Threads (`cpu_time`),
+    der Zuwachs des maximalen Speicherverbrauchs des Prozesses (`rss_delta`) und die Anzahl der Bytes,
+    die in `temp_dir` geschrieben wurden (`temp_bytes`).
+
+    `rss_delta` und `temp_bytes` gelten für den ganzen Prozess bzw. Ordner. Laufen mehrere Schritte gleichzeitig,
+    enthalten sie auch den Verbrauch der anderen Schritte (siehe :class:`OverlapTracker`).
+
+    Die Messwerte werden auch dann zurückgegeben, wenn `func` einen Fehler wirft. Sie werden dann
+    an dem Fehler unter dem Attribut `step_metrics` gespeichert.
+
+    :param func: Funktion ohne Parameter, die gemessen werden soll.
+    :param temp_dir: Ordner, in dem die geschriebenen Bytes gezählt werden sollen.
+    :return: Rückgabewert von `func`, Messwerte.
+    :rtype: tuple
+    """
+    temp_before = dir_size(temp_dir) if temp_dir else None
+    rss_before = _peak_rss()
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+
+    metrics = {}
+    try:
+        return func(), metrics
+    except BaseException as e:
+        e.step_metrics = metrics
+        raise
+    finally:
+        metrics["wall_time"] = round(time.perf_counter() - wall_start, 4)
+        metrics["cpu_time"] = round(time.thread_time() - cpu_start, 4)
+
+        rss_after = _peak_rss()
+        metrics["rss_delta"] = rss_after - rss_before if rss_before is not None else None
+        metrics["temp_bytes"] = dir_size(temp_dir) - temp_before if temp_dir else None
+
+
+class OverlapTracker(object):
+    """Erkennt, ob sich die Ausführung eines Schritts mit der Ausführung anderer Schritte überschnitten hat.
+
+    Nur für Schritte ohne Überschneidung sind die prozessweiten Messwerte (`rss_delta`, `temp_bytes`) von
+    :func:`measure_step` dem Schritt zuzuordnen.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__running = {}
+
+    def start(self, step: int):
+        """Markiert den Schritt als laufend.
+
+        :param step: ID des Schritts.
+        """
+        with self.__lock:
+            overlapped = bool(self.__running)
+            for running in self.__running:
+                self.__running[running] = True
+
+            self.__running[step] = overlapped
+
+    def finish(self, step: int):
+        """Markiert den Schritt als beendet.
+
+        :param step: ID des Schritts.
+        :return: Ob während des Schritts andere Schritte gelaufen sind.
+        :rtype: bool
+        """
+        with self.__lock:
+            return self.__running.pop(step, False)
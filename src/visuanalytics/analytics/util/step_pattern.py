@@ -2,7 +2,7 @@
 
 """
 import operator
-from functools import reduce
+from functools import reduce, lru_cache
 from string import Formatter
 
 from visuanalytics.analytics.util.step_errors import StepKeyError
@@ -16,11 +16,90 @@ class StepPatternFormatter(Formatter):
     def get_value(self, key, args, kwargs):
         return data_get_pattern(key, args[0], self.__split_key)
 
+    def vformat(self, format_string, args, kwargs):
+        template = compile_template(format_string)
+
+        # Patterns with automatic field numbering or nested format specs use the default implementation
+        if template is None:
+            return super().vformat(format_string, args, kwargs)
+
+        if isinstance(template, str):
+            return template
+
+        result = []
+        for literal, field_name, simple, format_spec, conversion in template:
+            if literal:
+                result.append(literal)
+
+            if field_name is not None:
+                if simple:
+                    obj = self.get_value(field_name, args, kwargs)
+                else:
+                    obj, _ = self.get_field(field_name, args, kwargs)
+
+                obj = self.convert_field(obj, conversion)
+                result.append(self.format_field(obj, format_spec))
+
+        return "".join(result)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(format_string: str):
+    """Zerlegt einen Pattern-String einmalig in Text- und Feld-Abschnitte.
+
+    Die Ergebnisse werden zwischengespeichert, so muss ein Pattern, das z.B. für jedes Element eines Arrays
+    formatiert wird, nicht jedes Mal neu geparst werden.
+
+    :param format_string: Pattern-String (siehe :class:`string.Formatter`).
+    :return: Der String selbst, wenn dieser keine Felder enthält, `None`, wenn das Pattern nicht vorab zerlegt werden
+        kann (automatische Nummerierung oder verschachtelte Format-Angaben), sonst ein Tupel mit
+        `(literal, field_name, simple, format_spec, conversion)` je Abschnitt.
+    :raises: ValueError, wenn das Pattern ungültig ist.
+    """
+    template = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(format_string):
+        if field_name is not None and (field_name == "" or field_name.isdigit() or "{" in format_spec):
+            return None
+
+        # Simple fields can use get_value directly, fields with attribute or index access need get_field
+        simple = field_name is not None and "." not in field_name and "[" not in field_name
+        template.append((literal, field_name, simple, format_spec, conversion))
+
+    if all(field_name is None for _, field_name, _, _, _ in template):
+        return "".join(literal for literal, _, _, _, _ in template)
+
+    return tuple(template)
+
 
 def _to_int(x):
     return int(x) if x.isnumeric() else x
 
 
+@lru_cache(maxsize=4096)
+def compile_key_path(keys: str, split_key="|"):
+    """Zerlegt einen Key-String (z.B. `a|b|0|c`) in ein Tupel aus Keys.
+
+    Numerische Keys werden dabei in `int` umgewandelt. Die Ergebnisse werden zwischengespeichert,
+    da dieselben Key-Strings bei jedem Durchlauf einer Schleife erneut verwendet werden.
+
+    :param keys: Key-String mit durch `split_key` getrennten Keys.
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Tupel mit den einzelnen Keys.
+    :rtype: tuple
+    """
+    return tuple(map(_to_int, keys.split(split_key)))
+
+
+def _get_path(path: tuple, data):
+    # Most paths only have one or two keys, for these direct access is faster than reduce
+    if len(path) == 1:
+        return data[path[0]]
+    if len(path) == 2:
+        return data[path[0]][path[1]]
+
+    return reduce(operator.getitem, path, data)
+
+
 def _get_or_create(d, k):
     # TODO (max) may handle to large array idx (add elm)
     if not isinstance(d, list) and not operator.contains(d, k):
@@ -32,8 +111,7 @@ def _get_or_create(d, k):
 def data_get_pattern(keys, data, split_key="|"):
     try:
         if isinstance(keys, str):
-            keys_map = map(_to_int, keys.split(split_key))
-            return reduce(operator.getitem, keys_map, data)
+            return _get_path(compile_key_path(keys, split_key), data)
 
         return data[keys]
     except BaseException as e:
@@ -43,11 +121,9 @@ def data_get_pattern(keys, data, split_key="|"):
 def data_insert_pattern(keys, data, value, split_key="|"):
     try:
         if isinstance(keys, str) and '|' in keys:
-            key_array = keys.split(split_key)
-            keys_map = map(_to_int, key_array[:-1])
-            last = _to_int(key_array[-1])
+            path = compile_key_path(keys, split_key)
 
-            reduce(_get_or_create, keys_map, data)[last] = value
+            reduce(_get_or_create, path[:-1], data)[path[-1]] = value
         else:
             data[keys] = value
     except BaseException as e:
@@ -57,11 +133,9 @@ def data_insert_pattern(keys, data, value, split_key="|"):
 def data_remove_pattern(keys, data, split_key="|"):
     try:
         if isinstance(keys, str) and '|' in keys:
-            key_array = keys.split(split_key)
-            keys_map = map(_to_int, key_array[:-1])
-            last = _to_int(key_array[-1])
+            path = compile_key_path(keys, split_key)
 
-            reduce(operator.getitem, keys_map, data).pop(last, None)
+            _get_path(path[:-1], data).pop(path[-1], None)
         else:
             data.pop(keys, None)
     except BaseException as e:
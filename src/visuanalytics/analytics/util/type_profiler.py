@@ -0,0 +1,150 @@
+"""
+Modul zum Messen der Laufzeit der einzelnen Typen (z.B. `transform`-Typen) eines Pipeline-Durchlaufs.
+
+Ist in der Job-Konfiguration `profile` auf `true` gesetzt, wird jeder Aufruf einer Typ-Funktion, die mit
+:func:`register_type_func` registriert wurde, gemessen. Die Messwerte werden je Typ und je Pfad in der
+Step-Konfiguration (z.B. `transform[3].transform[1]`) zusammengefasst.
+"""
+import json
+import os
+import threading
+import time
+
+from visuanalytics.util import resources
+
+
+class TypeProfiler(object):
+    """Sammelt die Messwerte aller Typ-Funktionen eines Pipeline-Durchlaufs.
+
+    :param config: Step-Konfiguration des Jobs, aus ihr werden die Pfade der Typen bestimmt.
+    """
+
+    def __init__(self, config: dict):
+        self.__paths = {}
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        # Steps may run in parallel threads, each thread has its own stack of running types
+        self.__local = threading.local()
+
+        _collect_paths(config, "", self.__paths)
+
+    def measure(self, values: dict, data, func):
+        """Führt die Typ-Funktion `func` aus und speichert die Messwerte.
+
+        Die Zeit verschachtelter Typen (z.B. innerhalb von `transform_array`) ist in der Gesamtzeit (`total_time`)
+        des äußeren Typs enthalten, aber nicht in dessen eigener Zeit (`self_time`).
+
+        :param values: Werte aus der JSON-Datei.
+        :param data: Daten aus der API.
+        :param func: Funktion ohne Parameter, die den Typ ausführt.
+        :return: Rückgabewert von `func`.
+        """
+        stack = self.__stack()
+        key = (self.__paths.get(id(values), "?"), _type_name(values))
+        elements = _count_elements(values, data)
+
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            total = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += total
+
+            with self.__lock:
+                entry = self.__entries.setdefault(key, [0, 0.0, 0.0, 0])
+                entry[0] += 1
+                entry[1] += total
+                entry[2] += total - nested
+                entry[3] += elements
+
+    def report(self):
+        """Erstellt den Bericht, sortiert nach der eigenen Zeit (absteigend).
+
+        :return: Liste mit den Messwerten je Pfad und Typ (`path`, `type`, `calls`, `total_time`, `self_time`,
+            `elements`, `share`). `share` ist der Anteil der eigenen Zeit an der gemessenen Zeit aller Typen.
+        :rtype: list
+        """
+        with self.__lock:
+            entries = [(path, type_name, *values) for (path, type_name), values in self.__entries.items()]
+
+        measured = sum(entry[4] for entry in entries) or 1
+
+        return [{
+            "path": path,
+            "type": type_name,
+            "calls": calls,
+            "total_time": round(total, 4),
+            "self_time": round(self_time, 4),
+            "elements": elements,
+            "share": round(self_time / measured, 4)
+        } for path, type_name, calls, total, self_time, elements in sorted(entries, key=lambda e: e[4], reverse=True)]
+
+    def __stack(self):
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = []
+            self.__local.stack = stack
+
+        return stack
+
+
+def save_report(report: list, job_name: str, out_time: str):
+    """Speichert einen Bericht als JSON-Datei im Ordner `resources/profiles/<job_name>`.
+
+    :param report: Bericht von :func:`TypeProfiler.report`.
+    :param job_name: Name des Jobs.
+    :param out_time: Zeitpunkt des Durchlaufs (wird als Dateiname verwendet).
+    :return: Pfad zur Datei.
+    :rtype: str
+    """
+    path = resources.get_resource_path(os.path.join(resources.PROFILE_LOCATION, job_name, f"{out_time}.json"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w") as fp:
+        json.dump(report, fp, indent=2)
+
+    return path
+
+
+def _collect_paths(node, prefix: str, paths: dict):
+    # Maps the ids of all type nodes to their path in the config (e.g. "transform[3].transform[1]")
+    if isinstance(node, dict):
+        items = node.items()
+    elif isinstance(node, list):
+        items = enumerate(node)
+    else:
+        return
+
+    for key, value in items:
+        if isinstance(key, int):
+            path = f"{prefix}[{key}]"
+        else:
+            path = f"{prefix}.{key}" if prefix else str(key)
+
+        if isinstance(value, dict) and "type" in value:
+            paths[id(value)] = path
+
+        _collect_paths(value, path, paths)
+
+
+def _type_name(values: dict):
+    type_name = str(values.get("type", "?"))
+    action = values.get("action", None)
+
+    return f"{type_name}:{action}" if isinstance(action, str) else type_name
+
+
+def _count_elements(values: dict, data):
+    # Elements processed by a call: the length of looped arrays/dicts, otherwise the number of keys
+    for key in ["array_key", "dict_key"]:
+        if key in values:
+            try:
+                return len(data.get_data(values[key], values))
+            except Exception:
+                return 0
+
+    keys = values.get("keys", None)
+    return len(keys) if isinstance(keys, list) else 1
@@ -19,17 +19,47 @@ def register_type_func(types: dict, error: Type[StepError], func):
 
     @functools.wraps(func)
     def type_func(values: dict, data: StepData, *args, **kwargs):
-        # replace presets
+        # replace presets (if not already merged by inline_presets)
         if "preset" in values:
             # TODO (Max) may give values a higher prio
             merge_dict(values, data.get_preset(values["preset"]))
 
+        # Opt-in profiling of the job (see type_profiler)
+        profiler = getattr(data, "profiler", None)
+        if profiler is not None:
+            return profiler.measure(values, data, lambda: func(values, data, *args, **kwargs))
+
         return func(values, data, *args, **kwargs)
 
     types[func.__name__] = type_func
     return type_func
 
 
+def inline_presets(values, presets: dict):
+    """Fügt die Presets aller Typ-Konfigurationen (Dictionaries mit `"preset"`) einmalig vorab ein.
+
+    Entspricht dem Zusammenführen in :func:`register_type_func`, das sonst bei jedem Aufruf der Typfunktion
+    (z.B. für jedes Element in `transform_array`) erneut ausgeführt wird. Der Key `"preset"` wird danach entfernt.
+    Unbekannte Presets bleiben erhalten, damit der Fehler wie bisher erst beim Ausführen des Schritts auftritt.
+
+    :param values: Werte aus der JSON-Datei.
+    :param presets: Dictionary mit `name: preset`.
+    """
+    if isinstance(values, list):
+        for value in values:
+            inline_presets(value, presets)
+        return
+
+    if not isinstance(values, dict):
+        return
+
+    if isinstance(values.get("preset", None), str) and values["preset"] in presets:
+        merge_dict(values, presets[values.pop("preset")])
+
+    for value in values.values():
+        inline_presets(value, presets)
+
+
 def register_type_func_no_data(types: dict, error: Type[StepError], func):
     func = raise_step_error(error)(func)
 
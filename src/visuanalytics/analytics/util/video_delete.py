@@ -8,7 +8,6 @@ from datetime import datetime, timedelta
 
 from visuanalytics.server.db.db import logger
 from visuanalytics.util import resources
-from visuanalytics.util.resources import get_resource_path, MEMORY_LOCATION
 
 
 def delete_video(steps_config, __config):
@@ -129,19 +128,3 @@ def delete_fix_name_videos(job_name: str, fix_names: list, output_path: str, val
     if thumbnail:
         os.rename(values["thumbnail"], os.path.join(out, f"{job_name}{fix_names[0]}_thumbnail.png"))
         values["thumbnail"] = os.path.join(out, f"{job_name}{fix_names[0]}_thumbnail.png")
-
-
-def delete_memory_files(job_name: str, name: str, count: int):
-    """Löscht Memory-Dateien sobald zu viele vorhanden sind.
-
-    :param job_name: Name des Jobs von der die Funktion aufgerufen wurde.
-    :param name: Name des Dictionaries, das exportiert wurde.
-    :param count: Anzahl an Memory-Dateien, die vorhanden sein sollen (danach wird gelöscht).
-    """
-    files = os.listdir(get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name)))
-    files.sort(reverse=True)
-    for idx, file in enumerate(files):
-        if idx >= count:
-            os.remove(get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name, file)))
-            logger.info(
-                f"Old memory file {file} has been deleted.")
@@ -15,8 +15,8 @@ from visuanalytics.server.db import db, queries
 from visuanalytics.analytics.processing.image.matplotlib.diagram import generate_test_diagram
 from visuanalytics.util.resources import TEMP_LOCATION, get_resource_path, get_temp_path
 from visuanalytics.util.config_manager import get_private, set_private
+from visuanalytics.util.infoprovider_utils import parse_formula
 
-from ast2json import str2json
 from base64 import b64encode
 from visuanalytics.analytics.apis.checkapi import check_api
 
@@ -553,11 +553,13 @@ def get_videojob_preview(videojob_id):
 @api.route("/videojob/<videojob_id>/logs", methods=["GET"])
 def get_videojob_logs(videojob_id):
     """
-    Endpunkt `/infoprovider/<infoprovider_id>/logs`.
+    Endpunkt `/videojob/<videojob_id>/logs`.
 
-    Route um alle Logs der Datenquellen eines Infoproviders zu laden.
+    Route um alle Logs eines Videojobs zu laden. Jeder Log enthält unter `steps` die Messwerte
+    (Laufzeit, CPU-Zeit, Speicher, temporäre Dateien) der einzelnen Pipeline-Schritte und unter `profile`
+    den Laufzeitbericht der Typen (nur wenn `profile` aktiviert war).
 
-    :param videojob_id: ID des Infoproviders.
+    :param videojob_id: ID des Videojobs.
     """
     try:
         return flask.jsonify(queries.get_videojob_logs(videojob_id))
@@ -573,7 +575,8 @@ def testformula():
     Endpunkt `/testformula`.
 
     Route zum Testen einer gegebenen Formel.
-    Die Response enthält einen boolschen Wert welcher angibt ob die Formel syntaktisch richtig ist.
+    Die Response enthält einen boolschen Wert welcher angibt ob die Formel syntaktisch richtig ist und ausgeführt werden
+    kann (dazu wird sie wie beim Generieren des `transform`-Typs `formula` übersetzt).
     """
     formula = request.json
     try:
@@ -581,7 +584,8 @@ def testformula():
             err = flask.jsonify({"err_msg": "Missing field 'formula'"})
             return err, 400
 
-        str2json(queries.remove_toplevel_key(formula["formula"]).replace("|", "uzjhnjtdryfguljkm"))
+        # Same parser and compiler as the transform-type formula
+        parse_formula(queries.remove_toplevel_key(formula["formula"]))
         return flask.jsonify({"accepted": True})
 
     except SyntaxError:
@@ -69,6 +69,32 @@ def init_db(topics: list, db_path: str):
 
         logger.info("Database initialisation done!")
 
+    _update_db()
+
+
+_UPDATE_COLUMNS = {
+    "job_step_logs": [("path", "VARCHAR"), ("calls", "INT"), ("self_time", "REAL"), ("elements", "BIGINT")]
+}
+"""Spalten, die nach dem ursprünglichen Schema zu bestehenden Tabellen hinzugekommen sind."""
+
+
+def _update_db():
+    """ Legt Tabellen und Spalten an, die erst nach dem ursprünglichen Schema hinzugekommen sind.
+
+    Dadurch können auch bereits bestehende Datenbanken weiterverwendet werden.
+    """
+    with open_con() as con:
+        with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'update.sql')) as f:
+            con.executescript(f.read())
+
+        # SQLite has no "ADD COLUMN IF NOT EXISTS"
+        for table, columns in _UPDATE_COLUMNS.items():
+            existing = [row[1] for row in con.execute(f"PRAGMA table_info({table})")]
+            for name, column_type in columns:
+                if name not in existing:
+                    con.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+        con.commit()
+
 
 def _init_topics(topics: list):
     logger.info("Initialize topics ...")
@@ -129,6 +129,7 @@ def insert_log(job_id: int, state: int, start_time: datetime, pipeline_type='JOB
         con.execute(
             "DELETE FROM job_logs WHERE job_logs_id NOT IN (SELECT job_logs_id FROM job_logs ORDER BY job_logs_id DESC limit ?)",
             [LOG_LIMIT])
+        con.execute("DELETE FROM job_step_logs WHERE job_logs_id NOT IN (SELECT job_logs_id FROM job_logs)")
         con.commit()
 
         return id["id"]
@@ -147,6 +148,24 @@ def update_log_finish(id: int, state: int, duration: int):
         con.commit()
 
 
+def insert_step_log(log_id: int, step: int, step_name: str, metrics: dict):
+    with db.open_con() as con:
+        con.execute("INSERT INTO job_step_logs(job_logs_id, step, step_name, wall_time, cpu_time, rss_delta, temp_bytes) "
+                    "values (?, ?, ?, ?, ?, ?, ?)",
+                    [log_id, step, step_name, metrics.get("wall_time"), metrics.get("cpu_time"),
+                     metrics.get("rss_delta"), metrics.get("temp_bytes")])
+        con.commit()
+
+
+def insert_profile_log(log_id: int, report: list):
+    with db.open_con() as con:
+        con.executemany("INSERT INTO job_step_logs(job_logs_id, step, step_name, wall_time, path, calls, self_time, elements) "
+                        "values (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(log_id, entry["step"], entry["type"], entry["total_time"], entry["path"], entry["calls"],
+                          entry["self_time"], entry["elements"]) for entry in report])
+        con.commit()
+
+
 def get_interval(res):
     return INTERVAL.get(res["time_interval"])
 
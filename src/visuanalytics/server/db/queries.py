@@ -206,6 +206,7 @@ def insert_infoprovider(infoprovider):
                   "type": "request_memory",
                   "name": dict(storing_config)["name"],
                   "use_last": use_last,
+                  "series": True,
                   "alternative": {
                     "type": "input",
                     "data": 0
@@ -650,6 +651,7 @@ def update_infoprovider(infoprovider_id, updated_data):
                   "type": "request_memory",
                   "name": dict(storing_config)["name"],
                   "use_last": use_last,
+                  "series": True,
                   "alternative": {
                     "type": "input",
                     "data": 0
@@ -744,7 +746,7 @@ def get_infoprovider_logs(infoprovider_id):
     datasource_ids = con.execute("SELECT datasource_id FROM datasource WHERE infoprovider_id=?", [infoprovider_id])
     logs = []
     for datasource_id in datasource_ids:
-        datasource_logs = con.execute("SELECT job_id, datasource_name, state, error_msg, error_traceback, duration, start_time "
+        datasource_logs = con.execute("SELECT job_logs_id, job_id, datasource_name, state, error_msg, error_traceback, duration, start_time "
                                       "from job_logs INNER JOIN datasource ON job_logs.job_id=datasource.datasource_id "
                                       "WHERE pipeline_type='DATASOURCE' AND datasource.datasource_id=?"
                                       "ORDER BY job_logs_id DESC", [datasource_id["datasource_id"]]).fetchall()
@@ -755,7 +757,9 @@ def get_infoprovider_logs(infoprovider_id):
             "errorMsg": datasource_log["error_msg"],
             "errorTraceback": datasource_log["error_traceback"],
             "duration": datasource_log["duration"],
-            "startTime": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(datasource_log["start_time"]))
+            "startTime": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(datasource_log["start_time"])),
+            "steps": get_step_logs(datasource_log["job_logs_id"]),
+            "profile": get_profile_logs(datasource_log["job_logs_id"])
         }) for datasource_log in datasource_logs]
     return logs
 
@@ -768,7 +772,7 @@ def get_videojob_logs(videojob_id):
     :return: Liste aller gefundenen Logs.
     """
     con = db.open_con_f()
-    logs = con.execute("SELECT job_id, job_name, state, error_msg, error_traceback, duration, start_time "
+    logs = con.execute("SELECT job_logs_id, job_id, job_name, state, error_msg, error_traceback, duration, start_time "
                                   "from job_logs INNER JOIN job USING (job_id) "
                                   "WHERE pipeline_type='JOB' AND job_id=?"
                                   "ORDER BY job_logs_id DESC", [videojob_id]).fetchall()
@@ -779,10 +783,58 @@ def get_videojob_logs(videojob_id):
         "errorMsg": log["error_msg"],
         "errorTraceback": log["error_traceback"],
         "duration": log["duration"],
-        "startTime": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(log["start_time"]))
+        "startTime": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(log["start_time"])),
+        "steps": get_step_logs(log["job_logs_id"]),
+        "profile": get_profile_logs(log["job_logs_id"])
     } for log in logs]
 
 
+def get_step_logs(job_logs_id):
+    """
+    Läd die Messwerte der einzelnen Schritte eines Pipeline-Durchlaufs.
+
+    Der Speicherzuwachs (`rssDelta`) und die temporären Dateien (`tempBytes`) werden für den ganzen Prozess gemessen,
+    sie sind `None` für Schritte, die parallel zu anderen Schritten ausgeführt wurden.
+
+    :param job_logs_id: ID des Logs (aus der Tabelle `job_logs`).
+    :return: Liste der Messwerte, sortiert nach der Reihenfolge der Schritte.
+    """
+    con = db.open_con_f()
+    step_logs = con.execute("SELECT step, step_name, wall_time, cpu_time, rss_delta, temp_bytes "
+                            "FROM job_step_logs WHERE job_logs_id=? AND path IS NULL ORDER BY job_step_logs_id",
+                            [job_logs_id]).fetchall()
+    return [{
+        "step": step_log["step"],
+        "stepName": step_log["step_name"],
+        "wallTime": step_log["wall_time"],
+        "cpuTime": step_log["cpu_time"],
+        "rssDelta": step_log["rss_delta"],
+        "tempBytes": step_log["temp_bytes"]
+    } for step_log in step_logs]
+
+
+def get_profile_logs(job_logs_id):
+    """
+    Läd den Laufzeitbericht der Typen eines Pipeline-Durchlaufs (nur vorhanden, wenn `profile` aktiviert war).
+
+    :param job_logs_id: ID des Logs (aus der Tabelle `job_logs`).
+    :return: Liste der Messwerte je Typ und Pfad, sortiert nach der eigenen Zeit (absteigend).
+    """
+    con = db.open_con_f()
+    profile_logs = con.execute("SELECT step, step_name, path, calls, wall_time, self_time, elements "
+                               "FROM job_step_logs WHERE job_logs_id=? AND path IS NOT NULL "
+                               "ORDER BY self_time DESC", [job_logs_id]).fetchall()
+    return [{
+        "step": profile_log["step"],
+        "type": profile_log["step_name"],
+        "path": profile_log["path"],
+        "calls": profile_log["calls"],
+        "totalTime": profile_log["wall_time"],
+        "selfTime": profile_log["self_time"],
+        "elements": profile_log["elements"]
+    } for profile_log in profile_logs]
+
+
 def get_all_videojobs():
     """
     Läd die Logs aller Datenquellen die einem bestimmten Infoprovider angehören.
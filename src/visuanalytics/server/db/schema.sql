@@ -113,6 +113,29 @@ CREATE TABLE job_logs (
 );
 
 
+-- Table: job_step_logs
+DROP TABLE IF EXISTS job_step_logs;
+
+CREATE TABLE job_step_logs (
+    job_step_logs_id INTEGER PRIMARY KEY AUTOINCREMENT
+                             NOT NULL
+                             UNIQUE,
+    job_logs_id      INTEGER REFERENCES job_logs (job_logs_id) ON DELETE CASCADE
+                                                               ON UPDATE CASCADE
+                             NOT NULL,
+    step             INT     NOT NULL,
+    step_name        VARCHAR NOT NULL,
+    wall_time        REAL,
+    cpu_time         REAL,
+    rss_delta        BIGINT,
+    temp_bytes       BIGINT,
+    path             VARCHAR,
+    calls            INT,
+    self_time        REAL,
+    elements         BIGINT
+);
+
+
 -- Table: job_topic_position
 DROP TABLE IF EXISTS job_topic_position;
 
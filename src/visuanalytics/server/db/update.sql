@@ -0,0 +1,22 @@
+--
+-- Tables added after the initial schema. Executed on every start,
+-- so all statements have to be idempotent.
+--
+
+-- Table: job_step_logs
+CREATE TABLE IF NOT EXISTS job_step_logs (
+    job_step_logs_id INTEGER PRIMARY KEY AUTOINCREMENT
+                             NOT NULL
+                             UNIQUE,
+    job_logs_id      INTEGER REFERENCES job_logs (job_logs_id) ON DELETE CASCADE
+                                                               ON UPDATE CASCADE
+                             NOT NULL,
+    step             INT     NOT NULL,
+    step_name        VARCHAR NOT NULL,
+    wall_time        REAL,
+    cpu_time         REAL,
+    rss_delta        BIGINT,
+    temp_bytes       BIGINT
+);
+
+-- Columns added to existing tables are listed in db._UPDATE_COLUMNS
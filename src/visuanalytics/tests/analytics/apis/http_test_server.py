@@ -0,0 +1,55 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open (keep-alive)
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status, headers, body = self.server.respond(self)
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _respond_json(handler):
+    return 200, {"Content-Type": "application/json"}, json.dumps({"path": handler.path}).encode()
+
+
+class LocalHTTPServer(object):
+    """Lokaler HTTP-Server für Tests der API-Requests.
+
+    :param respond: Funktion, die mit dem Request-Handler aufgerufen wird und `(status, headers, body)` zurückgibt.
+    """
+
+    def __init__(self, respond=_respond_json):
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.__server.daemon_threads = True
+        self.__server.respond = respond
+        self.__server.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.__server.server_address[1]}"
+
+    @property
+    def requests(self):
+        return self.__server.requests
+
+    def __enter__(self):
+        threading.Thread(target=self.__server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__server.shutdown()
+        self.__server.server_close()
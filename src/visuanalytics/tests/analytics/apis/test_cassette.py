@@ -0,0 +1,114 @@
+import os
+import pickle
+import shutil
+import time
+import unittest
+
+import requests
+
+from visuanalytics.analytics.apis import cassette, http_session
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_errors import APIError
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+from visuanalytics.util import resources
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        self.config = cassette.CASSETTE_CONFIG
+
+    def tearDown(self):
+        cassette.CASSETTE_CONFIG = self.config
+        self.__use()
+        shutil.rmtree(resources.get_resource_path(resources.CASSETTE_LOCATION), ignore_errors=True)
+
+    @staticmethod
+    def __use(mode="off", latency=0):
+        cassette.CASSETTE_CONFIG = {"mode": mode, "name": "test", "latency": latency}
+        cassette.clear()
+
+        # New sessions are created with the adapter of the current mode
+        http_session.get_session_manager().close()
+
+    @staticmethod
+    def __request(url, stream=False):
+        values = {"type": "request_multiple", "url_pattern": url + "/{_loop}", "steps_value": ["a", "b", "c"],
+                  "stream": stream}
+        data = StepData({}, "0", 0)
+        api_request(values, data, "test", "_req")
+        return data.get_data("_req", {})
+
+    def test_record_replay(self):
+        self.__use("record")
+        with LocalHTTPServer() as server:
+            url = server.url
+            recorded = self.__request(url)
+
+        self.assertListEqual([{"path": "/a"}, {"path": "/b"}, {"path": "/c"}], recorded)
+        self.assertEqual(3, len(cassette.get_cassette("test")))
+
+        # The server is not running anymore, the responses are read from the cassette file
+        self.__use("replay")
+        self.assertListEqual(recorded, self.__request(url))
+
+    def test_record_replay_stream(self):
+        self.__use("record")
+        with LocalHTTPServer() as server:
+            url = server.url
+            recorded = self.__request(url, True)
+
+        self.assertListEqual([{"path": "/a"}, {"path": "/b"}, {"path": "/c"}], recorded)
+
+        self.__use("replay")
+        self.assertListEqual(recorded, self.__request(url, True))
+
+    def test_replay_latency(self):
+        self.__use("record")
+        with LocalHTTPServer() as server:
+            url = server.url
+            self.__request(url)
+
+        self.__use("replay", 0.05)
+        start = time.perf_counter()
+        self.__request(url)
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+    def test_replay_missing(self):
+        self.__use("replay")
+
+        with self.assertRaises(APIError):
+            self.__request("http://127.0.0.1:1")
+
+    def test_append_records(self):
+        path = resources.get_resource_path(os.path.join(resources.CASSETTE_LOCATION, "test.pkl"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Cassettes written as one dictionary are still loaded
+        old = {"old": [{"content": b"old"}]}
+        with open(path, "wb") as fp:
+            pickle.dump(old, fp)
+
+        test = cassette.Cassette("test")
+        request = requests.Request("GET", "http://127.0.0.1:1/a").prepare()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"new"
+
+        sizes = []
+        for _ in range(3):
+            test.record(request, response)
+            sizes.append(os.path.getsize(path))
+
+        # Every record only appends its own entry
+        self.assertEqual(sizes[1] - sizes[0], sizes[2] - sizes[1])
+
+        # An incomplete last record (e.g. interrupted recording) is ignored
+        with open(path, "ab") as fp:
+            fp.write(pickle.dumps(("incomplete", {}))[:-3])
+
+        loaded = cassette.Cassette("test")
+        self.assertEqual(4, len(loaded))
+        self.assertEqual(b"new", loaded.play(request)["content"])
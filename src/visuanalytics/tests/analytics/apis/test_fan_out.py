@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.fan_out import TokenBucket, run_all
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_errors import APIError
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+
+
+class FanOutTest(unittest.TestCase):
+    def test_results_in_order(self):
+        def func(idx):
+            time.sleep(0.01 * (5 - idx))
+            return idx
+
+        self.assertListEqual(list(range(5)), run_all([lambda idx=idx: func(idx) for idx in range(5)], 5))
+
+    def test_max_parallel(self):
+        running, max_running = [0], [0]
+        lock = threading.Lock()
+
+        def func():
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        run_all([func] * 8, 2)
+
+        self.assertEqual(2, max_running[0])
+
+    def test_error(self):
+        def fail():
+            raise ValueError("test")
+
+        with self.assertRaises(ValueError):
+            run_all([lambda: 1, fail, lambda: 2], 3)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(50)
+
+        start = time.monotonic()
+        run_all([bucket.acquire] * 6, 6)
+
+        # The first token is available immediately, the others every 20ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class RequestMultipleTest(unittest.TestCase):
+    def setUp(self):
+        def respond(handler):
+            # Later requests are answered first
+            idx = int(handler.path.split("=")[-1])
+            time.sleep(0.01 * (5 - idx))
+            return 200, {"Content-Type": "application/json"}, f'{{"idx": {idx}}}'.encode()
+
+        self.server = LocalHTTPServer(respond).__enter__()
+        self.data = StepData({}, "0", 0)
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def __request(self, values):
+        api_request(values, self.data, "test", "_req")
+        return self.data.get_data("_req", {})
+
+    def test_list(self):
+        values = {"type": "request_multiple", "steps_value": [0, 1, 2, 3, 4], "url_pattern": self.server.url,
+                  "params": {"idx": "{_idx}"}}
+
+        self.assertListEqual([{"idx": idx} for idx in range(5)], self.__request(values))
+
+    def test_loop_as_key(self):
+        values = {"type": "request_multiple", "steps_value": ["a", "b", "c"], "url_pattern": self.server.url,
+                  "use_loop_as_key": True, "params": {"idx": "{_idx}"}, "max_parallel": 3}
+
+        res = self.__request(values)
+
+        self.assertListEqual(["a", "b", "c"], list(res.keys()))
+        self.assertDictEqual({"a": {"idx": 0}, "b": {"idx": 1}, "c": {"idx": 2}}, res)
+
+    def test_custom(self):
+        values = {"type": "request_multiple_custom", "steps_value": ["a", "b"], "use_loop_as_key": True,
+                  "requests": [{"type": "request", "url_pattern": f"{self.server.url}?idx=0"},
+                               {"type": "input", "data": 1}]}
+
+        res = self.__request(values)
+
+        self.assertListEqual(["a", "b"], list(res.keys()))
+        self.assertDictEqual({"a": {"idx": 0}, "b": 1}, res)
+
+    def test_custom_uses_earlier_result(self):
+        for max_parallel in [{}, {"max_parallel": 2}]:
+            with self.subTest(max_parallel=max_parallel):
+                values = {"type": "request_multiple_custom", "steps_value": ["a", "b"], "use_loop_as_key": True,
+                          "requests": [{"type": "request", "url_pattern": f"{self.server.url}?idx=0"},
+                                       {"type": "input", "data": "{_req|a|idx}"}], **max_parallel}
+
+                self.assertDictEqual({"a": {"idx": 0}, "b": "0"}, self.__request(values))
+
+    def test_error(self):
+        values = {"type": "request_multiple", "steps_value": [0, "x"], "url_pattern": self.server.url,
+                  "params": {"idx": "{_loop}"}}
+
+        with self.assertRaises(APIError):
+            self.__request(values)
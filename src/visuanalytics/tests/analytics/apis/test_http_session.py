@@ -0,0 +1,67 @@
+import unittest
+
+import requests
+
+from visuanalytics.analytics.apis.http_session import SessionManager
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+
+
+class SessionManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalHTTPServer().__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def __send(self, manager, path):
+        return manager.send(requests.Request("GET", f"{self.server.url}{path}").prepare())
+
+    def test_reuse_connection(self):
+        manager = SessionManager()
+        for idx in range(3):
+            self.assertEqual({"path": f"/{idx}"}, self.__send(manager, f"/{idx}").json())
+
+        self.assertDictEqual({"sessions": 1, "requests": 3, "connections": 1, "reused": 2}, manager.stats())
+        manager.close()
+
+    def test_same_session_per_host(self):
+        manager = SessionManager()
+
+        self.assertIs(manager.get_session(f"{self.server.url}/a"), manager.get_session(f"{self.server.url}/b?c=d"))
+        self.assertIsNot(manager.get_session(f"{self.server.url}/a"), manager.get_session("http://localhost/a"))
+        manager.close()
+
+    def test_max_lifetime(self):
+        manager = SessionManager({"max_lifetime": -1})
+        for idx in range(2):
+            self.__send(manager, f"/{idx}")
+
+        self.assertDictEqual({"sessions": 1, "requests": 2, "connections": 2, "reused": 0}, manager.stats())
+        manager.close()
+
+    def test_max_lifetime_in_flight(self):
+        manager = SessionManager({"max_lifetime": -1})
+        request = requests.Request("GET", f"{self.server.url}/a").prepare()
+
+        # The replaced session is closed after the running (streamed) request has finished
+        with manager.send(request, stream=True) as response:
+            old_pools = response.connection.poolmanager.pools
+            self.assertEqual({"path": "/b"}, self.__send(manager, "/b").json())
+
+            self.assertEqual(1, len(old_pools))
+            self.assertEqual({"path": "/a"}, response.json())
+
+        self.assertEqual(0, len(old_pools))
+        self.assertDictEqual({"sessions": 1, "requests": 2, "connections": 2, "reused": 0}, manager.stats())
+        manager.close()
+
+    def test_no_cookies_stored(self):
+        def respond(handler):
+            return 200, {"Set-Cookie": "id=1; Path=/"}, b"{}"
+
+        with LocalHTTPServer(respond) as server:
+            manager = SessionManager()
+            manager.send(requests.Request("GET", server.url).prepare())
+
+            self.assertEqual(0, len(manager.get_session(server.url).cookies))
+            manager.close()
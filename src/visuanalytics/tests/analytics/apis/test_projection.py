@@ -0,0 +1,68 @@
+import unittest
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.projection import used_paths, relative_paths, project, attach_paths, WILDCARD
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+
+
+class ProjectionTest(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "api": {"type": "request", "url_pattern": "url"},
+            "transform": [
+                {"type": "transform_array", "array_key": "_req|data", "transform": []},
+                {"type": "copy", "keys": ["_req|info|{_conf|city}|name"], "new_keys": ["name"]},
+                {"type": "add_symbol", "keys": ["$_req|count"], "pattern": "{_req|meta|0|unit} {_loop}"},
+                {"type": "select", "relevant_keys": ["_req|data|0"]}
+            ]
+        }
+
+    def test_used_paths(self):
+        self.assertListEqual([("_req", "count"), ("_req", "data"), ("_req", "info", WILDCARD, "name"),
+                              ("_req", "meta", "0", "unit")], used_paths(self.config))
+
+    def test_root_used(self):
+        self.assertListEqual([("_req",)], used_paths({"storing": [{"key": "_req"}, {"key": "_req|a"}]}))
+
+    def test_relative_paths(self):
+        paths = [("_req", WILDCARD, "a"), ("_req", "x", "b")]
+
+        self.assertListEqual([("a",), ("b",)], relative_paths(paths, "_req|x"))
+        self.assertListEqual([("a",)], relative_paths(paths, "_req|0"))
+        self.assertIsNone(relative_paths(paths, "_req|x|b"))
+        self.assertIsNone(relative_paths(paths, "_other"))
+
+    def test_project(self):
+        res = {
+            "data": [{"a": 1}, {"b": 2}],
+            "meta": [{"unit": "m", "other": 1}, {"unit": "km"}],
+            "info": {"Giessen": {"name": "a", "id": 1}},
+            "unused": {"large": list(range(100))}
+        }
+
+        self.assertDictEqual({
+            "data": [{"a": 1}, {"b": 2}],
+            "meta": [{"unit": "m"}, None],
+            "info": {"Giessen": {"name": "a"}}
+        }, project(res, relative_paths(used_paths(self.config), "_req")))
+
+    def test_attach_paths(self):
+        api = {"type": "request_multiple_custom", "requests": [{"type": "request", "url_pattern": "a"},
+                                                               {"type": "input", "data": 1}]}
+        attach_paths(api, [("_req", "a")])
+
+        self.assertListEqual([("_req", "a")], api["requests"][0]["_projection"])
+        self.assertNotIn("_projection", api["requests"][1])
+
+    def test_fetch(self):
+        def respond(handler):
+            return 200, {}, b'{"data": [1, 2], "unused": "large"}'
+
+        with LocalHTTPServer(respond) as server:
+            for enabled, expected in [(False, {"data": [1, 2], "unused": "large"}), (True, {"data": [1, 2]})]:
+                values = {"type": "request", "url_pattern": server.url, "_projection": [("_req", "data")]}
+                data = StepData({"api_projection": enabled}, "0", 0)
+                api_request(values, data, "test", "_req")
+
+                self.assertDictEqual(expected, data.get_data("_req", {}))
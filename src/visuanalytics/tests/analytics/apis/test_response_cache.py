@@ -0,0 +1,109 @@
+import os
+import shutil
+import time
+import unittest
+
+import requests
+
+from visuanalytics.analytics.apis import response_cache
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+from visuanalytics.util import resources
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        response_cache.clear()
+
+        self.version = 1
+
+        def respond(handler):
+            if handler.headers.get("If-None-Match", None) == f'"{self.version}"':
+                return 304, {}, b""
+
+            return 200, {"ETag": f'"{self.version}"'}, f'{{"version": {self.version}}}'.encode()
+
+        self.server = LocalHTTPServer(respond).__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+        response_cache.clear()
+        shutil.rmtree(resources.get_resource_path(resources.HTTP_CACHE_LOCATION), ignore_errors=True)
+
+    def __send(self, ttl, params=None):
+        request = requests.Request("GET", self.server.url, params=params).prepare()
+        return response_cache.send(request, ttl).json()
+
+    def test_no_ttl(self):
+        self.__send(0)
+        self.__send(0)
+
+        self.assertEqual(2, len(self.server.requests))
+        self.assertDictEqual({"hits": 0, "misses": 0, "revalidated": 0, "calls": 2, "shared": 0},
+                             response_cache.stats())
+
+    def test_hit(self):
+        self.assertDictEqual({"version": 1}, self.__send(60))
+        self.version = 2
+        self.assertDictEqual({"version": 1}, self.__send(60))
+
+        self.assertEqual(1, len(self.server.requests))
+        self.assertDictEqual({"hits": 1, "misses": 1, "revalidated": 0, "calls": 1, "shared": 0},
+                             response_cache.stats())
+
+    def test_different_params(self):
+        self.__send(60, {"a": 1})
+        self.__send(60, {"a": 2})
+
+        self.assertEqual(2, len(self.server.requests))
+
+    def test_revalidate(self):
+        self.__send(0.01)
+        time.sleep(0.02)
+        self.assertDictEqual({"version": 1}, self.__send(0.01))
+
+        time.sleep(0.02)
+        self.version = 2
+        self.assertDictEqual({"version": 2}, self.__send(0.01))
+
+        self.assertEqual(3, len(self.server.requests))
+        self.assertDictEqual({"hits": 0, "misses": 2, "revalidated": 1, "calls": 3, "shared": 0},
+                             response_cache.stats())
+
+    def test_disk(self):
+        self.__send(60)
+
+        # Entry is loaded from disk after the memory was cleared
+        response_cache.clear()
+        self.assertDictEqual({"version": 1}, self.__send(60))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_api_key_not_in_cache(self):
+        self.__send(60, {"key": "secret_api_key"})
+
+        folder = resources.get_resource_path(resources.HTTP_CACHE_LOCATION)
+        for name in os.listdir(folder):
+            self.assertNotIn("secret_api_key", name)
+
+            with open(os.path.join(folder, name), "rb") as fp:
+                self.assertNotIn(b"secret_api_key", fp.read())
+
+    def test_evict(self):
+        for idx in range(4):
+            self.__send(60, {"idx": idx})
+
+        # The oldest file is expired, of the others only the newest DISK_ENTRIES are kept
+        folder = resources.get_resource_path(resources.HTTP_CACHE_LOCATION)
+        files = sorted(os.listdir(folder))
+        for idx, name in enumerate(files):
+            mtime = time.time() - (response_cache.DISK_MAX_AGE + 1 if idx == 0 else 10 - idx)
+            os.utime(os.path.join(folder, name), (mtime, mtime))
+
+        original = response_cache.DISK_ENTRIES
+        response_cache.DISK_ENTRIES = 2
+        try:
+            self.assertEqual(2, response_cache.evict())
+        finally:
+            response_cache.DISK_ENTRIES = original
+
+        self.assertListEqual(sorted(files[2:]), sorted(os.listdir(folder)))
@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+import requests
+
+from visuanalytics.analytics.apis import response_cache
+from visuanalytics.analytics.apis.single_flight import SingleFlight
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+
+
+class SingleFlightTest(unittest.TestCase):
+    def __run_concurrent(self, func, count=5):
+        results = [None] * count
+        barrier = threading.Barrier(count)
+
+        def run(idx):
+            barrier.wait()
+            results[idx] = func()
+
+        threads = [threading.Thread(target=run, args=(idx,)) for idx in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_concurrent_calls_are_shared(self):
+        flight = SingleFlight()
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        results = self.__run_concurrent(lambda: flight.do("key", func))
+
+        self.assertEqual(1, len(calls))
+        self.assertListEqual([42] * 5, [result for result, _ in results])
+        self.assertEqual(4, sum(shared for _, shared in results))
+
+    def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight()
+
+        self.assertTupleEqual((1, False), flight.do("key", lambda: 1))
+        self.assertTupleEqual((2, False), flight.do("key", lambda: 2))
+
+    def test_error(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("test")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", fail)
+
+    def test_coalesce_requests(self):
+        def respond(handler):
+            time.sleep(0.1)
+            return 200, {}, b'{"a": 1}'
+
+        response_cache.clear()
+        with LocalHTTPServer(respond) as server:
+            results = self.__run_concurrent(
+                lambda: response_cache.send(requests.Request("GET", server.url).prepare()).json())
+
+            self.assertEqual(1, len(server.requests))
+
+        # Every caller gets its own parsed result
+        self.assertListEqual([{"a": 1}] * 5, results)
+        self.assertEqual(5, len({id(result) for result in results}))
+        response_cache.clear()
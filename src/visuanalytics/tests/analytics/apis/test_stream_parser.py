@@ -0,0 +1,57 @@
+import json
+import unittest
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.stream_parser import parse_json, parse_xml
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.tests.analytics.apis.http_test_server import LocalHTTPServer
+
+
+def _chunks(text: str, size: int):
+    data = text.encode("utf-8")
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class StreamParserTest(unittest.TestCase):
+    def test_json_array(self):
+        value = [1, 22.5, -3e2, "ä,]", {"a": [1, {"b": None}]}, [], True, False, None, "x" * 100]
+        text = json.dumps(value, ensure_ascii=False)
+
+        # Every chunk size splits the items (and the multibyte character) at different positions
+        for size in range(1, 20):
+            self.assertListEqual(value, parse_json(_chunks(text, size)), f"chunk size {size}")
+
+    def test_json_whitespace(self):
+        self.assertListEqual([1, 2], parse_json(_chunks(" \n[ 1 ,\n 2 ]\n", 2)))
+        self.assertListEqual([], parse_json(_chunks("[ ]", 1)))
+
+    def test_json_object(self):
+        value = {"data": [1, 2, 3], "name": "test"}
+        self.assertDictEqual(value, parse_json(_chunks(json.dumps(value), 3)))
+
+    def test_json_invalid(self):
+        for text in ["[1, 2", "[1 2]", "[1,]", "{"]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_json(_chunks(text, 2))
+
+    def test_json_item_hook(self):
+        res = parse_json(_chunks('[{"a": 1, "b": 2}, {"a": 3, "b": 4}]', 4), item_hook=lambda idx, item: item["a"] + idx)
+        self.assertListEqual([1, 4], res)
+
+    def test_xml(self):
+        text = "<root><item>1</item><item>2</item></root>"
+
+        self.assertDictEqual({"root": {"item": ["1", "2"]}}, parse_xml(_chunks(text, 3)))
+        self.assertListEqual(["1", "2"], parse_xml(_chunks(text, 3), {"item_depth": 2}))
+
+    def test_fetch(self):
+        body = json.dumps([{"temp": i, "unused": "x" * 100} for i in range(100)]).encode()
+
+        with LocalHTTPServer(lambda handler: (200, {"Content-Type": "application/json"}, body)) as server:
+            for enabled, expected in [(False, json.loads(body)), (True, [{"temp": i} for i in range(100)])]:
+                values = {"type": "request", "url_pattern": server.url, "stream": True,
+                          "_projection": [("_req", "*", "temp")]}
+                data = StepData({"api_projection": enabled}, "0", 0)
+                api_request(values, data, "test", "_req")
+
+                self.assertListEqual(expected, data.get_data("_req", {}))
@@ -0,0 +1,48 @@
+import shutil
+import time
+import unittest
+
+from visuanalytics.analytics.control.procedures.checkpoint import save_checkpoint, load_checkpoint, \
+    delete_checkpoint
+from visuanalytics.util import resources
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        self.data = {"_conf": {"test": 1}, "_pipe_id": "1", "_job_id": 0, "_req": {"value": b"bytes"}}
+        self.config = {"api": {"type": "input"}, "out_time": "now"}
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_resource_path(resources.CHECKPOINT_LOCATION), ignore_errors=True)
+
+    def test_save_and_load(self):
+        save_checkpoint("test_job", "test_steps", 2, self.config, self.data)
+        checkpoint = load_checkpoint("test_job", "test_steps")
+
+        self.assertEqual(2, checkpoint["step"])
+        self.assertDictEqual(self.config, checkpoint["config"])
+        # Run specific data is not saved
+        self.assertDictEqual({"_req": {"value": b"bytes"}}, checkpoint["data"])
+
+    def test_no_checkpoint(self):
+        self.assertIsNone(load_checkpoint("test_job", "test_steps"))
+
+    def test_delete(self):
+        save_checkpoint("test_job", "test_steps", 2, self.config, self.data)
+        delete_checkpoint("test_job", "test_steps")
+
+        self.assertIsNone(load_checkpoint("test_job", "test_steps"))
+
+    def test_max_age(self):
+        save_checkpoint("test_job", "test_steps", 2, self.config, self.data)
+
+        self.assertIsNone(load_checkpoint("test_job", "test_steps", max_age=-1))
+        # Outdated checkpoints are removed
+        self.assertIsNone(load_checkpoint("test_job", "test_steps"))
+
+    def test_not_before(self):
+        save_checkpoint("test_job", "test_steps", 2, self.config, self.data)
+
+        self.assertIsNotNone(load_checkpoint("test_job", "test_steps", not_before=time.time() - 60))
+        self.assertIsNone(load_checkpoint("test_job", "test_steps", not_before=time.time() + 60))
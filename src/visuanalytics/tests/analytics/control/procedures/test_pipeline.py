@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from visuanalytics.analytics.control.procedures.pipeline import Pipeline
+from visuanalytics.analytics.control.scheduler.scheduler import RetryPipeline
+from visuanalytics.util import resources
+
+
+class PipelineRetryTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        os.makedirs(resources.get_resource_path("steps"), exist_ok=True)
+        for name in ["test_retry", "global_presets"]:
+            with open(resources.get_resource_path(f"steps/{name}.json"), "w") as fp:
+                json.dump({}, fp)
+
+        self.calls = []
+        self.failures = 1
+
+        def api(values, data):
+            self.calls.append("Apis")
+            data.insert_data("_req", {"value": 1}, {})
+
+        def transform(values, data):
+            self.calls.append("Transform")
+            self.assertEqual(1, data.get_data("_req|value", {}))
+
+            if self.failures > 0:
+                self.failures -= 1
+                raise ValueError("test")
+
+        steps = {
+            0: {"name": "Precondition", "call": lambda values, data: None},
+            1: {"name": "Apis", "call": api, "requires": [0]},
+            2: {"name": "Transform", "call": transform, "requires": [1]},
+            3: {"name": "Storing", "call": lambda values, data: None, "requires": [2]}
+        }
+        steps.update({step: {"name": f"Step {step}", "call": lambda values, data: None, "requires": [step - 1]}
+                      for step in range(4, 9)})
+
+        patcher = mock.patch.dict(Pipeline._Pipeline__steps, steps)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_resource_path("steps"), ignore_errors=True)
+        shutil.rmtree(resources.get_resource_path(resources.CHECKPOINT_LOCATION), ignore_errors=True)
+
+    def __create(self, steps_config):
+        return RetryPipeline(lambda resume: Pipeline(0, f"test-retry-{resume}", "test_retry",
+                                                     {"job_name": "test-retry", **steps_config}, resume=resume))
+
+    def test_resume_after_checkpoint(self):
+        self.assertTrue(self.__create({"checkpoint": ["Apis"]}).start())
+
+        # The retry continues after the checkpoint, the APIs are not requested again
+        self.assertListEqual(["Apis", "Transform", "Transform"], self.calls)
+
+    def test_no_checkpoint(self):
+        self.assertFalse(self.__create({}).start())
+        self.assertListEqual(["Apis", "Transform"], self.calls)
+
+    def test_retries(self):
+        self.failures = 3
+
+        self.assertFalse(self.__create({"checkpoint": ["Apis"], "checkpoint_retries": 2}).start())
+        self.assertListEqual(["Apis", "Transform", "Transform", "Transform"], self.calls)
+
+    def test_regular_run(self):
+        # Without resume, a new run requests the APIs again
+        Pipeline(0, "test-retry-0", "test_retry", {"job_name": "test-retry", "checkpoint": ["Apis"]}).start()
+        Pipeline(0, "test-retry-1", "test_retry", {"job_name": "test-retry", "checkpoint": ["Apis"]}).start()
+
+        self.assertListEqual(["Apis", "Transform", "Apis", "Transform"], self.calls)
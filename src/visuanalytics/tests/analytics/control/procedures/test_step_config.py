@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import unittest
+
+from visuanalytics.analytics.control.procedures import step_config
+from visuanalytics.analytics.control.procedures.step_config import load_step_config
+from visuanalytics.util import resources
+
+
+class StepConfigTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        self.folder = resources.get_resource_path("step_config")
+        os.makedirs(self.folder, exist_ok=True)
+
+        self.__write("global_presets", {"presets": {"a": {"value": 1}, "b": {"value": 2}}})
+        self.__write("test", {
+            "presets": {"b": {"value": 3}},
+            "transform": [{"type": "test", "preset": "a"}],
+            "run_config": {
+                "p": {"type": "string", "default_value": "x"},
+                "s": {"type": "sub_params", "sub_params": {"q": {"type": "number", "default_value": 1}}}
+            }
+        })
+        step_config.clear_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+        step_config.clear_cache()
+
+    def __write(self, name, config):
+        with open(os.path.join(self.folder, f"{name}.json"), "w") as fp:
+            json.dump(config, fp)
+
+    def test_merge_presets_and_default_config(self):
+        config, default_config = load_step_config("step_config", "test")
+
+        self.assertDictEqual({"a": {"value": 1}, "b": {"value": 3}}, config["presets"])
+        self.assertDictEqual({"p": "x", "q": 1, "s": None}, default_config)
+
+    def test_inline_presets(self):
+        config, _ = load_step_config("step_config", "test")
+
+        self.assertDictEqual({"type": "test", "value": 1}, config["transform"][0])
+
+    def test_copies_are_independent(self):
+        config, default_config = load_step_config("step_config", "test")
+        config["presets"]["a"]["value"] = 42
+        default_config["p"] = "y"
+
+        config, default_config = load_step_config("step_config", "test")
+
+        self.assertEqual(1, config["presets"]["a"]["value"])
+        self.assertEqual("x", default_config["p"])
+
+    def test_reload_on_change(self):
+        load_step_config("step_config", "test")
+        self.__write("test", {"presets": {}, "run_config": {"p": {"type": "string", "default_value": "changed"}}})
+
+        _, default_config = load_step_config("step_config", "test")
+
+        self.assertEqual("changed", default_config["p"])
+
+    def test_invalid_run_config(self):
+        self.__write("test", {"run_config": {"p": {"default_value": "x"}}})
+
+        with self.assertRaises(ValueError):
+            load_step_config("step_config", "test")
@@ -0,0 +1,44 @@
+import unittest
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+
+
+class StepDataLoopScopeTest(unittest.TestCase):
+    def setUp(self):
+        self.data = StepData({}, "0", 0)
+        self.data.insert_data("array", [{"a": 1}, {"a": 2}], {})
+
+    def test_loop_values_visible(self):
+        values = {}
+        result = [self.data.format("{_idx}:{_loop|a}", values) for _ in
+                  self.data.loop_array(self.data.get_data("array", values), values)]
+
+        self.assertListEqual(["0:1", "1:2"], result)
+
+    def test_insert_in_loop(self):
+        values = {}
+        for _ in self.data.loop_array(self.data.get_data("array", values), values):
+            self.data.insert_data("_loop|b", self.data.get_data("_loop|a", values) * 2, values)
+            self.data.insert_data("result|{_idx}", self.data.get_data("_loop|a", values), values)
+
+        self.assertListEqual([{"a": 1, "b": 2}, {"a": 2, "b": 4}], self.data.get_data("array", {}))
+        self.assertDictEqual({0: 1, 1: 2}, self.data.get_data("result", {}))
+
+        # Loop values are not stored in the data
+        for key in ["_loop", "_idx", "_key"]:
+            self.assertNotIn(key, self.data.data)
+
+    def test_remove_in_loop(self):
+        values = {}
+        for _ in self.data.loop_array([0], values):
+            self.data.remove_data("array", values)
+
+        self.assertNotIn("array", self.data.data)
+
+    def test_loop_values_not_copied(self):
+        # Loop values and the data of the job are read from the original objects
+        values = {}
+        array = self.data.get_data("array", values)
+        for idx, _ in self.data.loop_array(array, values):
+            self.assertIs(array[idx], self.data.get_data("_loop", values))
+            self.assertIs(array, self.data.get_data("array", values))
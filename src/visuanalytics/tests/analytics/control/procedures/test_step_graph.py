@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from visuanalytics.analytics.control.procedures.step_graph import run_step_graph, topological_order
+
+
+class StepGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.steps = {
+            0: {"name": "a"},
+            1: {"name": "b", "requires": [0]},
+            2: {"name": "c", "requires": [1]},
+            3: {"name": "d", "requires": [0]},
+            4: {"name": "e", "requires": [2, 3]}
+        }
+
+    def test_topological_order(self):
+        self.assertListEqual([0, 1, 2, 3, 4], topological_order(self.steps, [0, 1, 2, 3, 4]))
+
+    def test_cyclic_dependencies(self):
+        steps = {0: {"requires": [1]}, 1: {"requires": [0]}}
+
+        with self.assertRaises(ValueError):
+            topological_order(steps, [0, 1])
+
+    def test_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            topological_order(self.steps, [1, 2])
+
+    def test_sequential(self):
+        executed = []
+        run_step_graph(self.steps, [0, 1, 2, 3, 4], executed.append, False)
+
+        self.assertListEqual([0, 1, 2, 3, 4], executed)
+
+    def test_parallel_respects_dependencies(self):
+        executed = []
+        lock = threading.Lock()
+
+        def execute(step_id):
+            with lock:
+                for required in self.steps[step_id].get("requires", []):
+                    self.assertIn(required, executed)
+                executed.append(step_id)
+
+        run_step_graph(self.steps, [0, 1, 2, 3, 4], execute)
+
+        self.assertSetEqual({0, 1, 2, 3, 4}, set(executed))
+        self.assertEqual(4, executed[-1])
+
+    def test_parallel_independent_steps_overlap(self):
+        # Steps 1 and 3 only finish if both are running at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def execute(step_id):
+            if step_id in (1, 3):
+                barrier.wait()
+
+        run_step_graph(self.steps, [0, 1, 2, 3, 4], execute)
+
+    def test_parallel_error(self):
+        executed = []
+
+        def execute(step_id):
+            if step_id == 1:
+                raise ValueError("test")
+            executed.append(step_id)
+
+        with self.assertRaises(ValueError):
+            run_step_graph(self.steps, [0, 1, 2, 3, 4], execute)
+
+        self.assertNotIn(2, executed)
+        self.assertNotIn(4, executed)
@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from visuanalytics.analytics.control.scheduler.pipeline_pool import PipelinePool
+
+
+class _TestPipeline(object):
+    def __init__(self, started: list, release: threading.Event = None):
+        self.started = started
+        self.release = release
+        self.done = threading.Event()
+
+    def start(self):
+        self.started.append(self)
+        if self.release is not None:
+            self.release.wait(5)
+        self.done.set()
+
+
+class PipelinePoolTest(unittest.TestCase):
+    def test_run(self):
+        pool = PipelinePool({"job": 1})
+        started = []
+        pipeline = _TestPipeline(started)
+
+        self.assertTrue(pool.submit("job", 1, pipeline))
+        self.assertTrue(pipeline.done.wait(5))
+        self.assertListEqual([pipeline], started)
+
+    def test_skip_running(self):
+        pool = PipelinePool({"job": 1})
+        release = threading.Event()
+        first = _TestPipeline([], release)
+
+        self.assertTrue(pool.submit("job", 1, first))
+        self.assertFalse(pool.submit("job", 1, _TestPipeline([])))
+        self.assertTrue(pool.is_active("job", 1))
+
+        release.set()
+        self.assertTrue(first.done.wait(5))
+
+    def test_max_workers(self):
+        pool = PipelinePool({"job": 1})
+        release = threading.Event()
+        started = []
+        first = _TestPipeline(started, release)
+        second = _TestPipeline(started)
+
+        pool.submit("job", 1, first)
+        pool.submit("job", 2, second)
+
+        # Second pipeline has to wait for the only worker
+        self.assertFalse(second.done.wait(0.2))
+        self.assertEqual(1, pool.queue_depth("job"))
+
+        release.set()
+        self.assertTrue(second.done.wait(5))
+        self.assertListEqual([first, second], started)
+
+    def test_priority(self):
+        pool = PipelinePool({"job": 1})
+        release = threading.Event()
+        started = []
+        blocker = _TestPipeline(started, release)
+        low = _TestPipeline(started)
+        high = _TestPipeline(started)
+
+        pool.submit("job", 1, blocker)
+        pool.submit("job", 2, low, priority=1)
+        pool.submit("job", 3, high, priority=0)
+
+        release.set()
+        self.assertTrue(low.done.wait(5))
+        self.assertListEqual([blocker, high, low], started)
+
+    def test_types_are_independent(self):
+        pool = PipelinePool({"job": 1, "datasource": 1})
+        release = threading.Event()
+        job = _TestPipeline([], release)
+        datasource = _TestPipeline([])
+
+        pool.submit("job", 1, job)
+        pool.submit("datasource", 1, datasource)
+
+        self.assertTrue(datasource.done.wait(5))
+        release.set()
+        self.assertTrue(job.done.wait(5))
@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import unittest
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.storing import memory_store
+from visuanalytics.analytics.storing.storing import storing
+from visuanalytics.util import resources
+
+SNAPSHOT = [{"name": f"Team {idx}", "points": idx * 3, "goals": idx * 2, "position": idx} for idx in range(300)]
+
+
+class MemoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_resource_path(resources.MEMORY_LOCATION), ignore_errors=True)
+
+    def test_last(self):
+        for idx in range(3):
+            memory_store.append("job", "test", {"value": idx}, datetime(2020, 1, 1 + idx))
+
+        self.assertListEqual([{"value": 2}], memory_store.last("job", "test"))
+        self.assertListEqual([{"value": 2}, {"value": 1}], memory_store.last("job", "test", 2))
+        self.assertRaises(IndexError, memory_store.last, "job", "test", 4)
+        self.assertRaises(FileNotFoundError, memory_store.last, "job", "other")
+
+    def test_skip_today(self):
+        memory_store.append("job", "test", 1, datetime.now() - timedelta(1))
+        memory_store.append("job", "test", 2)
+
+        self.assertListEqual([2], memory_store.last("job", "test", 1))
+        self.assertListEqual([1], memory_store.last("job", "test", 1, True))
+
+    def test_at(self):
+        memory_store.append("job", "test", 1, datetime.now() - timedelta(2))
+        memory_store.append("job", "test", 2, datetime.now() - timedelta(1, hours=1))
+        memory_store.append("job", "test", 3, datetime.now() - timedelta(1))
+
+        self.assertEqual(3, memory_store.at("job", "test", 1))
+        self.assertEqual(1, memory_store.at("job", "test", 2))
+        self.assertRaises(IndexError, memory_store.at, "job", "test", 3)
+
+    def test_prune(self):
+        for idx in range(5):
+            memory_store.append("job", "test", idx)
+
+        memory_store.prune("job", "test", 2)
+        self.assertListEqual([4, 3], memory_store.last("job", "test", 2))
+        self.assertRaises(IndexError, memory_store.last, "job", "test", 3)
+
+    def test_migrate(self):
+        folder = resources.get_memory_path("", "test", "job")
+        os.makedirs(folder)
+        for idx, file in enumerate(["2020-01-01.json", "2020-01-02-10-00-00.json", "2020-01-03-10-00-00.json"]):
+            with open(os.path.join(folder, file), "w") as fp:
+                json.dump({"value": idx}, fp)
+
+        self.assertEqual(3, memory_store.migrate(True))
+        self.assertListEqual([memory_store.MEMORY_DB], os.listdir(folder))
+        self.assertListEqual([{"value": 2}, {"value": 1}, {"value": 0}], memory_store.last("job", "test", 3))
+
+        # Folders with a database are not migrated again
+        self.assertEqual(0, memory_store.migrate())
+
+    def test_content_hash(self):
+        self.assertEqual(memory_store.content_hash({"a": 1, "b": [1, 2]}), memory_store.content_hash({"b": (1, 2), "a": 1}))
+        self.assertEqual(memory_store.content_hash({"1": 1, "a": 2}), memory_store.content_hash({1: 1, "a": 2}))
+        self.assertNotEqual(memory_store.content_hash({"a": 1}), memory_store.content_hash({"a": "1"}))
+
+    def test_last_hash(self):
+        self.assertIsNone(memory_store.last_hash("job", "test"))
+
+        # Migrated entries do not have a hash yet
+        folder = resources.get_memory_path("", "test", "job")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "2020-01-01-10-00-00.json"), "w") as fp:
+            json.dump({"b": 1, "a": 2}, fp)
+
+        self.assertEqual(memory_store.content_hash({"a": 2, "b": 1}), memory_store.last_hash("job", "test"))
+
+        memory_store.append("job", "test", [1, 2])
+        self.assertEqual(memory_store.content_hash([1, 2]), memory_store.last_hash("job", "test"))
+
+    def test_compression(self):
+        for idx, compression in enumerate([None, "zlib", "lzma", None]):
+            memory_store.append("job", "test", {"value": idx}, data_hash=None, compression=compression)
+
+        # Compressed and uncompressed entries are read transparently
+        self.assertListEqual([{"value": idx} for idx in reversed(range(4))], memory_store.last("job", "test", 4))
+        self.assertRaises(ValueError, memory_store.append, "job", "test", 1, compression="unknown")
+
+    def test_compression_size(self):
+        # Disk footprint of repetitive snapshots (like tables of a datasource), see benchmarks/bench_memory_store
+        sizes = {}
+
+        for compression in [None, "zlib", "lzma"]:
+            name = str(compression)
+            for day in range(30):
+                memory_store.append("job", name, SNAPSHOT, datetime(2020, 1, 1 + day), compression=compression)
+
+            sizes[name] = os.path.getsize(resources.get_memory_path(memory_store.MEMORY_DB, name, "job"))
+            self.assertListEqual([SNAPSHOT] * 30, memory_store.last("job", name, 30))
+
+        self.assertLess(sizes["zlib"], sizes["None"] / 3)
+        self.assertLess(sizes["lzma"], sizes["None"] / 3)
+
+    def test_series(self):
+        for value in [4, 1, 7, 2]:
+            memory_store.append("job", "test", value, series_size=3)
+
+        self.assertDictEqual({"values": [2, 7, 1], "min": 1, "max": 7, "mean": 10 / 3}, memory_store.series("job", "test"))
+        self.assertDictEqual({"values": [2, 7], "min": 2, "max": 7, "mean": 4.5}, memory_store.series("job", "test", 2))
+
+        # Longer series are read from the entries
+        self.assertListEqual([2, 7, 1, 4], memory_store.series("job", "test", 4)["values"])
+        self.assertRaises(IndexError, memory_store.series, "job", "test", 5)
+
+    def test_series_from_entries(self):
+        # Entries stored before the series existed are taken over, the series ends at the first non numeric entry
+        for value in ["text", 1, 2]:
+            memory_store.append("job", "test", value)
+
+        with closing(memory_store._connect("job", "test")) as con, con:
+            con.execute("DELETE FROM series")
+
+        memory_store.append("job", "test", 3)
+        self.assertListEqual([3, 2, 1], memory_store.series("job", "test")["values"])
+
+        memory_store.append("job", "test", {"value": 4})
+        self.assertRaises(ValueError, memory_store.series, "job", "test")
+
+    def test_series_invalidated(self):
+        # Non numeric, older and deleted entries must not leave stale values in the series
+        for value in [1, 2]:
+            memory_store.append("job", "test", value, datetime(2020, 1, 1 + value))
+
+        memory_store.append("job", "test", None, datetime(2020, 1, 4))
+        self.assertRaises(ValueError, memory_store.series, "job", "test")
+
+        memory_store.append("job", "test", 5, datetime(2020, 1, 5))
+        memory_store.append("job", "test", 0, datetime(2020, 1, 1))
+        self.assertListEqual([5], memory_store.series("job", "test")["values"])
+
+        for value in [6, 7]:
+            memory_store.append("job", "test", value, datetime(2020, 1, 1 + value))
+        memory_store.prune("job", "test", 2)
+        self.assertListEqual([7, 6], memory_store.series("job", "test")["values"])
+
+    def test_request_memory_series(self):
+        for value in [1, 2, 3]:
+            memory_store.append("job", "test", value)
+
+        data = StepData({"job_name": "job"}, "0", 0)
+        api_request({"type": "request_memory", "name": "test", "use_last": 2, "series": True}, data, "test", "_req")
+        self.assertListEqual([3, 2], data.get_data("_req", {}))
+
+        values = {"type": "request_memory", "name": "test", "use_last": 3, "series": True, "aggregates": True}
+        api_request(values, data, "test", "_req")
+        self.assertDictEqual({"values": [3, 2, 1], "min": 1, "max": 3, "mean": 2}, data.get_data("_req", {}))
+
+    def test_storing(self):
+        data = StepData({"job_name": "job"}, "0", 0)
+        data.insert_data("_req", {"temp": 10}, {})
+        values = {"storing": [{"name": "test", "key": "_req", "count": 2}]}
+
+        # Unchanged data is only stored once (safe_only_on_change)
+        for temp in [10, 10, 12, 14]:
+            data.insert_data("_req|temp", temp, {})
+            storing(values, data)
+
+        self.assertListEqual([{"temp": 14}, {"temp": 12}], memory_store.last("job", "test", 2))
+        self.assertRaises(IndexError, memory_store.last, "job", "test", 3)
+
+    def test_request_memory(self):
+        for idx in range(3):
+            memory_store.append("job", "test", idx)
+
+        data = StepData({"job_name": "job"}, "0", 0)
+        api_request({"type": "request_memory", "name": "test", "use_last": 2}, data, "test", "_req")
+        self.assertListEqual([2, 1], data.get_data("_req", {}))
+
+        values = {"type": "request_memory", "name": "test", "use_last": 4,
+                  "alternative": {"type": "input", "data": "alternative"}}
+        api_request(values, data, "test", "_req")
+        self.assertEqual("alternative", data.get_data("_req", {}))
@@ -0,0 +1,89 @@
+import unittest
+from copy import deepcopy
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform import parallel
+from visuanalytics.analytics.transform.transform import transform, transform_array
+from visuanalytics.analytics.util.step_errors import ParallelTransformError, TransformError
+
+TRANSFORMATIONS = [
+    {"type": "calculate", "action": "multiply", "keys": ["_loop|value"], "value_right": "_conf|factor",
+     "new_keys": ["_loop|result"]},
+    {"type": "add_symbol", "keys": ["_loop|name"], "pattern": "{_idx}: {_loop|name}"},
+    {"type": "option", "check": "_loop|even", "on_true": [
+        {"type": "upper_case", "keys": ["_loop|name"]}
+    ], "on_false": []}
+]
+
+
+def run_transform(type_name: str, loop_root, transformations: list, parallel_mode=True):
+    values = {
+        "transform": [
+            {
+                "type": type_name,
+                "array_key" if type_name == "transform_array" else "dict_key": "_req",
+                "vectorize": False,
+                "parallel": parallel_mode,
+                "workers": 2,
+                "transform": deepcopy(transformations)
+            }
+        ]
+    }
+
+    step_data = StepData({"factor": 2.5}, "0", 0)
+    step_data.insert_data("_req", deepcopy(loop_root), {})
+    transform(values, step_data)
+    return step_data.get_data("_req", {})
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.array = [{"value": idx, "name": f"name {idx}", "even": idx % 2 == 0} for idx in range(parallel.MIN_LENGTH)]
+
+    def test_transform_array(self):
+        self.assertListEqual(run_transform("transform_array", self.array, TRANSFORMATIONS, False),
+                             run_transform("transform_array", self.array, TRANSFORMATIONS))
+
+    def test_transform_dict(self):
+        dictionary = {f"key {idx}": value for idx, value in enumerate(self.array)}
+
+        self.assertDictEqual(run_transform("transform_dict", dictionary, TRANSFORMATIONS, False),
+                             run_transform("transform_dict", dictionary, TRANSFORMATIONS))
+
+    def test_reject_dependencies(self):
+        for transformations in [
+            [{"type": "copy", "keys": ["_loop|value"], "new_keys": ["_req_total"]}],
+            [{"type": "option", "check": "_loop|even", "on_true": [
+                {"type": "add_data", "new_keys": ["_loop|first"], "data": "$_req|0|value"}
+            ]}],
+            [{"type": "calculate", "action": "add", "keys": ["_loop|value"], "value_right": "_req|0|value"}]
+        ]:
+            with self.subTest(transformations=transformations):
+                self.assertRaises(TransformError, run_transform, "transform_array", self.array, transformations)
+
+    def test_similar_keys(self):
+        # Keys which only start with the key of the array are independent of it
+        values = {"transform": [{"type": "add_symbol", "keys": ["_loop|name"], "pattern": "{_req|data_extra}"}]}
+        parallel.check_dependencies(values, "_req|data")
+
+        values["transform"][0]["pattern"] = "{_req|data|0|name}"
+        self.assertRaises(ParallelTransformError, parallel.check_dependencies, values, "_req|data")
+
+    def test_loop_states(self):
+        for parallel_mode in [False, True]:
+            with self.subTest(parallel=parallel_mode):
+                values = {"array_key": "_req", "vectorize": False, "parallel": parallel_mode, "workers": 2,
+                          "transform": deepcopy(TRANSFORMATIONS)}
+                step_data = StepData({"factor": 2.5}, "0", 0)
+                step_data.insert_data("_req", deepcopy(self.array), {})
+
+                transform_array(values, step_data)
+
+                self.assertEqual(len(self.array) - 1, values["_loop_states"]["_idx"])
+                self.assertIs(step_data.get_data("_req", {})[-1], values["_loop_states"]["_loop"])
+
+    def test_error_in_worker(self):
+        with self.assertRaises(TransformError) as context:
+            run_transform("transform_array", self.array, [{"type": "lower_case", "keys": ["_loop|missing"]}])
+
+        self.assertIn("missing", str(context.exception))
@@ -0,0 +1,155 @@
+import random
+import unittest
+from copy import deepcopy
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform import vectorize
+from visuanalytics.analytics.transform.transform import transform
+
+
+def run_transform(transformations: list, array: list, vectorized=True):
+    values = {
+        "transform": [
+            {
+                "type": "transform_array",
+                "array_key": "_req",
+                "vectorize": vectorized,
+                "transform": deepcopy(transformations)
+            }
+        ]
+    }
+
+    step_data = StepData({"factor": 2.5}, "0", 0)
+    step_data.insert_data("_req", deepcopy(array), {})
+    transform(values, step_data)
+    return step_data.get_data("_req", {})
+
+
+class TestVectorize(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(42)
+        self.array = [
+            {
+                "int": rand.randint(-1000, 1000),
+                "float": rand.uniform(-1000, 1000),
+                "mixed": rand.choice([rand.randint(1, 100), rand.uniform(1, 100)]),
+                "nested": {"value": rand.randint(1, 100)}
+            } for _ in range(50)
+        ]
+
+    def assert_same_result(self, transformations: list, array=None):
+        array = self.array if array is None else array
+        expected = run_transform(transformations, array, False)
+        actual = run_transform(transformations, array)
+
+        self.assertListEqual(expected, actual)
+
+        # Types have to be the same as well (1 == 1.0)
+        self.assertListEqual([{k: type(v) for k, v in e.items()} for e in expected],
+                             [{k: type(v) for k, v in e.items()} for e in actual])
+
+    def assert_vectorized(self, transformations: list, expected=True):
+        values = {"array_key": "_req", "transform": transformations}
+        step_data = StepData({"factor": 2.5}, "0", 0)
+        step_data.insert_data("_req", deepcopy(self.array), {})
+
+        self.assertEqual(expected, vectorize.transform_array(values, step_data))
+
+    def test_bi_calculate(self):
+        for action in ["add", "subtract", "multiply", "divide", "modulo"]:
+            with self.subTest(action=action):
+                transformations = [
+                    {"type": "calculate", "action": action, "keys": ["_loop|int", "_loop|float", "_loop|mixed"],
+                     "value_right": 7, "new_keys": ["_loop|a", "_loop|b", "_loop|c"]},
+                    {"type": "calculate", "action": action, "keys": ["_loop|int", "_loop|mixed"],
+                     "keys_right": ["_loop|mixed", "_loop|nested|value"], "new_keys": ["_loop|d", "_loop|e"]},
+                    {"type": "calculate", "action": action, "keys": ["_loop|mixed"], "value_left": 3.5,
+                     "new_keys": ["_loop|f"]},
+                ]
+                self.assert_vectorized(transformations)
+                self.assert_same_result(transformations)
+
+    def test_decimal(self):
+        transformations = [
+            {"type": "calculate", "action": "divide", "keys": ["_loop|int"], "value_right": "_conf|factor",
+             "decimal": 2, "new_keys": ["_loop|a"]},
+            {"type": "calculate", "action": "multiply", "keys": ["_loop|mixed"], "value_right": 1.5, "decimal": 0},
+            {"type": "calculate", "action": "round", "keys": ["_loop|float"], "decimal": 1, "new_keys": ["_loop|b"]},
+            {"type": "calculate", "action": "round", "keys": ["_loop|float"]},
+        ]
+        self.assert_vectorized(transformations)
+        self.assert_same_result(transformations)
+
+    def test_convert(self):
+        transformations = [
+            {"type": "convert", "keys": ["_loop|float"], "to": "int", "new_keys": ["_loop|a"]},
+            {"type": "convert", "keys": ["_loop|int"], "to": "float"},
+            {"type": "convert", "keys": ["_loop|nested|value"], "to": "str"},
+        ]
+        self.assert_vectorized(transformations)
+        self.assert_same_result(transformations)
+
+    def test_chained(self):
+        # Later steps use the results of earlier steps
+        transformations = [
+            {"type": "calculate", "action": "add", "keys": ["_loop|int"], "keys_right": ["_loop|nested|value"],
+             "new_keys": ["_loop|sum"]},
+            {"type": "calculate", "action": "modulo", "keys": ["_loop|sum"], "value_right": 13},
+            {"type": "convert", "keys": ["_loop|sum"], "to": "str"},
+        ]
+        self.assert_vectorized(transformations)
+        self.assert_same_result(transformations)
+
+    def test_fallback(self):
+        unsupported = [
+            # Other transform types
+            [{"type": "add_symbol", "keys": ["_loop|int"], "pattern": "{_key} km"}],
+            # Keys depending on the current element
+            [{"type": "calculate", "action": "add", "keys": ["_loop|int"], "value_right": "{_idx}"}],
+            # Division by zero
+            [{"type": "calculate", "action": "divide", "keys": ["_loop|int"], "value_right": 0}],
+            # Written parts of a column
+            [{"type": "convert", "keys": ["_loop|nested|value"], "to": "str", "new_keys": ["_loop|nested"]},
+             {"type": "convert", "keys": ["_loop|nested|value"], "to": "str"}],
+        ]
+
+        for transformations in unsupported:
+            with self.subTest(transformations=transformations):
+                self.assert_vectorized(transformations, False)
+
+        # Non numeric values
+        array = [{"int": idx if idx % 10 else str(idx)} for idx in range(50)]
+        transformations = [{"type": "calculate", "action": "multiply", "keys": ["_loop|int"], "value_right": 2}]
+        self.assert_same_result(transformations, array)
+
+        # Values which are too large for int64 calculations
+        array = [{"int": idx * 2 ** 40} for idx in range(50)]
+        self.assert_same_result(transformations, array)
+
+    def test_large_constants(self):
+        for constant in [2 ** 31, 2 ** 62, 10 ** 20]:
+            with self.subTest(constant=constant):
+                transformations = [
+                    {"type": "calculate", "action": "multiply", "keys": ["_loop|int"], "value_right": constant,
+                     "new_keys": ["_loop|a"]},
+                    {"type": "calculate", "action": "subtract", "keys": ["_loop|nested|value"],
+                     "value_left": constant, "new_keys": ["_loop|b"]},
+                    {"type": "formula", "new_key": "_loop|c",
+                     "formula": {"operator": "ADD", "lop": "_loop|int",
+                                 "rop": {"operator": "MUL", "lop": constant, "rop": 2}}}
+                ]
+                self.assert_same_result(transformations)
+
+    def test_short_array(self):
+        self.array = self.array[:vectorize.MIN_LENGTH - 1]
+        self.assert_vectorized([{"type": "convert", "keys": ["_loop|int"], "to": "float"}], False)
+
+    def test_large_array(self):
+        array = [{"temp": idx % 40 - 5, "wind": idx * 0.37} for idx in range(200)]
+        transformations = [
+            {"type": "calculate", "action": "multiply", "keys": ["_loop|temp"], "value_right": 1.8,
+             "new_keys": ["_loop|fahrenheit"]},
+            {"type": "calculate", "action": "add", "keys": ["_loop|fahrenheit"], "value_right": 32, "decimal": 1},
+            {"type": "calculate", "action": "divide", "keys": ["_loop|wind"], "value_right": 3.6, "decimal": 2},
+        ]
+        self.assert_same_result(transformations, array)
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from visuanalytics.analytics.transform import formula
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+from visuanalytics.util.infoprovider_utils import generate_step_transform, parse_formula
+
+
+class TestTransformFormula(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "a": 10,
+            "b": 3,
+            "values": [{"value": idx, "factor": idx * 1.5} for idx in range(20)]
+        }
+
+    def test_formula(self):
+        values, _ = generate_step_transform("(_req|a + 2) / _req|b * 2", "result", 0)
+        exp, out = prepare_test(values, self.data, {"_req": self.data, "result": 8.0})
+
+        # Intermediate results are rounded, but not stored
+        self.assertDictEqual(exp, out)
+
+    def test_formula_decimal(self):
+        values, _ = generate_step_transform("_req|a / _req|b", "result", 0, decimal=0)
+        exp, out = prepare_test(values, self.data, {"_req": self.data, "result": 3})
+
+        self.assertDictEqual(exp, out)
+        self.assertIsInstance(exp["result"], int)
+
+    def test_formula_constants(self):
+        values, _ = generate_step_transform("-_req|b * -2 + 2 % 3", "result", 0)
+        exp, out = prepare_test(values, self.data, {"_req": self.data, "result": 8})
+
+        self.assertDictEqual(exp, out)
+
+    def test_formula_array(self):
+        # array_var is the field loop_key of the current element, the result replaces it
+        values, _ = generate_step_transform("array_var * 2 + _loop|factor / _req|b", "result", 0,
+                                            copy="_req|copy", array_key="_req|values", loop_key="value")
+        expected = [{"value": idx, "factor": idx * 1.5} for idx in range(20)]
+        expected_copy = [{**v, "value": round(v["value"] * 2 + round(v["factor"] / 3, 2), 2)} for v in expected]
+
+        for vectorize in [True, False]:
+            values[1]["vectorize"] = vectorize
+            exp, out = prepare_test(values, self.data, {"_req": {**self.data, "copy": expected_copy}})
+            self.assertDictEqual(exp, out, f"formula array failed (vectorize: {vectorize})")
+
+    def test_unsupported_formula(self):
+        for formula in ["_req|a ** 2", "_req|a +", "'text' + _req|a", "max(_req|a, 2)", "a = 2"]:
+            with self.subTest(formula=formula):
+                self.assertRaises(SyntaxError, parse_formula, formula)
+                self.assertIsNone(generate_step_transform(formula, "result", 0)[0])
+
+    def test_compiled_once(self):
+        tree = parse_formula("_req|a * 2 + 1")
+        func = formula.compile_formula(tree)
+
+        # The tree is only serialized when it is compiled first
+        with mock.patch.object(formula.json, "dumps") as dumps:
+            self.assertIs(func, formula.compile_formula(tree))
+            dumps.assert_not_called()
+
+        # Equal trees share the compiled function
+        self.assertIs(func, formula.compile_formula(parse_formula("_req|a * 2 + 1")))
+        self.assertEqual(21, func(lambda key: self.data[key.split("|")[-1]]))
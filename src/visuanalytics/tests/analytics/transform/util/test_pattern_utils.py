@@ -0,0 +1,38 @@
+import unittest
+from datetime import datetime
+
+from visuanalytics.analytics.transform.util.pattern_utils import compile_regex, parse_datetime
+
+
+class PatternUtilsTest(unittest.TestCase):
+    def test_compile_regex(self):
+        self.assertIs(compile_regex("[.]+"), compile_regex("[.]+"))
+        self.assertListEqual(["a", "b", "c"], compile_regex("X", True).split("axbXc"))
+
+    def test_parse_iso(self):
+        for value, given_format in [
+            ("2020-06-21", "%Y-%m-%d"),
+            ("2020-6-21", "%Y-%m-%d"),
+            ("2020-06-21T10:11", "%Y-%m-%dT%H:%M"),
+            ("2020-06-21 10:11:12.123", "%Y-%m-%d %H:%M:%S.%f"),
+            ("2020-06-21T10:11:12Z", "%Y-%m-%dT%H:%M:%SZ"),
+            ("2020-06-21T10:11:12Z", "%Y-%m-%dT%H:%M:%S%z"),
+            ("2020-06-21T10:11:12+02:00", "%Y-%m-%dT%H:%M:%S%z"),
+            ("21.06.2020", "%d.%m.%Y")
+        ]:
+            with self.subTest(value=value, given_format=given_format):
+                expected = datetime.strptime(value, given_format)
+                date = parse_datetime(value, given_format)
+
+                self.assertEqual(expected, date)
+                self.assertEqual(expected.tzinfo, date.tzinfo)
+
+    def test_parse_invalid(self):
+        for value in ["2020-06-21x10:11", "2020-13-01T10:11", "2020-W25-7"]:
+            with self.subTest(value=value):
+                self.assertRaises(ValueError, parse_datetime, value, "%Y-%m-%dT%H:%M")
+
+    def test_parse_epoch(self):
+        for value in [1592758688, 1592758688.5, "1592758688"]:
+            with self.subTest(value=value):
+                self.assertEqual(datetime.fromtimestamp(float(value)), parse_datetime(value, "%s"))
@@ -0,0 +1,64 @@
+import os
+import shutil
+import unittest
+
+from visuanalytics.analytics.util.step_metrics import measure_step, OverlapTracker
+from visuanalytics.util import resources
+
+
+class StepMetricsTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        self.temp_dir = resources.get_temp_resource_path("", "step_metrics")
+        os.makedirs(self.temp_dir, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_return_value_and_keys(self):
+        result, metrics = measure_step(lambda: 42, self.temp_dir)
+
+        self.assertEqual(42, result)
+        self.assertSetEqual({"wall_time", "cpu_time", "rss_delta", "temp_bytes"}, set(metrics.keys()))
+        self.assertGreaterEqual(metrics["wall_time"], 0)
+        self.assertGreaterEqual(metrics["cpu_time"], 0)
+
+    def test_temp_bytes(self):
+        def write_file():
+            with open(os.path.join(self.temp_dir, "test.bin"), "wb") as fp:
+                fp.write(b"0" * 1000)
+
+        _, metrics = measure_step(write_file, self.temp_dir)
+
+        self.assertEqual(1000, metrics["temp_bytes"])
+
+    def test_without_temp_dir(self):
+        _, metrics = measure_step(lambda: None)
+
+        self.assertIsNone(metrics["temp_bytes"])
+
+    def test_metrics_on_error(self):
+        def fail():
+            raise ValueError("test")
+
+        with self.assertRaises(ValueError) as cm:
+            measure_step(fail, self.temp_dir)
+
+        self.assertIn("wall_time", cm.exception.step_metrics)
+
+    def test_overlap(self):
+        tracker = OverlapTracker()
+
+        tracker.start(1)
+        self.assertFalse(tracker.finish(1))
+
+        # Both steps overlap, also the one that started first
+        tracker.start(5)
+        tracker.start(7)
+        self.assertTrue(tracker.finish(7))
+        tracker.start(6)
+        self.assertTrue(tracker.finish(5))
+        self.assertTrue(tracker.finish(6))
+
+        tracker.start(8)
+        self.assertFalse(tracker.finish(8))
@@ -0,0 +1,81 @@
+import operator
+import unittest
+from functools import reduce
+from string import Formatter
+
+from visuanalytics.analytics.util.step_errors import StepKeyError
+from visuanalytics.analytics.util.step_pattern import data_get_pattern, data_insert_pattern, data_remove_pattern, \
+    compile_key_path, StepPatternFormatter
+
+
+def _get_uncached(keys, data):
+    # Implementation before key paths were compiled, used as reference (see benchmarks/bench_step_pattern)
+    keys_map = map(lambda x: int(x) if x.isnumeric() else x, keys.split("|"))
+    return reduce(operator.getitem, keys_map, data)
+
+
+class _UncompiledFormatter(Formatter):
+    # Formatter before patterns were compiled, used as reference (see benchmarks/bench_step_pattern)
+    def get_value(self, key, args, kwargs):
+        return data_get_pattern(key, args[0])
+
+
+class StepPatternTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {"a": {"b": [{"c": 1}, {"c": 2}]}, "d": 3, "0": "str"}
+
+    def test_compile_key_path(self):
+        self.assertTupleEqual(("a", "b", 1, "c"), compile_key_path("a|b|1|c"))
+
+    def test_get(self):
+        self.assertEqual(3, data_get_pattern("d", self.data))
+        self.assertEqual({"b": [{"c": 1}, {"c": 2}]}, data_get_pattern("a", self.data))
+        self.assertEqual(2, data_get_pattern("a|b|1|c", self.data))
+
+    def test_get_missing(self):
+        with self.assertRaises(StepKeyError):
+            data_get_pattern("a|x|c", self.data)
+
+    def test_insert(self):
+        data_insert_pattern("a|b|0|e", self.data, 4)
+        data_insert_pattern("x|y", self.data, 5)
+        data_insert_pattern("0", self.data, "new")
+
+        self.assertDictEqual({"c": 1, "e": 4}, self.data["a"]["b"][0])
+        self.assertDictEqual({"y": 5}, self.data["x"])
+        self.assertEqual("new", self.data["0"])
+
+    def test_remove(self):
+        data_remove_pattern("a|b|1|c", self.data)
+        data_remove_pattern("d", self.data)
+
+        self.assertDictEqual({}, self.data["a"]["b"][1])
+        self.assertNotIn("d", self.data)
+
+    def test_same_result_as_uncached(self):
+        for keys in ["d", "a|b", "a|b|1|c"]:
+            with self.subTest(keys=keys):
+                self.assertEqual(_get_uncached(keys, self.data), data_get_pattern(keys, self.data))
+
+
+class StepPatternFormatterTest(unittest.TestCase):
+    def setUp(self):
+        self.data = {"a": {"b": [1.5, "x"]}, "t": 21.456, "s": "hi", 0: "zero"}
+        self.formatter = StepPatternFormatter()
+
+    def test_same_output_as_formatter(self):
+        patterns = ["plain", "{t}°C", "{t:.1f}", "{s!r:>6}", "{a|b|0:08.3f}", "{{x}} {s}", "{a|b|1!s:^5}", "{0}",
+                    "{}", "{t:{t}}"]
+
+        for pattern in patterns:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(_UncompiledFormatter().format(pattern, self.data),
+                                 self.formatter.format(pattern, self.data))
+
+    def test_missing_key(self):
+        with self.assertRaises(StepKeyError):
+            self.formatter.format("{a|c}", self.data)
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(ValueError):
+            self.formatter.format("{a", self.data)
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import unittest
+
+from visuanalytics.analytics.control.procedures.DatasourcePipeline import DatasourcePipeline
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform.transform import transform
+from visuanalytics.analytics.util.type_profiler import TypeProfiler, save_report
+from visuanalytics.util import resources
+
+
+class TypeProfilerTest(unittest.TestCase):
+    def setUp(self):
+        resources.RESOURCES_LOCATION = "tests/resources"
+        self.config = {
+            "transform": [
+                {
+                    "type": "transform_array",
+                    "array_key": "_req|values",
+                    "vectorize": False,
+                    "transform": [
+                        {"type": "add_symbol", "keys": ["_loop|text"], "pattern": "{_loop|text}!"},
+                        {"type": "calculate", "action": "add", "keys": ["_loop|value"], "value_right": 1}
+                    ]
+                },
+                {"type": "length", "keys": ["_req|values"], "new_keys": ["_req|length"]}
+            ]
+        }
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_resource_path(resources.PROFILE_LOCATION), ignore_errors=True)
+        shutil.rmtree(resources.get_resource_path(resources.DATASOURCES_LOCATION), ignore_errors=True)
+
+    def __run(self):
+        data = StepData({}, "0", 0)
+        data.insert_data("_req|values", [{"text": str(idx), "value": idx} for idx in range(5)], {})
+        data.profiler = TypeProfiler(self.config)
+
+        transform(self.config, data)
+        return data.profiler.report()
+
+    def test_report(self):
+        report = {entry["path"]: entry for entry in self.__run()}
+
+        self.assertSetEqual({"transform[0]", "transform[0].transform[0]", "transform[0].transform[1]", "transform[1]"},
+                            set(report.keys()))
+
+        inner = report["transform[0].transform[1]"]
+        self.assertEqual("calculate:add", inner["type"])
+        self.assertEqual(5, inner["calls"])
+        self.assertEqual(5, inner["elements"])
+        self.assertEqual(5, report["transform[0]"]["elements"])
+
+        # Nested types are part of the total time of transform_array, but not of its own time
+        outer = report["transform[0]"]
+        self.assertLessEqual(outer["self_time"], outer["total_time"])
+        self.assertGreaterEqual(outer["total_time"],
+                                inner["total_time"] + report["transform[0].transform[0]"]["total_time"] - 0.001)
+        self.assertAlmostEqual(1, sum(entry["share"] for entry in report.values()), 2)
+
+    def test_sorted(self):
+        report = self.__run()
+
+        self.assertListEqual(sorted(report, key=lambda e: e["self_time"], reverse=True), report)
+
+    def test_save_report(self):
+        report = self.__run()
+        path = save_report(report, "job", "2020-01-01_10-00.00")
+
+        with open(path) as fp:
+            self.assertListEqual(report, json.load(fp))
+
+    def test_datasource_pipeline(self):
+        os.makedirs(resources.get_resource_path(resources.DATASOURCES_LOCATION), exist_ok=True)
+        config = {"name": "test_profile", "api": {"type": "input", "data": {"values": [{"text": "a", "value": 1}]}},
+                  **self.config}
+        for name, content in [("test_profile", config), ("global_presets", {})]:
+            with open(resources.get_resource_path(f"{resources.DATASOURCES_LOCATION}/{name}.json"), "w") as fp:
+                json.dump(content, fp)
+
+        pipeline = DatasourcePipeline(0, "test-profile", "test_profile", {"job_name": "datasource", "profile": True})
+        self.assertTrue(pipeline.start())
+
+        profile_path = resources.get_resource_path(os.path.join(resources.PROFILE_LOCATION, "datasource"))
+        with open(os.path.join(profile_path, os.listdir(profile_path)[0])) as fp:
+            report = {entry["path"]: entry for entry in json.load(fp)}
+
+        self.assertEqual(1, report["api"]["step"])
+        self.assertEqual(2, report["transform[0]"]["step"])
@@ -0,0 +1,29 @@
+import unittest
+
+from visuanalytics.analytics.util.type_utils import inline_presets
+
+
+class InlinePresetsTest(unittest.TestCase):
+    def setUp(self):
+        self.presets = {
+            "white": {"color": "white", "font": {"size": 10}},
+            "big": {"font": {"size": 20}}
+        }
+
+    def test_inline_nested(self):
+        values = {
+            "overlay": [
+                {"type": "text", "preset": "white", "color": "black"},
+                {"type": "option", "on_true": [{"type": "text", "preset": "big", "font": {"name": "a"}}]}
+            ]
+        }
+        inline_presets(values, self.presets)
+
+        self.assertDictEqual({"type": "text", "color": "white", "font": {"size": 10}}, values["overlay"][0])
+        self.assertDictEqual({"type": "text", "font": {"name": "a", "size": 20}}, values["overlay"][1]["on_true"][0])
+
+    def test_unknown_preset_is_kept(self):
+        values = {"type": "text", "preset": "unknown"}
+        inline_presets(values, self.presets)
+
+        self.assertDictEqual({"type": "text", "preset": "unknown"}, values)
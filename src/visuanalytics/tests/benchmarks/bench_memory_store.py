@@ -0,0 +1,34 @@
+"""
+Benchmark: Speicherbedarf und Lesezeit von Snapshots im Memory mit und ohne Komprimierung.
+
+Aufruf (im Ordner `src`): `python -m visuanalytics.tests.benchmarks.bench_memory_store [Anzahl Snapshots]`
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+from visuanalytics.analytics.storing import memory_store
+from visuanalytics.tests.analytics.storing.test_memory_store import SNAPSHOT
+from visuanalytics.util import resources
+
+
+def main(count=30):
+    with tempfile.TemporaryDirectory() as directory:
+        resources.RESOURCES_LOCATION = directory
+
+        for compression in [None, "zlib", "lzma"]:
+            name = str(compression)
+            for day in range(count):
+                memory_store.append("job", name, SNAPSHOT, datetime(2020, 1, 1) + timedelta(days=day),
+                                    compression=compression)
+
+            size = os.path.getsize(resources.get_memory_path(memory_store.MEMORY_DB, name, "job"))
+            latency = min(timeit.repeat(lambda: memory_store.last("job", name, count), number=3, repeat=3)) / 3
+
+            print(f"{name} ({count} snapshots): {size / 1024:.0f} KiB, read {latency * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
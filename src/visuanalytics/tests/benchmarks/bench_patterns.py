@@ -0,0 +1,87 @@
+"""
+Benchmark: `regex`, `split_string`, `date_format` und `date_weekday` mit den Testdaten aus
+`tests/analytics/transform/types`, vervielfacht zu großen Arrays. Verglichen wird mit der Ausführung ohne
+zwischengespeicherte Ausdrücke (`re.sub`, `re.split`, `datetime.strptime` bei jedem Aufruf).
+
+Aufruf (im Ordner `src`): `python -m visuanalytics.tests.benchmarks.bench_patterns [Anzahl Elemente]`
+"""
+import re
+import sys
+import timeit
+from copy import deepcopy
+from datetime import datetime
+from unittest import mock
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform import transform as transform_module
+from visuanalytics.tests.analytics.transform.types.test_transform_regex import TestTransformRegex
+from visuanalytics.tests.analytics.transform.types.test_transform_time import TestTransformTime
+
+BENCHMARKS = {
+    "regex": (TestTransformRegex, [
+        {"type": "regex", "keys": ["_loop|test2"], "regex": "[.]+", "replace_by": ","},
+        {"type": "regex", "keys": ["_loop|test5"], "regex": "[0-9]", "replace_by": ""}
+    ]),
+    "split_string": (TestTransformRegex, [
+        {"type": "split_string", "keys": ["_loop|test1"], "new_keys": ["_loop|split"], "delimiter": "[.]"}
+    ]),
+    "date_format": (TestTransformTime, [
+        {"type": "date_format", "keys": ["_loop|date"], "new_keys": ["_loop|formatted"], "given_format": "%Y-%m-%d",
+         "format": "%d.%m.%Y"}
+    ]),
+    "date_weekday": (TestTransformTime, [
+        {"type": "date_weekday", "keys": ["_loop|date"], "given_format": "%Y-%m-%d"}
+    ])
+}
+
+
+class _Uncompiled(object):
+    # Behaves like the former implementation, which passed the pattern to re on every call
+    def __init__(self, pattern, ignore_case=False):
+        self.__pattern = pattern
+        self.__flags = re.IGNORECASE if ignore_case else 0
+
+    def sub(self, replace_by, value):
+        return re.sub(self.__pattern, replace_by, value, flags=self.__flags)
+
+    def split(self, value):
+        return re.split(self.__pattern, value, flags=self.__flags)
+
+
+def fixture_array(test_class, length: int):
+    test = test_class()
+    test.setUp()
+    return [deepcopy(test.data) for _ in range(length)]
+
+
+def run_types(transformations: list, array: list):
+    # Runs the types like transform_array, without the debug output of transform
+    values = {"transform": deepcopy(transformations)}
+    step_data = StepData({}, "0", 0)
+    step_data.insert_data("_req", array, {})
+
+    for _ in step_data.loop_array(step_data.get_data("_req", {}), values):
+        for transformation in values["transform"]:
+            transformation["_loop_states"] = values["_loop_states"]
+            transform_module.TRANSFORM_TYPES[transformation["type"]](transformation, step_data)
+
+
+def measure(transformations: list, array: list):
+    return min(timeit.repeat(lambda: run_types(transformations, deepcopy(array)), number=1, repeat=3))
+
+
+def main(length=20000):
+    for name, (test_class, transformations) in BENCHMARKS.items():
+        array = fixture_array(test_class, length)
+
+        with mock.patch.object(transform_module, "compile_regex", _Uncompiled), \
+                mock.patch.object(transform_module, "parse_datetime", datetime.strptime):
+            before = measure(transformations, array)
+        after = measure(transformations, array)
+
+        print(f"{name} ({length} elements): before {before:.3f}s, cached {after:.3f}s, "
+              f"speedup {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
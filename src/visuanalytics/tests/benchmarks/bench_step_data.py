@@ -0,0 +1,34 @@
+"""
+Benchmark: Zugriff auf Schleifenvariablen in :class:`StepData` bei wenigen und vielen Daten des Jobs.
+
+Die Laufzeit darf nicht von der Größe der Daten abhängen, da diese für die Schleifenvariablen nicht kopiert werden.
+
+Aufruf (im Ordner `src`): `python -m visuanalytics.tests.benchmarks.bench_step_data [Anzahl Schleifendurchläufe]`
+"""
+import sys
+import timeit
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+
+
+def run_loop(data_size: int, length: int):
+    data = StepData({}, "0", 0)
+    for idx in range(data_size):
+        data.insert_data(f"key_{idx}", idx, {})
+
+    values = {}
+
+    def loop():
+        for _ in data.loop_array(range(length), values):
+            data.insert_data("result", data.get_data("_loop", values), values)
+
+    return min(timeit.repeat(loop, number=1, repeat=3))
+
+
+def main(length=2000):
+    for data_size in [10, 10000]:
+        print(f"{data_size} keys, {length} loop values: {run_loop(data_size, length):.4f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,35 @@
+"""
+Benchmark: Zugriff auf Daten mit zwischengespeicherten Key-Pfaden im Vergleich zum Aufteilen des Keys bei jedem Zugriff
+und Formatieren mit kompilierten Patterns im Vergleich zum Parsen des Patterns bei jedem Aufruf.
+
+Aufruf (im Ordner `src`): `python -m visuanalytics.tests.benchmarks.bench_step_pattern [Anzahl Aufrufe]`
+"""
+import sys
+import timeit
+
+from visuanalytics.analytics.util.step_pattern import data_get_pattern, StepPatternFormatter
+from visuanalytics.tests.analytics.util.test_step_pattern import _get_uncached, _UncompiledFormatter
+
+DATA = {"a": {"b": [{"c": 1}, {"c": 2}]}, "d": 3, "0": "str"}
+FORMAT_DATA = {"t": 21.456, "s": "hi"}
+
+
+def main(number=20000):
+    for keys in ["d", "a|b", "a|b|1|c"]:
+        uncached = min(timeit.repeat(lambda: _get_uncached(keys, DATA), number=number, repeat=3))
+        cached = min(timeit.repeat(lambda: data_get_pattern(keys, DATA), number=number, repeat=3))
+
+        print(f"get '{keys}' ({number} calls): uncached {uncached:.4f}s, cached {cached:.4f}s, "
+              f"speedup {uncached / cached:.2f}x")
+
+    pattern = "Temperatur: {t:.1f}°C ({s})"
+    uncompiled_formatter, formatter = _UncompiledFormatter(), StepPatternFormatter()
+    uncompiled = min(timeit.repeat(lambda: uncompiled_formatter.format(pattern, FORMAT_DATA), number=number, repeat=3))
+    compiled = min(timeit.repeat(lambda: formatter.format(pattern, FORMAT_DATA), number=number, repeat=3))
+
+    print(f"format '{pattern}' ({number} calls): uncompiled {uncompiled:.4f}s, compiled {compiled:.4f}s, "
+          f"speedup {uncompiled / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
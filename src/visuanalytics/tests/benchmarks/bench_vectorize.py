@@ -0,0 +1,36 @@
+"""
+Benchmark: `transform_array` mit `calculate`-Schritten, elementweise und spaltenweise ausgeführt.
+
+Aufruf (im Ordner `src`): `python -m visuanalytics.tests.benchmarks.bench_vectorize [Anzahl Elemente]`
+"""
+import contextlib
+import os
+import sys
+import timeit
+
+from visuanalytics.tests.analytics.transform.test_vectorize import run_transform
+
+TRANSFORMATIONS = [
+    {"type": "calculate", "action": "multiply", "keys": ["_loop|temp"], "value_right": 1.8,
+     "new_keys": ["_loop|fahrenheit"]},
+    {"type": "calculate", "action": "add", "keys": ["_loop|fahrenheit"], "value_right": 32, "decimal": 1},
+    {"type": "calculate", "action": "divide", "keys": ["_loop|wind"], "value_right": 3.6, "decimal": 2},
+]
+
+
+def main(length=10000):
+    array = [{"temp": idx % 40 - 5, "wind": idx * 0.37} for idx in range(length)]
+    times = {}
+
+    # transform prints the step data, the output is not part of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for vectorized in [False, True]:
+            times[vectorized] = min(timeit.repeat(lambda: run_transform(TRANSFORMATIONS, array, vectorized),
+                                                  number=1, repeat=3))
+
+    print(f"{length} elements: looped {times[False]:.3f}s, vectorized {times[True]:.4f}s, "
+          f"speedup {times[False] / times[True]:.0f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -1,94 +1,13 @@
-import json
 from ast2json import str2json
 
-splitString = "uzjhnjtdryfguljkm"
-
+from visuanalytics.analytics.transform.formula import compile_formula
 
-def get_transformations(tree, k, key_name, counter):
-    """
-    Simuliert einen globalen Scope für die Methode, die die Liste der Transformtypen generiert.
-
-    :param tree: Dictionary mit der Formel repräsentiert als ein abstrakter Syntaxbaum
-    :type tree: dict
-    :param k: Key zu dem relevanten Part des Syntaxbaums (z.B. der linke oder rechte Operand)
-    :type k: str
-    :param key_name: falls es sich nicht um ein Ziwschenergebnis handelt, wird das Ergebnis unter diesem Namen abgespeichert, damit es später wiederverwendet werden kann
-    :type key_name: str
-    :param counter: zählt hoch und ist Teil der Namen aller Zwischenvariablen
-    :type counter: number
-    :return: Liste der Transformtypen
-    """
-    operations = {
-        "ADD": "add",
-        "SUB": "subtract",
-        "MUL": "multiply",
-        "DIV": "divide",
-        "MOD": "modulo"
-    }
-
-    calc_template = {
-        "type": "calculate",
-        "action": "",
-        "decimal": 2
-    }
-
-    new_key_template = "_new_key_"
-
-    calculations = []
-
-    def build_calc_list(tree, k, counter, key_name=None):
-        """
-        Erstellt rekursiv eine Rechnung für den Transform-Schritt, mit der die Formeln
-        eines Infoproviders umgesetzt werden können.
-
-        :param tree: Dictionary mit der Formel repräsentiert als ein abstrakter Syntaxbaum
-        :type tree: dict
-        :param k: Key zu dem relevanten Part des Syntaxbaums (z.B. der linke oder rechte Operand)
-        :type k: str
-        :param counter: Zählervariable für die Keys der Zwischenergebnisse
-        :type counter: int
-        :param key_name: falls es sich nicht um ein Ziwschenergebnis handelt, wird das Ergebnis unter diesem Namen abgespeichert, damit es später wiederverwendet werden kann
-        :type key_name: str
-        :return: Key, an dem das Zwischenergebnis von einem Operanden zu finden ist
-        """
-        current_calc = tree[k]
-        contains_calc = False
-        keys = ["lop", "rop"]
-        new_key = new_key_template + str(counter) if key_name is None else key_name
-
-        for key in keys:
-            if type(current_calc[key]) == dict:
-                counter += 1
-                current_calc[key], temporary = build_calc_list(current_calc, key, counter)
-
-        calculation = calc_template.copy()
-        calculation["action"] = operations[current_calc["operator"]]
-        calculation["decimal"] = current_calc["decimal"]
-
-        if type(current_calc["lop"]) == str:
-            calculation.update({"keys": [current_calc["lop"].replace(splitString, "|")]})
-        else:
-            if type(current_calc["rop"]) == str:
-                calculation.update({"keys": [current_calc["rop"].replace(splitString, "|")]})
-            calculation.update({"value_left": current_calc["lop"]})
-        if type(current_calc["rop"]) == str and type(current_calc["lop"]) == str:
-            calculation.update({"keys_right": [current_calc["rop"].replace(splitString, "|")]})
-        elif type(current_calc["rop"]) != str:
-            calculation.update({"value_right": current_calc["rop"]})
-        calculation.update({"new_keys": [new_key]})
-
-        calculations.append(calculation)
-        if k != "tree":
-            return new_key, counter
-        return None, counter
-
-    tmp, counter = build_calc_list(tree, k, counter, key_name=key_name)
-    return calculations, counter
+splitString = "uzjhnjtdryfguljkm"
 
 
 def parse_to_own_format(rep, decimal, loop_var=None):
     """
-    Generiert rekursiv den abstrakten Syntaxbaum mit nur den relevanten Daten, der für die get_transformations-Funktion verständlich ist.
+    Generiert rekursiv den abstrakten Syntaxbaum mit nur den relevanten Daten, der vom `transform`-Typ `formula` verwendet wird.
 
     :param rep: Dictionary, welches von der ast2json-Bibliothek generiert wurde
     :type rep: dict
@@ -97,6 +16,7 @@ def parse_to_own_format(rep, decimal, loop_var=None):
     :param loop_var: Name der Loop-Variable
     :type loop_var: str
     :return: je nach '_type' wird ein Variablenname, eine Zahl oder ein Dictionary in verständlichem Format zurückgegeben
+    :raises: SyntaxError, falls die Formel andere Ausdrücke als Rechnungen, Variablen und Zahlen enthält
     """
     if rep["_type"].lower() == "binop":
         return {
@@ -105,11 +25,23 @@ def parse_to_own_format(rep, decimal, loop_var=None):
             "lop": parse_to_own_format(rep["left"], decimal=decimal),
             "rop": parse_to_own_format(rep["right"], decimal=decimal)
         }
+    elif rep["_type"].lower() == "unaryop" and rep["op"]["_type"] in ["USub", "UAdd"]:
+        operand = parse_to_own_format(rep["operand"], decimal=decimal)
+        if rep["op"]["_type"] == "UAdd":
+            return operand
+        if isinstance(operand, (int, float)):
+            return -operand
+        return {
+            "operator": "SUB",
+            "decimal": decimal,
+            "lop": 0,
+            "rop": operand
+        }
     elif rep["_type"].lower() == "name":
-        return rep["id"] if not loop_var or (loop_var and rep["id"] != "_loop") else loop_var
-    elif rep["_type"].lower() == "constant":
+        return rep["id"].replace(splitString, "|") if not loop_var or (loop_var and rep["id"] != "_loop") else loop_var
+    elif rep["_type"].lower() == "constant" and type(rep["value"]) in [int, float]:
         return rep["value"]
-    return None  # raise error?!
+    raise SyntaxError(f"Unsupported expression in formula: {rep['_type']}")
 
 
 def parse_string(calculation_string):
@@ -126,15 +58,44 @@ def parse_string(calculation_string):
         return None
 
 
+def parse_formula(formula, decimal=2, loop_var=None):
+    """
+    Wandelt eine Formel in einen Syntaxbaum für den `transform`-Typ `formula` um und übersetzt ihn dabei einmal, um zu
+    prüfen, ob die Formel ausgeführt werden kann. Wird sowohl zum Testen als auch zum Generieren von Formeln verwendet.
+
+    :param formula: Stringrepräsentation einer Formel
+    :type formula: str
+    :param decimal: Anzahl der Nachkommastellen der Zwischenergebnisse
+    :type decimal: int
+    :param loop_var: Name der Loop-Variable
+    :type loop_var: str
+    :return: Formel als Syntaxbaum (siehe :mod:`visuanalytics.analytics.transform.formula`)
+    :raises: SyntaxError, falls die Formel syntaktisch falsch ist oder nicht unterstützte Ausdrücke enthält
+    """
+    ast_rep = str2json(formula.replace("|", splitString))
+
+    if len(ast_rep["body"]) != 1 or ast_rep["body"][0]["_type"] != "Expr":
+        raise SyntaxError("A formula has to consist of exactly one expression")
+
+    tree = parse_to_own_format(ast_rep["body"][0]["value"], decimal=decimal, loop_var=loop_var)
+    compile_formula(tree)
+    return tree
+
+
 def generate_step_transform(formula, key_name, counter, copy=None, array_key=None, loop_key="", decimal=2):
     """
     Erstellt die Liste der Transformtypen für eine Formel, falls die Formel keinen syntaktischen Fehler hat.
     Dabei kann die Formel auf einen einzelnen Key, oder ein ganzes Array angewendet werden.
 
+    Die Formel wird mit dem `transform`-Typ `formula` in einem Durchlauf berechnet, Zwischenergebnisse werden nicht
+    gespeichert.
+
     :param formula: Stringrepräsentation der Formel
     :type formula: str
     :param key_name: Name der Formel, unter dem das Ergebnis später zu finden ist
     :type key_name: str
+    :param counter: Wird unverändert zurückgegeben (früher die Anzahl der Zwischenvariablen)
+    :type counter: number
     :param copy: Key, unter dem die Kopie des Arrays zu finden ist
     :type copy: str
     :param array_key: Key des Arrays, über welches u.U. iteriert werden soll (für Arrays)
@@ -146,7 +107,7 @@ def generate_step_transform(formula, key_name, counter, copy=None, array_key=Non
     :return: Liste der Transformtypen
     """
     if copy and not array_key:
-        return None
+        return None, counter
     result = []
     if copy:
         result.append({
@@ -158,35 +119,26 @@ def generate_step_transform(formula, key_name, counter, copy=None, array_key=Non
     loop_var = "_loop|" + loop_key
     if loop_var[-1] == "|":
         loop_var = loop_var.replace("|", "")
-    formula = formula.replace("array_var", loop_var).replace("|", splitString)
-
-    ast_rep = parse_string(formula if array_key else formula)
+    formula = formula.replace("array_var", loop_var)
 
-    if not ast_rep:
+    try:
+        tree = parse_formula(formula, decimal=decimal, loop_var=(loop_var if array_key else None))
+    except SyntaxError:
         return None, counter
-    else:
-        parsed_result = parse_to_own_format(ast_rep["body"][0]["value"], decimal=decimal, loop_var=(loop_var if array_key else None))
-
-        if array_key:
-            transformations, counter = get_transformations({
-                    "tree": parsed_result
-                }, "tree", key_name, counter) + [
-                                 {
-                                     "type": "calculate",
-                                     "action": "multiply",
-                                     "decimal": decimal,
-                                     "keys": [key_name],
-                                     "value_right": 1,
-                                     "new_keys": [loop_var]
-                                 }
-                             ]
-            return result + [{
-                "type": "transform_array",
-                "array_key": copy if copy else array_key,
-                "transform": transformations
-            }], counter
-        else:
-            transformations, counter = get_transformations({
-                "tree": parsed_result
-            }, "tree", key_name, counter)
-            return result + transformations, counter
+
+    if array_key:
+        return result + [{
+            "type": "transform_array",
+            "array_key": copy if copy else array_key,
+            "transform": [{
+                "type": "formula",
+                "formula": tree,
+                "new_key": loop_var
+            }]
+        }], counter
+
+    return result + [{
+        "type": "formula",
+        "formula": tree,
+        "new_key": key_name
+    }], counter
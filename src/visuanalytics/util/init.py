@@ -1,6 +1,9 @@
 import logging
 import os
 
+from visuanalytics.analytics.apis import cassette, http_session, fan_out
+from visuanalytics.analytics.control.scheduler import pipeline_pool
+from visuanalytics.analytics.storing import memory_store
 from visuanalytics.server.db import db
 from visuanalytics.server.db import job
 from visuanalytics.util import external_programs, resources, config_manager
@@ -22,6 +25,14 @@ def init(config: dict):
     # init log_limit
     job.LOG_LIMIT = config["log_limit"]
 
+    # init max concurrent pipelines per type
+    pipeline_pool.MAX_WORKERS = {**pipeline_pool.MAX_WORKERS, **config.get("scheduler", {}).get("max_workers", {})}
+
+    # init http sessions for api requests
+    http_session.SESSION_CONFIG = {**http_session.SESSION_CONFIG, **config.get("api", {}).get("session", {})}
+    fan_out.MAX_PARALLEL = config.get("api", {}).get("max_parallel", fan_out.MAX_PARALLEL)
+    cassette.CASSETTE_CONFIG = {**cassette.CASSETTE_CONFIG, **config.get("api", {}).get("cassette", {})}
+
     # INit STEPS_BASE_CONFIG
     config_manager.STEPS_BASE_CONFIG = config["steps_base_config"]
 
@@ -41,6 +52,9 @@ def init(config: dict):
     os.makedirs(resources.get_resource_path(res_sub_paths["images"]), exist_ok=True)
     os.makedirs(resources.get_resource_path(res_sub_paths["memory"]), exist_ok=True)
 
+    # move file based memory entries into the memory databases
+    memory_store.migrate()
+
     # create out and instance folder
     out_dir = config.get("steps_base_config", {}).get("output_path", "out")
     os.makedirs(resources.path_from_root(out_dir), exist_ok=True)
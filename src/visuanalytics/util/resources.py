@@ -1,7 +1,7 @@
 """Modul, welches Funktionen zur Benutzung von Ressourcen bereitstellt."""
 import contextlib
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 
 ROOT_LOCATION = "../"
 """
@@ -50,6 +50,26 @@ Enthält den Pfad zu den Datenquellen.
 Dieser Pfad wird bei Start des Servers in `init.py` durch den Pfad in der `config.json` überschrieben.
 """
 
+CHECKPOINT_LOCATION = "checkpoints"
+"""
+Name des Ordners für Checkpoints von Pipelines (siehe :mod:`checkpoint`).
+"""
+
+HTTP_CACHE_LOCATION = "http_cache"
+"""
+Name des Ordners für zwischengespeicherte API-Antworten (siehe :mod:`response_cache`).
+"""
+
+CASSETTE_LOCATION = "cassettes"
+"""
+Name des Ordners für aufgezeichnete HTTP-Requests (siehe :mod:`cassette`).
+"""
+
+PROFILE_LOCATION = "profiles"
+"""
+Name des Ordners für die Laufzeitberichte der Typen eines Jobs (siehe :mod:`type_profiler`).
+"""
+
 DATE_FORMAT = '%Y-%m-%d_%H-%M.%S'
 """
 Datums- und Zeitformat in welchem die Dateien abgespeichert werden.
@@ -185,22 +205,6 @@ def get_memory_path(path: str, name: str, job_name: str):
     return get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name, path))
 
 
-def get_specific_memory_path(job_name: str, name: str, number: int, skip: bool):
-    """Erstellt einen absoluten Pfad zu der Memory-Datei im übergebenen Ordner.
-
-    :param job_name: Name des Jobs von der die Funktion aufgerufen wurde.
-    :param name: Name des Dictionaries, das exportiert wurde.
-    :param number: Angabe, welche Datei ausgewählt werden soll (0= zuletzt erstellt, 1 = als vorletztes erstellt etc.)
-    """
-    files = os.listdir(get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name)))
-    files.sort(reverse=True)
-    if skip:
-        now = datetime.now()
-        if files[0] == now.strftime("%Y-%m-%d.json"):
-            number += 1
-    return get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name, files[number]))
-
-
 def new_temp_resource_path(pipeline_id: str, extension):
     """Erstellt einen absoluten Pfad für eine neue Resource.
 
@@ -215,19 +219,6 @@ def new_temp_resource_path(pipeline_id: str, extension):
     return get_temp_resource_path(f"{datetime.now().strftime('%Y-%m-%d_%H-%M.%S.%f')}.{extension}", pipeline_id)
 
 
-def new_memory_resource_path(job_name: str, name: str):
-    """Erstellt einen absoluten Pfad für eine neue Memory-Resource.
-
-    Generiert einen neuen Namen mit aktuellem Zeitstempel.
-    Verwendet um den Pfad zu generieren :func:`get_memory_path` mit dem Ordner des `job_name`.
-
-   :param job_name: Name des Jobs von der die Funktion aufgerufen wurde.
-   :param name: Name der Datei (ohne Datum)
-    """
-    os.makedirs(get_memory_path("", name, job_name), exist_ok=True)
-    return get_memory_path(f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}.json", name, job_name)
-
-
 def open_resource(path: str, mode: str = "rt"):
     """Öffnet die übergebene Ressource.
 
@@ -277,31 +268,6 @@ def open_temp_resource(path: str, pipeline_id: str, mode: str = "rt"):
     return open_resource(os.path.join(TEMP_LOCATION, pipeline_id, path), mode)
 
 
-def open_memory_resource(job_name: str, name: str, time_delta, mode: str = "rt"):
-    """Öffnet die übergebene Memory-Ressource.
-
-    :param time_delta: Tage, die abgezogen werden sollen vom heutigen Tag. Zum Öffnen der richtigen Ressource.
-    :param job_name: Name des Jobs von der die Funktion aufgerufen wurde.
-    :param name: Name der Datei (ohne Datum).
-    :param mode: Mode zum Öffnen der Datei siehe :func:`open`.
-
-    """
-    res_name = (datetime.now() - timedelta(time_delta)).strftime('%Y-%m-%d') + ".json"
-    return open_resource(os.path.join(MEMORY_LOCATION, job_name, name, res_name), mode)
-
-
-def open_specific_memory_resource(job_name: str, name: str, skip, number: int = 1, mode: str = "rt"):
-    """Öffnet die angegebene Memory-Ressource.
-
-    :param job_name: Name des Jobs von der die Funktion aufgerufen wurde.
-    :param name: Name des Dictionaries, das exportiert wurde.
-    :param number: Angabe, welche Datei ausgewählt werden soll (0= zuletz erstellt, 1 = als vorletztes erstellt etc.)
-    :param mode: Mode zum Öffnen der Datei siehe :func:`open`.
-
-    """
-    return open_resource(get_specific_memory_path(job_name, name, number - 1, skip), mode)
-
-
 def delete_infoprovider_resource(path: str):
     """Löscht den übergebenen Infoprovider aus dem resources-Ordner.
 